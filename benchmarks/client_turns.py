@@ -0,0 +1,128 @@
+import argparse
+import asyncio
+import time
+from datetime import date
+
+from mcp import ClientSession
+from pydantic_ai import Agent
+from pydantic_ai.mcp import MCPServerStreamableHTTP
+from pydantic_ai.messages import ModelMessage, ModelResponse, TextPart, ToolCallPart, ToolReturnPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from izzy_mcp_tutorials.history import HistoryCompactor, estimate_tokens
+from mcp_elicitation_client import create_agent, instructions
+
+from benchmarks.reporting import summarize_latencies, save_results, print_latency_table
+from benchmarks.service_load import start_server, stub_elicitation_callback
+
+
+class StubModel:
+    """
+        Stands in for the LLM: searches for flights on every prompt, then
+        answers with a short text. Records the size of every request it gets.
+    """
+    def __init__(self):
+        self.request_tokens: list[int] = []
+        self.model = FunctionModel(self.respond)
+
+    def respond(self, messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        self.request_tokens.append(estimate_tokens(messages))
+        if isinstance(messages[-1].parts[-1], ToolReturnPart):
+            return ModelResponse(parts=[TextPart("Here are the flights I found.")])
+        return ModelResponse(parts=[ToolCallPart("flight_search", {
+            "search_date": date.today().strftime("%Y-%m-%d"), "source_airport": "LAX", "destination_airport": "YUL"})])
+
+
+class ListToolsCounter:
+    """Counts the tools/list requests every MCP client session sends."""
+    def __init__(self):
+        self.calls = 0
+        self._list_tools = ClientSession.list_tools
+
+    def __enter__(self):
+        counter = self
+
+        async def list_tools(session, *args, **kwargs):
+            counter.calls += 1
+            return await counter._list_tools(session, *args, **kwargs)
+
+        ClientSession.list_tools = list_tools
+        return self
+
+    def __exit__(self, *args):
+        ClientSession.list_tools = self._list_tools
+
+
+async def run_conversation(url: str, turns: int, persistent: bool, max_tokens: int | None) -> dict:
+    stub = StubModel()
+    history: list[ModelMessage] = []
+    latencies: list[float] = []
+
+    with ListToolsCounter() as list_tools:
+        if persistent:
+            agent = create_agent(stub.model, url, HistoryCompactor(max_tokens=max_tokens) if max_tokens else None,
+                                 elicitation_callback=stub_elicitation_callback)
+            async with agent:
+                for turn in range(turns):
+                    started = time.perf_counter()
+                    result = await agent.run(f"Find me flights from LAX to YUL ({turn})", message_history=history)
+                    latencies.append(time.perf_counter() - started)
+                    history = result.all_messages()
+        else:
+            # The original client: a new agent, and so a new MCP session, every turn and the full history
+            for turn in range(turns):
+                started = time.perf_counter()
+                agent = Agent(stub.model, instructions=instructions,
+                              toolsets=[MCPServerStreamableHTTP(url=url, elicitation_callback=stub_elicitation_callback)])
+                result = await agent.run(f"Find me flights from LAX to YUL ({turn})", message_history=history)
+                latencies.append(time.perf_counter() - started)
+                history = result.all_messages()
+
+    return {
+        "turns": summarize_latencies(latencies),
+        "list_tools_calls": list_tools.calls,
+        "first_request_tokens": stub.request_tokens[0],
+        "last_request_tokens": stub.request_tokens[-1],
+        "max_request_tokens": max(stub.request_tokens),
+        "history_messages": len(history),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the agent client with and without a persistent MCP session "
+                                                 "and bounded history")
+    parser.add_argument("--turns", type=int, default=30, help="Conversation turns per client variant")
+    parser.add_argument("--max-tokens", type=int, default=4000, help="History budget of the persistent client")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--output", help="Where to write the JSON results")
+    args = parser.parse_args()
+
+    server = start_server(args.host, args.port, {})
+    url = f"http://{args.host}:{args.port}/mcp"
+    try:
+        results = {
+            "per_turn_session": asyncio.run(run_conversation(url, args.turns, persistent=False, max_tokens=None)),
+            "persistent_session": asyncio.run(run_conversation(url, args.turns, persistent=True,
+                                                               max_tokens=args.max_tokens)),
+        }
+    finally:
+        server.terminate()
+        server.wait()
+
+    print_latency_table({name: result["turns"] for name, result in results.items()})
+    print(f"\n{'client':<36}{'list_tools':>12}{'first req tokens':>18}{'last req tokens':>17}{'max req tokens':>16}")
+    for name, result in results.items():
+        print(f"{name:<36}{result['list_tools_calls']:>12}{result['first_request_tokens']:>18}"
+              f"{result['last_request_tokens']:>17}{result['max_request_tokens']:>16}")
+
+    config = {"turns": args.turns, "max_tokens": args.max_tokens}
+    path = save_results("client_turns", config, results, args.output)
+    print(f"\nResults written to {path}")
+
+
+if __name__ == "__main__":
+    main()
+
+
+#  uv run -m benchmarks.client_turns --turns 30
@@ -0,0 +1,87 @@
+import argparse
+import time
+from datetime import date, timedelta
+from typing import Callable
+
+from izzy_mcp_tutorials import FlightsDataAccessObject, create_flight_store
+from izzy_mcp_tutorials.models import FlightSearchQuery, VisaCheckRoute
+
+from benchmarks.reporting import summarize_latencies, save_results, print_latency_table
+
+ENGINES: dict[str, Callable] = {
+    "memory": lambda: create_flight_store("memory"),
+    "columnar": lambda: create_flight_store("columnar"),
+    "sqlite": lambda: create_flight_store("sqlite"),
+}
+
+
+def time_calls(function: Callable[[], object], repeat: int) -> list[float]:
+    latencies: list[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def benchmark_engine(engine: str, days: int, repeat: int) -> dict[str, dict]:
+    populate_latencies: list[float] = []
+    dao = None
+    for _ in range(3):
+        started = time.perf_counter()
+        dao = FlightsDataAccessObject(database=ENGINES[engine](), number_of_days_from_today=days)
+        populate_latencies.append(time.perf_counter() - started)
+
+    today = date.today()
+    search_date = today.strftime("%Y-%m-%d")
+    end_date = (today + timedelta(days=days - 1)).strftime("%Y-%m-%d")
+    queries = [FlightSearchQuery(searchDate=search_date, endDate=end_date, sourceAirport="LAX", destinationAirport=destination)
+               for destination in ("MCO", "YUL", "CUN")]
+
+    routes = [VisaCheckRoute(sourceAirport="LAX", destinationAirport=destination) for destination in ("MCO", "YUL", "CUN")]
+    manifest = dao.get_passport_ids() * 2000
+
+    results = {
+        "populate": summarize_latencies(populate_latencies),
+        "search_flights": summarize_latencies(time_calls(lambda: dao.search_flights(search_date, "LAX", "YUL"), repeat)),
+        "get_departures": summarize_latencies(time_calls(lambda: dao.get_departures("LAX", search_date), repeat)),
+        "get_availability": summarize_latencies(time_calls(lambda: dao.get_availability(search_date), max(1, repeat // 10))),
+        "get_passport_owner": summarize_latencies(time_calls(lambda: dao.get_passport_owner("12345"), repeat)),
+        "airport_country": summarize_latencies(time_calls(lambda: FlightsDataAccessObject.airport_country("YUL"), repeat)),
+        "is_international_flight": summarize_latencies(time_calls(lambda: dao.is_international_flight("LAX", "YUL"), repeat)),
+        "search_flights_batch": summarize_latencies(time_calls(lambda: dao.search_flights_batch(queries), max(1, repeat // 10))),
+        "check_visa_requirements": summarize_latencies(time_calls(
+            lambda: dao.check_visa_requirements(manifest, routes), max(1, repeat // 10))),
+        "search_connections": summarize_latencies(time_calls(
+            lambda: dao.search_connections(search_date, end_date, "LAX", "YUL", max_legs=2, max_results=10),
+            max(1, repeat // 10))),
+    }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark the FlightsDataAccessObject at several data sizes")
+    parser.add_argument("--days", type=int, nargs="+", default=[8, 30, 90], help="Days of availability to generate")
+    parser.add_argument("--engines", nargs="+", choices=sorted(ENGINES), default=sorted(ENGINES))
+    parser.add_argument("--repeat", type=int, default=1000, help="Calls per lookup benchmark")
+    parser.add_argument("--output", help="Where to write the JSON results")
+    args = parser.parse_args()
+
+    results: dict[str, dict] = {}
+    for engine in args.engines:
+        for days in args.days:
+            key = f"{engine}/{days}-days"
+            results[key] = benchmark_engine(engine, days, args.repeat)
+            print(f"\n{key}")
+            print_latency_table(results[key])
+
+    config = {"days": args.days, "engines": args.engines, "repeat": args.repeat}
+    path = save_results("dao_micro", config, results, args.output)
+    print(f"\nResults written to {path}")
+
+
+if __name__ == "__main__":
+    main()
+
+
+#  uv run -m benchmarks.dao_micro --days 8 30 90
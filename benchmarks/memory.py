@@ -0,0 +1,46 @@
+import argparse
+import gc
+import time
+import tracemalloc
+
+from izzy_mcp_tutorials import FlightsDataAccessObject, FlightDatabase, ColumnarFlightDatabase
+
+
+def measure(database_factory, number_of_days_from_today: int):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    dao = FlightsDataAccessObject(database=database_factory(), number_of_days_from_today=number_of_days_from_today)
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # FlightsDataAccessObject keeps the passport owners and airports too; they are tiny
+    return {"retained_bytes": current, "peak_bytes": peak, "populate_seconds": elapsed, "dao": dao}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare memory used by the flight database storage engines")
+    parser.add_argument("--days", type=int, nargs="+", default=[8, 30, 90])
+    args = parser.parse_args()
+
+    engines = {
+        "FlightDatabase": lambda: FlightDatabase(records={}),
+        "ColumnarFlightDatabase": ColumnarFlightDatabase,
+    }
+
+    print(f"{'engine':<24}{'days':>6}{'records':>10}{'retained MiB':>14}{'peak MiB':>10}{'bytes/record':>14}{'populate s':>12}")
+    for days in args.days:
+        for name, factory in engines.items():
+            result = measure(factory, days)
+            records = sum(len(result["dao"].get_availability(d)) for d in result["dao"].get_available_dates())
+            print(f"{name:<24}{days:>6}{records:>10}"
+                  f"{result['retained_bytes'] / 2**20:>14.2f}{result['peak_bytes'] / 2**20:>10.2f}"
+                  f"{result['retained_bytes'] / records:>14.1f}{result['populate_seconds']:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
+
+
+#  uv run -m benchmarks.memory
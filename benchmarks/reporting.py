@@ -0,0 +1,57 @@
+import json
+import platform
+import statistics
+from datetime import datetime
+from pathlib import Path
+
+RESULTS_DIRECTORY = Path(__file__).parent / "results"
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(fraction * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize_latencies(latencies: list[float], errors: int = 0) -> dict:
+    """Summarize latencies, given in seconds, as milliseconds"""
+    ordered = sorted(latencies)
+    return {
+        "count": len(ordered),
+        "errors": errors,
+        "mean_ms": statistics.fmean(ordered) * 1000 if ordered else 0.0,
+        "p50_ms": percentile(ordered, 0.50) * 1000,
+        "p95_ms": percentile(ordered, 0.95) * 1000,
+        "p99_ms": percentile(ordered, 0.99) * 1000,
+        "max_ms": ordered[-1] * 1000 if ordered else 0.0,
+    }
+
+
+def save_results(benchmark: str, config: dict, results: dict, output: str | None = None) -> Path:
+    """Write benchmark results as JSON, by default to benchmarks/results/<benchmark>-<timestamp>.json"""
+    started = datetime.now()
+    if output is None:
+        RESULTS_DIRECTORY.mkdir(parents=True, exist_ok=True)
+        path = RESULTS_DIRECTORY / f"{benchmark}-{started.strftime('%Y%m%d-%H%M%S')}.json"
+    else:
+        path = Path(output)
+
+    document = {
+        "benchmark": benchmark,
+        "timestamp": started.isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": config,
+        "results": results,
+    }
+    path.write_text(json.dumps(document, indent=2))
+    return path
+
+
+def print_latency_table(results: dict[str, dict]):
+    print(f"{'operation':<36}{'count':>8}{'errors':>8}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, summary in results.items():
+        print(f"{name:<36}{summary['count']:>8}{summary['errors']:>8}{summary['mean_ms']:>10.3f}"
+              f"{summary['p50_ms']:>10.3f}{summary['p95_ms']:>10.3f}{summary['p99_ms']:>10.3f}")
@@ -0,0 +1,190 @@
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+from mcp.shared.context import RequestContext
+from mcp.types import ElicitRequestParams, ElicitResult
+
+from izzy_mcp_tutorials.storage import STORAGE_BACKENDS
+
+from benchmarks.reporting import summarize_latencies, save_results, print_latency_table
+
+PROJECT_DIRECTORY = Path(__file__).parent.parent
+
+# Answers every elicitation without a human or an LLM in the loop
+STUB_TRAVELLER_INFORMATION = {
+    "traveller_has_passport": True,
+    "passport_id": "77889",
+    "number_of_passengers": 1,
+    "total_weight_of_luggage": 20.0,
+}
+
+
+async def stub_elicitation_callback(context: RequestContext[ClientSession, Any, Any],
+                                    params: ElicitRequestParams) -> ElicitResult:
+    return ElicitResult(action="accept", content=STUB_TRAVELLER_INFORMATION)
+
+
+def build_operations(forget_traveller: bool) -> dict[str, Callable[[ClientSession], Awaitable[Any]]]:
+    today = date.today()
+    search_date = today.strftime("%Y-%m-%d")
+    end_date = (today + timedelta(days=3)).strftime("%Y-%m-%d")
+
+    # Clearing the traveller cache makes the next international search elicit again, so it is only
+    # an operation of its own when re-elicitation is what is measured
+    forget = {}
+    if forget_traveller:
+        forget["tool:forget_traveller_information"] = lambda session: session.call_tool("forget_traveller_information", {})
+
+    return {
+        "tool:get_available_passport_ids": lambda session: session.call_tool("get_available_passport_ids", {}),
+        "tool:get_passport_owner": lambda session: session.call_tool("get_passport_owner", {"passport_id": "12345"}),
+        "tool:get_passport_owners": lambda session: session.call_tool(
+            "get_passport_owners", {"passport_ids": ["12345", "98765", "77889"]}),
+        "tool:check_visa_requirements": lambda session: session.call_tool("check_visa_requirements", {
+            "passport_ids": ["12345", "98765", "77889", "54321", "43210"] * 200,
+            "routes": [{"sourceAirport": "LAX", "destinationAirport": destination} for destination in ("MCO", "YUL", "CUN")]}),
+        "tool:get_available_dates": lambda session: session.call_tool("get_available_dates", {}),
+        "tool:flight_search(domestic)": lambda session: session.call_tool(
+            "flight_search", {"search_date": search_date, "source_airport": "LAX", "destination_airport": "MCO"}),
+        **forget,
+        "tool:flight_search(international)": lambda session: session.call_tool(
+            "flight_search", {"search_date": search_date, "source_airport": "LAX", "destination_airport": "YUL"}),
+        "tool:flight_search_batch": lambda session: session.call_tool("flight_search_batch", {"queries": [
+            {"searchDate": search_date, "endDate": end_date, "sourceAirport": "LAX", "destinationAirport": "MCO"},
+            {"searchDate": search_date, "sourceAirport": "MIA", "destinationAirport": "ATL"},
+        ]}),
+        "tool:flight_search_page": lambda session: session.call_tool("flight_search_page", {
+            "search_date": search_date, "end_date": end_date, "source_airport": "LAX", "destination_airport": "MCO",
+            "fields": ["id", "airline", "departureDate"], "sort_by": "airline", "limit": 10}),
+        "tool:connection_search": lambda session: session.call_tool("connection_search", {
+            "start_date": search_date, "end_date": end_date, "source_airport": "LAX",
+            "destination_airport": "YUL", "max_legs": 2, "max_results": 10}),
+        "resource:passport-owner": lambda session: session.read_resource("passport://passport-owner/12345"),
+        "resource:airport-country": lambda session: session.read_resource("airport://airport-country/YUL"),
+        "resource:database-status": lambda session: session.read_resource("flights://database/status"),
+        "resource:traveller-cache-metrics": lambda session: session.read_resource("flights://traveller-cache/metrics"),
+        "resource:server-metrics": lambda session: session.read_resource("metrics://server"),
+        "resource:executor-stats": lambda session: session.read_resource("flights://executor/stats"),
+        "resource:response-cache-stats": lambda session: session.read_resource("flights://response-cache/stats"),
+        "resource:available-dates": lambda session: session.read_resource("flights://available-dates"),
+        "resource:route-availability": lambda session: session.read_resource(
+            f"flights://availability/{search_date}/LAX/MCO"),
+    }
+
+
+async def run_client(url: str, operations: dict, iterations: int,
+                     latencies: dict[str, list[float]], errors: dict[str, int]):
+    async with streamablehttp_client(url) as (read_stream, write_stream, _):
+        async with ClientSession(read_stream, write_stream, elicitation_callback=stub_elicitation_callback) as session:
+            await session.initialize()
+            for _ in range(iterations):
+                for name, operation in operations.items():
+                    started = time.perf_counter()
+                    try:
+                        result = await operation(session)
+                        if getattr(result, "isError", False):
+                            errors[name] += 1
+                            continue
+                    except Exception:
+                        errors[name] += 1
+                        continue
+                    latencies[name].append(time.perf_counter() - started)
+
+
+def wait_for_port(host: str, port: int, timeout: float):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError(f"Flights MCP Service did not start listening on {host}:{port}")
+
+
+def start_server(host: str, port: int, extra_environment: dict[str, str]) -> subprocess.Popen:
+    environment = {**os.environ, "FLIGHTS_MCP_HOST": host, "FLIGHTS_MCP_PORT": str(port), **extra_environment}
+    server = subprocess.Popen([sys.executable, "flights_mcp_service.py"], cwd=PROJECT_DIRECTORY, env=environment,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(host, port, timeout=60)
+    except TimeoutError:
+        server.terminate()
+        raise
+    return server
+
+
+async def run_benchmark(url: str, clients: int, iterations: int, forget_traveller: bool) -> dict:
+    operations = build_operations(forget_traveller)
+    latencies: dict[str, list[float]] = {name: [] for name in operations}
+    errors: dict[str, int] = {name: 0 for name in operations}
+
+    started = time.perf_counter()
+    await asyncio.gather(*(run_client(url, operations, iterations, latencies, errors) for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+
+    completed = sum(len(values) for values in latencies.values())
+    return {
+        "elapsed_seconds": elapsed,
+        "requests": completed,
+        "throughput_rps": completed / elapsed if elapsed else 0.0,
+        "operations": {name: summarize_latencies(latencies[name], errors[name]) for name in operations},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Flights MCP Service over streamable HTTP")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent MCP client sessions")
+    parser.add_argument("--iterations", type=int, default=20, help="Passes over every operation per client")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--url", help="Benchmark an already running server instead of starting one")
+    parser.add_argument("--forget-traveller", action="store_true",
+                        help="Clear the session traveller cache before each international search, so it always elicits")
+    parser.add_argument("--snapshot", help="Start the server from this flight database snapshot")
+    parser.add_argument("--backend", choices=STORAGE_BACKENDS, default="memory", help="Storage backend of the started server")
+    parser.add_argument("--workers", type=int, default=1, help="Server processes behind the session affinity router")
+    parser.add_argument("--output", help="Where to write the JSON results")
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        extra_environment = {"FLIGHTS_STORAGE_BACKEND": args.backend, "FLIGHTS_WORKERS": str(args.workers)}
+        if args.snapshot:
+            extra_environment["FLIGHTS_SNAPSHOT_PATH"] = args.snapshot
+        server = start_server(args.host, args.port, extra_environment)
+        url = f"http://{args.host}:{args.port}/mcp"
+
+    try:
+        results = asyncio.run(run_benchmark(url, args.clients, args.iterations, args.forget_traveller))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    print(f"{results['requests']} requests in {results['elapsed_seconds']:.2f}s "
+          f"({results['throughput_rps']:.1f} requests/s) from {args.clients} clients\n")
+    print_latency_table(results["operations"])
+
+    config = {"clients": args.clients, "iterations": args.iterations, "url": url,
+              "forget_traveller": args.forget_traveller, "snapshot": args.snapshot, "backend": args.backend, "workers": args.workers}
+    path = save_results("service_load", config, results, args.output)
+    print(f"\nResults written to {path}")
+
+
+if __name__ == "__main__":
+    main()
+
+
+#  uv run -m benchmarks.service_load --clients 8 --iterations 20
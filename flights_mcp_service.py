@@ -1,16 +1,147 @@
 import asyncio
+import functools
+import os
+import signal
+import sys
+import tempfile
+from pathlib import Path
+from typing import Annotated, Callable
 
+import pydantic_core
 from mcp import ServerSession
 from mcp.server import FastMCP
 from mcp.server.fastmcp import Context
+from mcp.server.lowlevel import NotificationOptions
+from mcp.types import ServerCapabilities
+from pydantic import AnyUrl, Field
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
 
-from izzy_mcp_tutorials import FlightsDataAccessObject, AirportCode, PassportOwner
-from izzy_mcp_tutorials.models import TravellerInformation, FlightAvailability
+from izzy_mcp_tutorials import (FlightsDataAccessObject, AirportCode, PassportOwner, SharedFlightsDatabase, DatabaseStatus,
+                                TravellerInformationCache, TravellerCacheMetrics, MetricsRegistry, ServerMetrics,
+                                create_flight_store, DaoExecutor, ExecutorStats, ResponseCache, ResponseCacheStats,
+                                CachedResponse, FlightDataMaintainer, JsonLinesChangeFeed, MaintenanceReport,
+                                ResourceSubscriptions, load_airport_registry, write_snapshot)
+from izzy_mcp_tutorials.cluster import run_cluster
+from izzy_mcp_tutorials.models import (TravellerInformation, FlightAvailability, TravellerOverlay, Itinerary,
+                                       FlightSearchQuery, FlightSearchResult, FlightField, FlightSearchPage,
+                                       VisaCheckRoute, PassengerVisaRequirements)
+from izzy_mcp_tutorials.pagination import encode_cursor, decode_cursor, select_page, project_flights
 
 # Create the Flights MCP server
-mcp = FastMCP("Flights MCP Service")
+mcp = FastMCP("Flights MCP Service",
+              host=os.environ.get("FLIGHTS_MCP_HOST", "127.0.0.1"),
+              port=int(os.environ.get("FLIGHTS_MCP_PORT", "8000")))
+
+# Airports and countries come from the bundled data file unless FLIGHTS_AIRPORTS_PATH points to another one
+if os.environ.get("FLIGHTS_AIRPORTS_PATH"):
+    load_airport_registry(os.environ["FLIGHTS_AIRPORTS_PATH"])
+
+# Opt-in handler and operation timings, enabled with FLIGHTS_METRICS_ENABLED=1
+metrics = MetricsRegistry(enabled=os.environ.get("FLIGHTS_METRICS_ENABLED", "") in ("1", "true", "yes"))
+
+def build_flights_dao() -> FlightsDataAccessObject:
+    """
+    Load the flight data from FLIGHTS_SNAPSHOT_PATH if set. Otherwise use the
+    FLIGHTS_STORAGE_BACKEND storage backend (memory, columnar or sqlite, stored
+    in FLIGHTS_SQLITE_PATH), generating the data if the store is empty.
+    """
+    with metrics.timer("dao.construct"):
+        snapshot_path = os.environ.get("FLIGHTS_SNAPSHOT_PATH")
+        if snapshot_path:
+            return FlightsDataAccessObject.from_snapshot(snapshot_path)
+
+        store = create_flight_store(backend=os.environ.get("FLIGHTS_STORAGE_BACKEND", "memory"),
+                                    sqlite_path=os.environ.get("FLIGHTS_SQLITE_PATH", ":memory:"))
+        return FlightsDataAccessObject(database=store, populate=not store.get_available_dates())
+
+# Flight data shared by every request handled by this process
+flights_database = SharedFlightsDatabase(factory=build_flights_dao)
+
+# Where process pool workers map the current flight data, see export_worker_dao
+worker_snapshot_directory: tempfile.TemporaryDirectory | None = None
+
+def export_worker_dao() -> Callable[[], FlightsDataAccessObject]:
+    """
+    Return the DAO factory of new process pool workers, serving the current flight data.
+
+    Workers reading FLIGHTS_SNAPSHOT_PATH or a SQLite file build their DAO
+    from it again. Otherwise the current data is written to a snapshot that
+    the new workers memory-map.
+    """
+    global worker_snapshot_directory
+    dao = flights_database.get()
+    if dao.is_snapshot or getattr(dao.database, "concurrent_writes", False):
+        return build_flights_dao
+
+    if worker_snapshot_directory is None:
+        worker_snapshot_directory = tempfile.TemporaryDirectory(prefix="flights-mcp-workers-")
+    snapshot_path = Path(worker_snapshot_directory.name) / "flights.snapshot"
+    # Replaced atomically, workers of the previous pool keep their mapping
+    write_snapshot(dao.database, snapshot_path)
+    return functools.partial(FlightsDataAccessObject.from_snapshot, snapshot_path)
+
+# Runs DAO queries off the event loop: FLIGHTS_EXECUTOR is thread (default), process or inline.
+# Process pool workers are replaced whenever the shared flight data changes.
+dao_executor = DaoExecutor(kind=os.environ.get("FLIGHTS_EXECUTOR", "thread"),
+                           max_workers=int(os.environ.get("FLIGHTS_EXECUTOR_WORKERS", "4")),
+                           max_queue_depth=int(os.environ.get("FLIGHTS_EXECUTOR_QUEUE_DEPTH", "64")),
+                           timeout=float(os.environ.get("FLIGHTS_EXECUTOR_TIMEOUT_SECONDS", "30")),
+                           dao_factory=build_flights_dao,
+                           generation=lambda: flights_database.generation,
+                           export_dao=export_worker_dao)
+
+# Traveller information accepted in each session, reused by later international searches
+traveller_cache = TravellerInformationCache(ttl=float(os.environ.get("FLIGHTS_TRAVELLER_CACHE_TTL_SECONDS", "1800")))
+
+# Query results and their encoded JSON, dropped whenever the shared flight data is rebuilt
+response_cache = ResponseCache(max_bytes=int(os.environ.get("FLIGHTS_RESPONSE_CACHE_MAX_BYTES", str(16 * 1024 * 1024))))
+
+# Resource URIs each session subscribed to, notified when the flight data changes
+resource_subscriptions = ResourceSubscriptions()
+
+async def notify_resource_changes(report: MaintenanceReport):
+    """Send resource updated notifications for the subscribed resources a maintenance pass changed"""
+    changed_dates = set(report.addedDates) | set(report.evictedDates)
+    changed_routes = set(report.changedRoutes)
+
+    def is_affected(uri: str) -> bool:
+        if report.fullRebuild or uri == "flights://database/status":
+            return True
+        if uri == "flights://available-dates":
+            return bool(changed_dates)
+        if uri.startswith("flights://availability/"):
+            route = tuple(uri.removeprefix("flights://availability/").split("/"))
+            return route[0] in changed_dates or route in changed_routes
+        return False
+
+    await resource_subscriptions.notify(is_affected)
+
+# Rolls the availability window forward and applies FLIGHTS_CHANGE_FEED_PATH changes every
+# FLIGHTS_MAINTENANCE_INTERVAL_SECONDS seconds (0 disables it)
+change_feed_path = os.environ.get("FLIGHTS_CHANGE_FEED_PATH")
+maintainer = FlightDataMaintainer(flights_database,
+                                  interval=float(os.environ.get("FLIGHTS_MAINTENANCE_INTERVAL_SECONDS", "300")),
+                                  feed=JsonLinesChangeFeed(change_feed_path) if change_feed_path else None,
+                                  on_change=notify_resource_changes)
+
+async def cached_dao_call(dao: FlightsDataAccessObject, generation: int, key: tuple, method_name: str,
+                          **kwargs) -> CachedResponse:
+    """
+    Answer a DAO query from the response cache, running it on the DAO executor on a miss.
+
+    Only traveller independent results may be cached; callers personalize the
+    cached value afterwards.
+    """
+    cached = response_cache.get(key, generation)
+    if cached is None:
+        with metrics.timer(f"dao.{method_name}"):
+            value = await dao_executor.call(dao, method_name, **kwargs)
+        cached = response_cache.put(key, generation, value)
+    return cached
 
 @mcp.tool(description="Retrieve all available passport ids")
+@metrics.instrument("tool")
 async def get_available_passport_ids()->list[str]:
     """
     Retrieve all available passport identifiers in the database.
@@ -18,10 +149,11 @@ async def get_available_passport_ids()->list[str]:
     Returns:
         list[str]: A list of passport ids for travellers in the database.
     """
-    dao = FlightsDataAccessObject()
+    dao = flights_database.get()
     return dao.get_passport_ids()
 
 @mcp.tool(description="Retrieve details for the owner of a specific passport id")
+@metrics.instrument("tool")
 async def get_passport_owner(passport_id: str) -> PassportOwner:
     """
     Retrieves the profile data for the specified passport id.
@@ -32,10 +164,47 @@ async def get_passport_owner(passport_id: str) -> PassportOwner:
     Returns:
         PassportOwner: The profile of the passport owner matching the identifier
     """
-    dao = FlightsDataAccessObject()
+    dao = flights_database.get()
     return dao.get_passport_owner(passport_id=passport_id)
 
+@mcp.tool(description="Retrieve details for the owners of several passport ids at once")
+@metrics.instrument("tool")
+async def get_passport_owners(passport_ids: list[str]) -> dict[str, PassportOwner | None]:
+    """
+    Retrieves the profile data for several passport ids in one call.
+
+    Args:
+        passport_ids (list[str]): The passport identifiers.
+
+    Returns:
+        dict[str, PassportOwner | None]: The profile for each passport id, or
+            null when the passport id is unknown
+    """
+    dao = flights_database.get()
+    return dao.get_passport_owners(passport_ids=passport_ids)
+
+@mcp.tool(description="Check which routes each passenger of a manifest needs a travel visa for")
+@metrics.instrument("tool")
+async def check_visa_requirements(passport_ids: list[str],
+                                  routes: list[VisaCheckRoute]) -> list[PassengerVisaRequirements]:
+    """
+    Checks every passenger of a manifest against every route in one pass.
+
+    Args:
+        passport_ids (list[str]): The passengers' passport identifiers.
+        routes (list[VisaCheckRoute]): The routes to check.
+
+    Returns:
+        list[PassengerVisaRequirements]: For each passenger in the order given,
+            whether they need a travel visa for each route. Unknown passport
+            ids have null requirements
+    """
+    dao = flights_database.get()
+    with metrics.timer("dao.check_visa_requirements"):
+        return await dao_executor.call(dao, "check_visa_requirements", passport_ids=passport_ids, routes=routes)
+
 @mcp.tool(description="Retrieve all dates for which flight availability data exists")
+@metrics.instrument("tool")
 async def get_available_dates()->list[str]:
     """
     Retrieve all dates for which flight availability data exists.
@@ -43,10 +212,12 @@ async def get_available_dates()->list[str]:
     Returns:
         list[str]: A list of date strings in YYYY-MM-DD format.
     """
-    dao = FlightsDataAccessObject()
-    return dao.get_available_dates()
+    dao, generation = flights_database.get_with_generation()
+    cached = await cached_dao_call(dao, generation, ("get_available_dates",), "get_available_dates")
+    return cached.value
 
 @mcp.tool(description="Search for available flights between two airports on a given date")
+@metrics.instrument("tool")
 async def flight_search(search_date: str,
                   source_airport: AirportCode,
                   destination_airport: AirportCode,
@@ -65,40 +236,317 @@ async def flight_search(search_date: str,
         list[FlightAvailability]: A list of matching flight availabilities
     """
 
-    dao = FlightsDataAccessObject()
-    search_results: list[FlightAvailability] = []
-    query_results = dao.search_flights(search_date=search_date, source_airport=source_airport, destination_airport=destination_airport)
+    dao, generation = flights_database.get_with_generation()
+    cached = await cached_dao_call(dao, generation, ("search_flights", search_date, source_airport, destination_airport),
+                                   "search_flights", search_date=search_date, source_airport=source_airport,
+                                   destination_airport=destination_airport)
+    query_results = cached.value
 
     is_international_flight = dao.is_international_flight(source_airport, destination_airport)
 
     if is_international_flight:
-        elicitation_result = await ctx.elicit(message="Please enter your passport id", schema=TravellerInformation)
-
-        if elicitation_result.action == "accept" and elicitation_result.data:
-            if elicitation_result.data.traveller_has_passport:
-                passport_id = elicitation_result.data.passport_id
-                is_destination_citizen = dao.is_destination_citizen(passport_id=passport_id, airport_code=destination_airport)
-                for query_result in query_results:
-                    query_result.travellerId = passport_id
-                    query_result.visaRequired = is_destination_citizen is not True
-                    search_results.append(query_result)
-            else:
-                return query_results
-        else:
-            return query_results
+        passport_id = await elicit_passport_id(ctx)
+        if passport_id is not None:
+            # The overlay copies the cached flights, so the shared entry stays traveller independent
+            return traveller_overlay(dao, passport_id, destination_airport).apply(query_results)
+
+    return query_results
+
+@mcp.tool(description="Search for available flights for several routes and dates in one call")
+@metrics.instrument("tool")
+async def flight_search_batch(queries: list[FlightSearchQuery],
+                              ctx: Context[ServerSession, None]) -> list[FlightSearchResult]:
+    """
+    Search for available flights for several routes and dates in one call.
+
+    Args:
+        queries (list[FlightSearchQuery]): The searches to run. A query with an
+            endDate covers every date from its searchDate through its endDate.
+        ctx (Context[ServerSession, None]): The MCP or server session context
+            passed into the function for request handling.
+
+    Returns:
+        list[FlightSearchResult]: The matching flight availabilities, grouped
+            per query in the order given
+    """
+    dao = flights_database.get()
+    with metrics.timer("dao.search_flights_batch"):
+        search_results = await dao_executor.call(dao, "search_flights_batch", queries=queries)
+
+    is_international = [dao.is_international_flight(result.query.sourceAirport, result.query.destinationAirport)
+                        for result in search_results]
+    if not any(is_international):
+        return search_results
+
+    # A single elicitation covers every international query in the batch
+    passport_id = await elicit_passport_id(ctx)
+    if passport_id is None:
+        return search_results
+
+    personalized_results: list[FlightSearchResult] = []
+    for result, is_international_flight in zip(search_results, is_international):
+        if is_international_flight:
+            overlay = traveller_overlay(dao, passport_id, result.query.destinationAirport)
+            result = FlightSearchResult(query=result.query, flights=overlay.apply(result.flights))
+        personalized_results.append(result)
+    return personalized_results
+
+# Flights per progress notification when flight_search_page streams its results
+STREAM_CHUNK_SIZE = 25
+
+@mcp.tool(description="Search for available flights one page at a time, with optional date range, sorting and field selection")
+@metrics.instrument("tool")
+async def flight_search_page(search_date: str,
+                             source_airport: AirportCode,
+                             destination_airport: AirportCode,
+                             ctx: Context[ServerSession, None],
+                             end_date: str | None = None,
+                             fields: list[FlightField] | None = None,
+                             sort_by: FlightField | None = None,
+                             descending: bool = False,
+                             limit: Annotated[int, Field(ge=1, le=500)] = 50,
+                             cursor: str | None = None,
+                             stream: bool = False) -> FlightSearchPage:
+    """
+    Search for available flights between two airports and return one page of results.
+
+    Args:
+        search_date (str): The departure date in YYYY-MM-DD format.
+        source_airport (AirportCode): The IATA code of the source airport.
+        destination_airport (AirportCode): The IATA code of the destination airport.
+        ctx (Context[ServerSession, None]): The MCP or server session context
+            passed into the function for request handling.
+        end_date (str | None): Also search every date up to this one, in YYYY-MM-DD format.
+        fields (list[FlightField] | None): The fields to return for each flight,
+            e.g. ["id", "airline", "departureDate"]. Defaults to every field.
+        sort_by (FlightField | None): The field to order the flights by.
+            Defaults to departure date, then the order the flights were added.
+        descending (bool): Whether to sort in descending order.
+        limit (int): The maximum number of flights on the page.
+        cursor (str | None): The nextCursor of the previous page.
+        stream (bool): Also send the flights in progress notifications as the
+            page is built, when the client asked for progress.
+
+    Returns:
+        FlightSearchPage: The flights of the page, the total number of matches
+            and the cursor of the next page
+    """
+    dao, generation = flights_database.get_with_generation()
+    query = (search_date, end_date, source_airport, destination_airport, sort_by, descending)
+    offset = decode_cursor(cursor, generation, query) if cursor else 0
 
+    if end_date is None:
+        search_dates = [search_date]
     else:
-        return query_results
-    return search_results
+        available_dates = await cached_dao_call(dao, generation, ("get_available_dates",), "get_available_dates")
+        search_dates = [d for d in available_dates.value if search_date <= d <= end_date]
+
+    results: list[list[FlightAvailability]] = []
+    for departure_date in search_dates:
+        cached = await cached_dao_call(dao, generation, ("search_flights", departure_date, source_airport, destination_airport),
+                                       "search_flights", search_date=departure_date, source_airport=source_airport,
+                                       destination_airport=destination_airport)
+        results.append(cached.value)
+    total_count = sum(len(flights) for flights in results)
+    page = select_page(results, offset=offset, limit=limit, sort_by=sort_by, descending=descending)
+
+    overlay = None
+    if page and dao.is_international_flight(source_airport, destination_airport):
+        passport_id = await elicit_passport_id(ctx)
+        if passport_id is not None:
+            overlay = traveller_overlay(dao, passport_id, destination_airport)
+
+    flights: list[dict] = []
+    for start in range(0, len(page), STREAM_CHUNK_SIZE):
+        chunk = page[start:start + STREAM_CHUNK_SIZE]
+        projected = project_flights(overlay.apply(chunk) if overlay else chunk, fields)
+        flights.extend(projected)
+        if stream:
+            await ctx.report_progress(progress=len(flights), total=len(page),
+                                      message=pydantic_core.to_json({"offset": offset + start, "flights": projected}).decode())
+
+    next_offset = offset + len(page)
+    next_cursor = encode_cursor(next_offset, generation, query) if next_offset < total_count else None
+    return FlightSearchPage(flights=flights, totalCount=total_count, nextCursor=next_cursor)
+
+@mcp.tool(description="Forget the traveller information provided earlier in this session")
+@metrics.instrument("tool")
+async def forget_traveller_information(ctx: Context[ServerSession, None]) -> bool:
+    """
+    Forget the traveller information provided earlier in this session, so the
+    next international search asks for it again.
+
+    Args:
+        ctx (Context[ServerSession, None]): The MCP or server session context
+            passed into the function for request handling.
+
+    Returns:
+        bool: True if traveller information was cached for this session
+    """
+    return traveller_cache.invalidate(ctx.session)
+
+# How often the traveller is asked again after entering an unknown passport id
+PASSPORT_ELICITATION_ATTEMPTS = 3
+
+async def elicit_passport_id(ctx: Context[ServerSession, None]) -> str | None:
+    """
+    Ask the client for the traveller's passport id, returning None if none was provided.
+
+    Answers accepted earlier in the same session are reused until they expire.
+    Only answers with a known passport id are cached; unknown ids are asked
+    for again.
+
+    Raises:
+        ValueError: If every attempt gave an unknown passport id.
+    """
+    traveller_information = traveller_cache.get(ctx.session)
+    if traveller_information is not None:
+        return traveller_information.passport_id if traveller_information.traveller_has_passport else None
+
+    dao = flights_database.get()
+    message = "Please enter your passport id"
+    for _ in range(PASSPORT_ELICITATION_ATTEMPTS):
+        traveller_cache.record_elicitation()
+        with metrics.timer("elicitation.wait"):
+            elicitation_result = await ctx.elicit(message=message, schema=TravellerInformation)
+        if elicitation_result.action != "accept" or not elicitation_result.data:
+            return None
+        traveller_information = elicitation_result.data
+        if not traveller_information.traveller_has_passport:
+            traveller_cache.put(ctx.session, traveller_information)
+            return None
+        if dao.get_passport_owner(passport_id=traveller_information.passport_id) is not None:
+            traveller_cache.put(ctx.session, traveller_information)
+            return traveller_information.passport_id
+        message = f"Passport id {traveller_information.passport_id} was not found, please enter your passport id"
+
+    raise ValueError(f"Passport id {traveller_information.passport_id!r} was not found")
+
+def traveller_overlay(dao: FlightsDataAccessObject, passport_id: str, destination_airport: AirportCode) -> TravellerOverlay:
+    """Build the traveller specific values for flights to the destination airport"""
+    is_destination_citizen = dao.is_destination_citizen(passport_id=passport_id, airport_code=destination_airport)
+    return TravellerOverlay(travellerId=passport_id, visaRequired=is_destination_citizen is not True)
+
+@mcp.tool(description="Search for direct and connecting flight itineraries between two airports over a date range")
+@metrics.instrument("tool")
+async def connection_search(start_date: str,
+                            end_date: str,
+                            source_airport: AirportCode,
+                            destination_airport: AirportCode,
+                            max_legs: Annotated[int, Field(ge=1, le=4)] = 2,
+                            max_results: Annotated[int, Field(ge=1, le=50)] = 10) -> list[Itinerary]:
+    """
+    Search for direct and connecting flight itineraries between two airports.
+
+    Args:
+        start_date (str): The earliest departure date in YYYY-MM-DD format.
+        end_date (str): The latest departure date of any leg in YYYY-MM-DD format.
+        source_airport (AirportCode): The IATA code of the source airport.
+        destination_airport (AirportCode): The IATA code of the destination airport.
+        max_legs (int): The maximum number of flights per itinerary.
+        max_results (int): The maximum number of itineraries to return.
+
+    Returns:
+        list[Itinerary]: The best itineraries, fewest legs and earliest arrival first
+    """
+    dao = flights_database.get()
+    with metrics.timer("dao.search_connections"):
+        return await dao_executor.call(dao, "search_connections", start_date=start_date, end_date=end_date,
+                                       source_airport=source_airport, destination_airport=destination_airport,
+                                       max_legs=max_legs, max_results=max_results)
 
 
 @mcp.resource("passport://passport-owner/{passport_id}")
-async def get_passport_owner(passport_id: str):
+@metrics.instrument("resource")
+async def get_passport_owner(passport_id: str) -> str:
     """Returns details about the passport owner"""
-    dao = FlightsDataAccessObject()
-    return dao.get_passport_owner(passport_id=passport_id)
+    dao, generation = flights_database.get_with_generation()
+    key = (f"passport://passport-owner/{passport_id}",)
+    cached = response_cache.get(key, generation)
+    if cached is None:
+        cached = response_cache.put(key, generation, dao.get_passport_owner(passport_id=passport_id))
+    return cached.payload
+
+@mcp.resource("flights://available-dates", mime_type="application/json")
+@metrics.instrument("resource")
+async def get_available_dates_resource() -> str:
+    """Returns every date for which flight availability data exists"""
+    dao, generation = flights_database.get_with_generation()
+    cached = await cached_dao_call(dao, generation, ("get_available_dates",), "get_available_dates")
+    return cached.payload
+
+@mcp.resource("flights://availability/{search_date}/{source_airport}/{destination_airport}", mime_type="application/json")
+@metrics.instrument("resource")
+async def get_route_availability(search_date: str, source_airport: AirportCode, destination_airport: AirportCode) -> str:
+    """Returns the flights between two airports on a date, without traveller specific values"""
+    dao, generation = flights_database.get_with_generation()
+    cached = await cached_dao_call(dao, generation, ("search_flights", search_date, source_airport, destination_airport),
+                                   "search_flights", search_date=search_date, source_airport=source_airport,
+                                   destination_airport=destination_airport)
+    return cached.payload
+
+@mcp.resource("flights://database/status")
+@metrics.instrument("resource")
+async def get_database_status() -> DatabaseStatus:
+    """Returns the generation, build time and staleness of the shared flight data"""
+    return flights_database.status()
+
+@mcp.resource("flights://traveller-cache/metrics")
+@metrics.instrument("resource")
+async def get_traveller_cache_metrics() -> TravellerCacheMetrics:
+    """Returns hit, miss and elicitation counts for the session traveller information cache"""
+    return traveller_cache.metrics()
+
+@mcp.resource("metrics://server")
+@metrics.instrument("resource")
+async def get_server_metrics() -> ServerMetrics:
+    """Returns call counts, errors and latency histograms for handlers and the operations inside them"""
+    return metrics.snapshot()
+
+@mcp.resource("flights://executor/stats")
+@metrics.instrument("resource")
+async def get_executor_stats() -> ExecutorStats:
+    """Returns the queue depth, wait times, rejections and timeouts of the DAO executor"""
+    return dao_executor.stats()
+
+@mcp.resource("flights://response-cache/stats")
+@metrics.instrument("resource")
+async def get_response_cache_stats() -> ResponseCacheStats:
+    """Returns hit, miss and eviction counts and the size of the response cache"""
+    return response_cache.stats()
+
+# FastMCP has no decorators for resource subscriptions, so they are registered on its low-level server
+@mcp._mcp_server.subscribe_resource()
+async def subscribe_resource(uri: AnyUrl):
+    """Subscribes the calling session to updates of a resource"""
+    resource_subscriptions.subscribe(mcp.get_context().session, str(uri))
+
+@mcp._mcp_server.unsubscribe_resource()
+async def unsubscribe_resource(uri: AnyUrl):
+    """Unsubscribes the calling session from updates of a resource"""
+    resource_subscriptions.unsubscribe(mcp.get_context().session, str(uri))
+
+# The low-level server always advertises subscribe=False, so clients would never send resources/subscribe
+server_capabilities = mcp._mcp_server.get_capabilities
+
+def get_capabilities_with_subscriptions(notification_options: NotificationOptions,
+                                        experimental_capabilities: dict[str, dict]) -> ServerCapabilities:
+    """Advertises the server capabilities, with resource subscriptions enabled"""
+    capabilities = server_capabilities(notification_options, experimental_capabilities)
+    if capabilities.resources is not None:
+        capabilities.resources = capabilities.resources.model_copy(update={"subscribe": True})
+    return capabilities
+
+mcp._mcp_server.get_capabilities = get_capabilities_with_subscriptions
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def prometheus_metrics(request: Request) -> PlainTextResponse:
+    """Serves the server metrics in the Prometheus text exposition format"""
+    return PlainTextResponse(metrics.prometheus_text() + dao_executor.prometheus_text(),
+                             media_type="text/plain; version=0.0.4")
 
 @mcp.resource("airport://airport-country/{airport_code}")
+@metrics.instrument("resource")
 async def get_airport_country(airport_code: AirportCode):
     """Returns the country code for the airport"""
     return FlightsDataAccessObject.airport_country(airport=airport_code)
@@ -111,7 +559,73 @@ async def get_passenger(passport_id: str) -> str:
 
 
 async def main():
-    await mcp.run_streamable_http_async()
+    # uvicorn re-raises the signal that stopped it; exit normally so the process pool is shut down below
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    if hasattr(signal, "SIGHUP"):
+        # Sent by the cluster coordinator once it has updated the shared data
+        reloads: set[asyncio.Task] = set()
+
+        def reload():
+            task = asyncio.create_task(maintainer.reload())
+            reloads.add(task)
+            task.add_done_callback(reloads.discard)
+
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, reload)
+
+    flights_database.start()
+    dao_executor.start()
+    if maintainer.interval > 0:
+        maintainer.start()
+    try:
+        await mcp.run_streamable_http_async()
+    finally:
+        await maintainer.stop()
+        dao_executor.shutdown(wait=False)
+        flights_database.shutdown()
+
+def main_cluster(workers: int):
+    """
+    Serve from several processes behind a session affinity router on the configured port.
+
+    The workers share one copy of the flight data: FLIGHTS_SNAPSHOT_PATH or a
+    SQLite file if configured, otherwise a snapshot written before the workers
+    start and memory-mapped by each of them. The data is built once, here.
+    Workers do not maintain it; this process does, every
+    FLIGHTS_MAINTENANCE_INTERVAL_SECONDS. It rolls the SQLite file, or its
+    own copy followed by a new snapshot, and then tells the workers to
+    reload. A configured snapshot stays frozen.
+    """
+    # The coordinator below maintains the data for every worker
+    environment = {"FLIGHTS_WORKERS": "1", "FLIGHTS_MCP_HOST": "127.0.0.1", "FLIGHTS_MAINTENANCE_INTERVAL_SECONDS": "0"}
+    sqlite_path = os.environ.get("FLIGHTS_SQLITE_PATH", ":memory:")
+    shares_sqlite_file = os.environ.get("FLIGHTS_STORAGE_BACKEND") == "sqlite" and sqlite_path != ":memory:"
+
+    with tempfile.TemporaryDirectory(prefix="flights-mcp-") as directory:
+        # Populating a shared SQLite file once here keeps the workers from each inserting the data
+        flights_database.start()
+        snapshot_path = None
+        if not os.environ.get("FLIGHTS_SNAPSHOT_PATH") and not shares_sqlite_file:
+            snapshot_path = Path(directory) / "flights.snapshot"
+            write_snapshot(flights_database.get().database, snapshot_path)
+            environment["FLIGHTS_SNAPSHOT_PATH"] = str(snapshot_path)
+
+        def maintain() -> bool:
+            if maintainer.maintain() is None:
+                return False
+            if snapshot_path is not None:
+                write_snapshot(flights_database.get().database, snapshot_path)
+            return True
+
+        run_cluster([sys.executable, __file__], workers=workers, host=mcp.settings.host, port=mcp.settings.port,
+                    base_port=int(os.environ.get("FLIGHTS_WORKER_BASE_PORT", str(mcp.settings.port + 1))),
+                    environment=environment, router_workers=int(os.environ.get("FLIGHTS_ROUTER_WORKERS", "1")),
+                    maintain=maintain if maintainer.interval > 0 else None, maintenance_interval=maintainer.interval)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    # FLIGHTS_WORKERS > 1 serves from that many processes sharing one copy of the flight data
+    flights_workers = int(os.environ.get("FLIGHTS_WORKERS", "1"))
+    if flights_workers > 1:
+        main_cluster(flights_workers)
+    else:
+        asyncio.run(main())
\ No newline at end of file
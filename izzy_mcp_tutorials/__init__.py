@@ -1,12 +1,52 @@
 
+from .airports import AirportRegistry, get_airport_registry, load_airport_registry
+from .columnar import ColumnarFlightDatabase
+from .sqlite_database import SqliteFlightDatabase
+from .storage import FlightStore, MutableFlightStore, create_flight_store
 from .data_access_objects import FlightsDataAccessObject
 from .models import FlightDatabase, FlightAvailability, CountryCode, AirportCode, PassportOwner
+from .snapshots import write_snapshot, load_snapshot
+from .traveller_cache import TravellerInformationCache, TravellerCacheMetrics
+from .metrics import MetricsRegistry, ServerMetrics
+from .executors import DaoExecutor, ExecutorStats, ExecutorOverloadedError
+from .shared_database import SharedFlightsDatabase, DatabaseStatus
+from .response_cache import ResponseCache, ResponseCacheStats, CachedResponse
+from .maintenance import FlightDataMaintainer, JsonLinesChangeFeed, MaintenanceReport
+from .subscriptions import ResourceSubscriptions
+from .visa import VisaRequirementIndex
 
 __all__ = (
     "CountryCode",
     "AirportCode",
+    "AirportRegistry",
+    "get_airport_registry",
+    "load_airport_registry",
     "FlightDatabase",
+    "ColumnarFlightDatabase",
+    "SqliteFlightDatabase",
+    "FlightStore",
+    "MutableFlightStore",
+    "create_flight_store",
     "FlightAvailability",
     "FlightsDataAccessObject",
-    "PassportOwner"
+    "PassportOwner",
+    "SharedFlightsDatabase",
+    "DatabaseStatus",
+    "write_snapshot",
+    "load_snapshot",
+    "TravellerInformationCache",
+    "TravellerCacheMetrics",
+    "MetricsRegistry",
+    "ServerMetrics",
+    "DaoExecutor",
+    "ExecutorStats",
+    "ExecutorOverloadedError",
+    "ResponseCache",
+    "ResponseCacheStats",
+    "CachedResponse",
+    "FlightDataMaintainer",
+    "JsonLinesChangeFeed",
+    "MaintenanceReport",
+    "ResourceSubscriptions",
+    "VisaRequirementIndex"
 )
@@ -0,0 +1,131 @@
+import csv
+import sys
+from pathlib import Path
+from typing import Iterable, Iterator
+
+DEFAULT_AIRPORTS_PATH = Path(__file__).parent / "data" / "airports.csv"
+
+# Citizenships of the sample passport owners, valid country codes whichever airports are loaded
+BASELINE_COUNTRIES = ("US", "MX", "CA")
+
+
+class AirportRegistry:
+    """
+        Airports and the countries they are in, loaded from a data file.
+
+        Codes are interned, so validated values and generated records share a
+        single string object per airport or country, and every lookup is a
+        dictionary access. Valid country codes are the countries of the
+        airports plus `BASELINE_COUNTRIES`, so citizenships stay valid with an
+        airport file that has no airport in those countries.
+
+    Attributes:
+        served_airports (list[str]): The airports the sample flight schedule
+            connects, in file order.
+    """
+    def __init__(self, airports: Iterable[tuple[str, str, str, bool]]):
+        """
+        Args:
+            airports (Iterable[tuple[str, str, str, bool]]): The IATA airport
+                code, ISO country code, name and whether the sample schedule
+                serves the airport, for every airport.
+        """
+        self._countries: dict[str, str] = {}
+        self._names: dict[str, str] = {}
+        self.served_airports: list[str] = []
+
+        for code, country, name, served in airports:
+            code, country = sys.intern(code), sys.intern(country)
+            self._countries[code] = country
+            self._names[code] = name
+            if served:
+                self.served_airports.append(code)
+        # Map equal strings to the interned codes
+        self._airport_codes: dict[str, str] = {code: code for code in self._countries}
+        self._country_codes: dict[str, str] = {country: country for country in
+                                               (*map(sys.intern, BASELINE_COUNTRIES), *self._countries.values())}
+
+    @classmethod
+    def from_csv(cls, path: str | Path = DEFAULT_AIRPORTS_PATH) -> "AirportRegistry":
+        """
+        Load the registry from a CSV file with code, country, name and served columns.
+
+        Args:
+            path (str | Path): The CSV file. Defaults to the bundled airports.
+
+        Returns:
+            AirportRegistry: The loaded registry.
+        """
+        with open(path, newline="", encoding="utf-8") as airports_file:
+            return cls((row["code"], row["country"], row["name"], row.get("served", "0") == "1")
+                       for row in csv.DictReader(airports_file))
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._countries
+
+    def __len__(self):
+        return len(self._countries)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._countries)
+
+    def country(self, code: str) -> str:
+        """
+        Look up the country of an airport.
+
+        Raises:
+            KeyError: If the airport is unknown.
+        """
+        return self._countries[code]
+
+    def name(self, code: str) -> str:
+        """The name of an airport, or an empty string if it is unknown."""
+        return self._names.get(code, "")
+
+    def airport_code(self, code: str) -> str | None:
+        """The interned airport code equal to `code`, or None if it is unknown."""
+        return self._airport_codes.get(code)
+
+    def country_code(self, code: str) -> str | None:
+        """The interned country code equal to `code`, or None if it is not a known country."""
+        return self._country_codes.get(code)
+
+
+_registry = AirportRegistry.from_csv()
+
+
+def get_airport_registry() -> AirportRegistry:
+    """The registry used to validate airport and country codes."""
+    return _registry
+
+
+def load_airport_registry(path: str | Path) -> AirportRegistry:
+    """
+    Replace the registry with the airports in a CSV file, e.g. a full IATA list.
+
+    Data access objects created afterwards generate their sample schedule for
+    the new registry's served airports.
+
+    Args:
+        path (str | Path): The CSV file.
+
+    Returns:
+        AirportRegistry: The new registry.
+    """
+    global _registry
+    _registry = AirportRegistry.from_csv(path)
+    return _registry
+
+
+def validate_airport_code(code: str) -> str:
+    interned = _registry.airport_code(code)
+    if interned is None:
+        raise ValueError(f"Unknown airport code {code!r}")
+    return interned
+
+
+def validate_country_code(code: str) -> str:
+    interned = _registry.country_code(code)
+    if interned is None:
+        raise ValueError(f"Unknown country code {code!r}")
+    return interned
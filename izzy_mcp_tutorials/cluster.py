@@ -0,0 +1,105 @@
+import logging
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from typing import Callable
+
+import uvicorn
+
+logger = logging.getLogger(__name__)
+
+
+def wait_for_port(host: str, port: int, timeout: float = 30.0):
+    """
+    Wait until a server accepts connections.
+
+    Raises:
+        TimeoutError: If nothing listens on the port within `timeout` seconds.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError(f"Nothing started listening on {host}:{port}")
+
+
+def run_cluster(command: list[str], workers: int, host: str, port: int, base_port: int,
+                environment: dict[str, str] | None = None, router_workers: int = 1,
+                worker_port_variable: str = "FLIGHTS_MCP_PORT", maintain: Callable[[], bool] | None = None,
+                maintenance_interval: float = 300.0):
+    """
+    Run several MCP server processes behind a session affinity router.
+
+    Each worker runs `command` and must listen on 127.0.0.1 at `base_port`
+    plus its index, which is passed in `worker_port_variable`. The router
+    listens on `host`:`port` and sends every request of a session to the
+    worker that created it. Blocks until the router stops, then stops the
+    workers. If a worker exits, the router is stopped too.
+
+    The workers share their data, so they do not maintain it themselves.
+    Instead `maintain` runs in this process every `maintenance_interval`
+    seconds, and when it reports a change every worker is sent SIGHUP to
+    reload the data.
+
+    Args:
+        command (list[str]): The command that starts one server process.
+        workers (int): Number of server processes.
+        host (str): Interface the router listens on.
+        port (int): Port the router listens on.
+        base_port (int): Port of the first worker.
+        environment (dict[str, str] | None): Extra environment variables of the workers.
+        router_workers (int): Number of router processes sharing the port.
+        worker_port_variable (str): Environment variable holding each worker's port.
+        maintain (Callable[[], bool] | None): Updates the shared data,
+            returning True if the workers should reload it.
+        maintenance_interval (float): Seconds between `maintain` calls.
+    """
+    worker_ports = [base_port + index for index in range(workers)]
+    processes = [subprocess.Popen(command, env={**os.environ, **(environment or {}), worker_port_variable: str(worker_port)})
+                 for worker_port in worker_ports]
+    stopping = threading.Event()
+
+    # uvicorn re-raises the signal that stopped it; exit normally so the workers are stopped below
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    def stop_when_a_worker_exits():
+        while not stopping.wait(1.0):
+            if any(process.poll() is not None for process in processes):
+                os.kill(os.getpid(), signal.SIGTERM)
+                return
+
+    def coordinate_maintenance():
+        while not stopping.wait(maintenance_interval):
+            try:
+                changed = maintain()
+            except Exception:
+                logger.exception("Shared flight data maintenance failed")
+                continue
+            if changed:
+                for process in processes:
+                    if process.poll() is None:
+                        process.send_signal(signal.SIGHUP)
+
+    try:
+        for worker_port in worker_ports:
+            wait_for_port("127.0.0.1", worker_port)
+        threading.Thread(target=stop_when_a_worker_exits, daemon=True).start()
+        if maintain is not None:
+            threading.Thread(target=coordinate_maintenance, name="flights-maintenance", daemon=True).start()
+
+        os.environ["FLIGHTS_ROUTER_BACKENDS"] = ",".join(f"http://127.0.0.1:{worker_port}" for worker_port in worker_ports)
+        uvicorn.run("izzy_mcp_tutorials.session_router:create_router_from_environment", factory=True,
+                    host=host, port=port, workers=router_workers, log_level="warning")
+    finally:
+        stopping.set()
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
@@ -0,0 +1,237 @@
+import sys
+from array import array
+
+from .models import FlightAvailability
+
+
+class StringTable:
+    """
+        Dictionary encoding for a column of repeated strings.
+
+        Each distinct value is interned and stored once; rows refer to it by a
+        small integer code.
+
+    Attributes:
+        values (list[str]): The distinct values, indexed by code.
+        codes (dict[str, int]): Mapping of each distinct value to its code.
+    """
+    def __init__(self, values: list[str] | None = None):
+        self.values: list[str] = []
+        self.codes: dict[str, int] = {}
+        for value in values or []:
+            self.encode(value)
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            value = sys.intern(value)
+            self.values.append(value)
+            self.codes[value] = code
+        return code
+
+    def lookup(self, value: str) -> int | None:
+        return self.codes.get(value)
+
+    def decode(self, code: int) -> str:
+        return self.values[code]
+
+    def __len__(self):
+        return len(self.values)
+
+
+class ColumnarFlightDatabase:
+    """
+        Column-oriented, array-backed alternative to `FlightDatabase`.
+
+        Every field of a FlightAvailability is stored in its own typed array.
+        Airport codes, country codes, airlines, dates and identifiers are
+        dictionary encoded through a StringTable, so a record costs a few bytes
+        per column instead of a full pydantic model. FlightAvailability models
+        are only created for the rows a lookup returns.
+
+        The public methods mirror `FlightDatabase`, so either can back a
+        FlightsDataAccessObject. Removing records only drops their row numbers
+        from the indexes; the rows stay in the columns, unreachable, until the
+        database is rebuilt.
+
+    Attributes:
+        read_only (bool): True when the columns are backed by a memory-mapped
+            snapshot and can no longer be appended to.
+    """
+
+    # uint16 codes for low cardinality columns, uint32 for the rest
+    SMALL_CODE = "H"
+    LARGE_CODE = "I"
+
+    def __init__(self):
+        self.ids = StringTable()
+        self.dates = StringTable()
+        self.airports = StringTable()
+        self.countries = StringTable()
+        self.airlines = StringTable()
+        self.travellers = StringTable()
+
+        self.id_column = array(self.LARGE_CODE)
+        self.date_column = array(self.SMALL_CODE)
+        self.source_column = array(self.SMALL_CODE)
+        self.destination_column = array(self.SMALL_CODE)
+        self.source_country_column = array(self.SMALL_CODE)
+        self.destination_country_column = array(self.SMALL_CODE)
+        self.airline_column = array(self.SMALL_CODE)
+        self.traveller_column = array(self.LARGE_CODE)
+        self.visa_column = array("B")
+
+        # Secondary indexes hold row numbers, keyed by encoded values
+        self._date_index: dict[int, array] = {}
+        self._route_index: dict[tuple[int, int, int], array] = {}
+        self._source_index: dict[tuple[int, int], array] = {}
+        self._airline_index: dict[int, array] = {}
+
+        self.read_only: bool = False
+        self._snapshot = None
+
+    def __len__(self):
+        return len(self.id_column)
+
+    def add_flight_availability(self, departure_date: str, availability: FlightAvailability):
+        self._check_writable()
+
+        row = len(self.id_column)
+
+        date_code = self.dates.encode(departure_date)
+        source_code = self.airports.encode(availability.sourceAirport)
+        destination_code = self.airports.encode(availability.destinationAirport)
+        airline_code = self.airlines.encode(availability.airline)
+
+        self.id_column.append(self.ids.encode(availability.id))
+        self.date_column.append(date_code)
+        self.source_column.append(source_code)
+        self.destination_column.append(destination_code)
+        self.source_country_column.append(self.countries.encode(availability.sourceAirportCountry))
+        self.destination_country_column.append(self.countries.encode(availability.destinationAirportCountry))
+        self.airline_column.append(airline_code)
+        self.traveller_column.append(self.travellers.encode(availability.travellerId))
+        self.visa_column.append(1 if availability.visaRequired else 0)
+
+        self._add_to_index(self._date_index, date_code, row)
+        self._add_to_index(self._route_index, (date_code, source_code, destination_code), row)
+        self._add_to_index(self._source_index, (source_code, date_code), row)
+        self._add_to_index(self._airline_index, airline_code, row)
+
+    def add_flight_availabilities(self, departure_date: str, availabilities: list[FlightAvailability]):
+        self._check_writable()
+        for availability in availabilities:
+            self.add_flight_availability(departure_date, availability)
+
+    def remove_date(self, departure_date: str) -> int:
+        self._check_writable()
+        date_code = self.dates.lookup(departure_date)
+        if date_code is None or date_code not in self._date_index:
+            return 0
+        return self._remove_rows(date_code, self._date_index[date_code])
+
+    def remove_flight_availability(self, departure_date: str, source_airport: str, destination_airport: str,
+                                   availability_id: str) -> int:
+        self._check_writable()
+        date_code = self.dates.lookup(departure_date)
+        source_code = self.airports.lookup(source_airport)
+        destination_code = self.airports.lookup(destination_airport)
+        id_code = self.ids.lookup(availability_id)
+        if date_code is None or source_code is None or destination_code is None or id_code is None:
+            return 0
+
+        route = self._route_index.get((date_code, source_code, destination_code), ())
+        return self._remove_rows(date_code, [row for row in route if self.id_column[row] == id_code])
+
+    def get_availability(self, departure_date: str) -> list[FlightAvailability]:
+        date_code = self.dates.lookup(departure_date)
+        if date_code is None:
+            return []
+        return self.materialize(self._date_index.get(date_code, ()))
+
+    def get_available_dates(self):
+        return [departure_date for code, departure_date in enumerate(self.dates.values) if code in self._date_index]
+
+    def get_route_availability(self, departure_date: str, source_airport: str, destination_airport: str) -> list[FlightAvailability]:
+        date_code = self.dates.lookup(departure_date)
+        source_code = self.airports.lookup(source_airport)
+        destination_code = self.airports.lookup(destination_airport)
+        if date_code is None or source_code is None or destination_code is None:
+            return []
+        return self.materialize(self._route_index.get((date_code, source_code, destination_code), ()))
+
+    def get_source_availability(self, source_airport: str, departure_date: str) -> list[FlightAvailability]:
+        source_code = self.airports.lookup(source_airport)
+        date_code = self.dates.lookup(departure_date)
+        if source_code is None or date_code is None:
+            return []
+        return self.materialize(self._source_index.get((source_code, date_code), ()))
+
+    def get_airline_availability(self, airline: str) -> list[FlightAvailability]:
+        airline_code = self.airlines.lookup(airline)
+        if airline_code is None:
+            return []
+        return self.materialize(self._airline_index.get(airline_code, ()))
+
+    def materialize(self, rows) -> list[FlightAvailability]:
+        """
+        Build FlightAvailability models for the given row numbers.
+
+        The values were validated when the rows were added, so the models are
+        constructed without validating them again.
+
+        Args:
+            rows (Iterable[int]): Row numbers to materialize.
+
+        Returns:
+            list[FlightAvailability]: One model per row, in the order given.
+        """
+        ids, dates, airports, countries = self.ids.values, self.dates.values, self.airports.values, self.countries.values
+        airlines, travellers = self.airlines.values, self.travellers.values
+        return [
+            FlightAvailability.model_construct(
+                id=ids[self.id_column[row]],
+                sourceAirport=airports[self.source_column[row]],
+                destinationAirport=airports[self.destination_column[row]],
+                departureDate=dates[self.date_column[row]],
+                sourceAirportCountry=countries[self.source_country_column[row]],
+                destinationAirportCountry=countries[self.destination_country_column[row]],
+                airline=airlines[self.airline_column[row]],
+                travellerId=travellers[self.traveller_column[row]],
+                visaRequired=bool(self.visa_column[row]),
+            )
+            for row in rows
+        ]
+
+    def _check_writable(self):
+        if self.read_only:
+            raise RuntimeError("This flight database was loaded from a snapshot and is read-only")
+
+    def _remove_rows(self, date_code: int, rows) -> int:
+        removed = set(rows)
+        if not removed:
+            return 0
+
+        # Replace the affected index arrays rather than editing them, so concurrent readers are unaffected
+        def without_removed(index: dict, key):
+            remaining = array(self.LARGE_CODE, (row for row in index.get(key, ()) if row not in removed))
+            if remaining:
+                index[key] = remaining
+            else:
+                index.pop(key, None)
+
+        without_removed(self._date_index, date_code)
+        for row in removed:
+            without_removed(self._route_index, (date_code, self.source_column[row], self.destination_column[row]))
+            without_removed(self._source_index, (self.source_column[row], date_code))
+        for airline_code in {self.airline_column[row] for row in removed}:
+            without_removed(self._airline_index, airline_code)
+        return len(removed)
+
+    @staticmethod
+    def _add_to_index(index: dict, key, row: int):
+        rows = index.get(key)
+        if rows is None:
+            rows = index[key] = array(ColumnarFlightDatabase.LARGE_CODE)
+        rows.append(row)
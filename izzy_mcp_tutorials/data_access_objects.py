@@ -1,5 +1,16 @@
-from .models import FlightDatabase, CountryCode, AirportCode, FlightAvailability, PassportOwner
+from .airports import get_airport_registry
+from .models import (FlightDatabase, CountryCode, AirportCode, FlightAvailability, PassportOwner, Itinerary,
+                     FlightSearchQuery, FlightSearchResult, FlightAvailabilityChange, VisaCheckRoute,
+                     PassengerVisaRequirements)
+from .route_graph import RouteGraph
+from .storage import FlightStore, MutableFlightStore
+from .visa import VisaRequirementIndex
 from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterable
+
+# Airlines of the sample schedule, each flying every route once a day
+SAMPLE_AIRLINES = ("Air Canada", "Air Mexico", "Alaska Air", "Delta Airlines", "United Airlines")
 
 class FlightsDataAccessObject:
     """
@@ -11,18 +22,37 @@ class FlightsDataAccessObject:
         availability, searching for flights, and managing passport information.
 
     Attributes:
-        database (FlightDatabase): The in-memory flight database instance.
-        source_airports (list[AirportCode]): List of available source airports.
+        database (FlightStore): The storage backend holding the flight
+            availability records.
+        number_of_days_from_today (int): The length of the availability
+            window, starting from today.
+        source_airports (list[AirportCode]): The airports the sample schedule
+            connects, the served airports of the airport registry.
         passport_numbers (dict[str, PassportOwner]): Mapping of passport IDs to
             their corresponding owner profiles.
     """
-    def __init__(self):
+    def __init__(self, database: FlightStore | None = None,
+                 number_of_days_from_today: int = 8, populate: bool = True):
         """
         Initializes the FlightsDataAccessObject with an empty flight database,
         a list of source airports, and a set of predefined passport owners.
+
+        Args:
+            database (FlightStore | None): The storage backend, e.g. a
+                FlightDatabase, ColumnarFlightDatabase or SqliteFlightDatabase.
+                Defaults to a new in-memory FlightDatabase.
+            number_of_days_from_today (int): How many days of availability to
+                generate, starting from today.
+            populate (bool): Whether to generate the sample availability. Pass
+                False when the database already holds its records.
         """
-        self.database: FlightDatabase = FlightDatabase(records={})
-        self.source_airports: list[AirportCode] = ["MCO", "MIA", "LAX", "ATL", "YYZ", "YVR", "YUL", "CUN", "MEX"]
+        if database is None:
+            database = FlightDatabase(records={})
+        self.database: FlightStore = database
+        self.number_of_days_from_today = number_of_days_from_today
+        self._route_graph: RouteGraph | None = None
+        self._visa_index: VisaRequirementIndex | None = None
+        self.source_airports: list[AirportCode] = list(get_airport_registry().served_airports)
         self.passport_numbers: dict[str, PassportOwner] = {
             "12345": PassportOwner(fullName="Jane Doe", passportId="12345", countryCitizenship="US"),
             "98765": PassportOwner(fullName="Jose Garcia", passportId="98765", countryCitizenship="MX"),
@@ -31,24 +61,60 @@ class FlightsDataAccessObject:
             "43210": PassportOwner(fullName="Samantha Smith", passportId="43210", countryCitizenship="US")
         }
 
-        self.populate_records()
+        if populate:
+            self.populate_records(number_of_days_from_today=number_of_days_from_today)
+
+    @property
+    def performs_io(self) -> bool:
+        """Whether queries block on I/O and should be kept off the event loop."""
+        return getattr(self.database, "performs_io", False)
+
+    @property
+    def is_snapshot(self) -> bool:
+        """Whether the data is a read-only snapshot, which only changes when a new snapshot is written."""
+        return getattr(self.database, "read_only", False)
+
+    @property
+    def supports_updates(self) -> bool:
+        """
+        Whether records can be added and removed in place while queries run.
+
+        Not for a read-only snapshot, nor for an in-memory SQLite database,
+        where writes fail with "table is locked" while readers are active.
+        """
+        return (isinstance(self.database, MutableFlightStore) and not getattr(self.database, "read_only", False)
+                and getattr(self.database, "concurrent_writes", True))
+
+    @classmethod
+    def from_snapshot(cls, path: str | Path) -> "FlightsDataAccessObject":
+        """
+        Create a FlightsDataAccessObject backed by a memory-mapped snapshot.
+
+        Args:
+            path (str | Path): A snapshot written by `write_snapshot`.
+
+        Returns:
+            FlightsDataAccessObject: A data access object over the snapshot.
+        """
+        from .snapshots import load_snapshot
+        return cls(database=load_snapshot(path), populate=False)
 
     def is_international_flight(self, source_airport: AirportCode, destination_airport: AirportCode)-> bool:
 
-        if source_airport not in self.source_airports:
+        airports = get_airport_registry()
+        if source_airport not in airports:
             return False
-        if destination_airport not in self.source_airports:
+        if destination_airport not in airports:
             return False
 
-        source_country = FlightsDataAccessObject.airport_country(source_airport)
-        destination_country = FlightsDataAccessObject.airport_country(destination_airport)
-        
-        return source_country is not destination_country
+        return airports.country(source_airport) != airports.country(destination_airport)
 
     def is_destination_citizen(self, passport_id: str, airport_code: AirportCode) -> bool:
-        destination_country = FlightsDataAccessObject.airport_country(airport_code)
+        """Whether the passport owner is a citizen of the airport's country, False for unknown passports."""
         owner = self.get_passport_owner(passport_id=passport_id)
-        return destination_country == owner.countryCitizenship
+        if owner is None:
+            return False
+        return FlightsDataAccessObject.airport_country(airport_code) == owner.countryCitizenship
 
     def get_passport_ids(self):
         """
@@ -74,6 +140,61 @@ class FlightsDataAccessObject:
             return None
         return self.passport_numbers[passport_id]
 
+    def get_passport_owners(self, passport_ids: list[str]) -> dict[str, PassportOwner | None]:
+        """
+        Retrieve the profiles of several passport owners at once.
+
+        Args:
+            passport_ids (list[str]): The passport IDs to look up.
+
+        Returns:
+            dict[str, PassportOwner | None]: The owner profile for each passport
+            ID, or None for IDs that are not found.
+        """
+        return {passport_id: self.passport_numbers.get(passport_id) for passport_id in passport_ids}
+
+    @property
+    def visa_index(self) -> VisaRequirementIndex:
+        """The citizenship and airport country codes used by bulk visa checks, built on first use."""
+        if self._visa_index is None:
+            self._visa_index = VisaRequirementIndex(self.passport_numbers, get_airport_registry())
+        return self._visa_index
+
+    def check_visa_requirements(self, passport_ids: list[str],
+                                routes: list[VisaCheckRoute]) -> list[PassengerVisaRequirements]:
+        """
+        Determine which routes each passenger of a manifest needs a visa for.
+
+        Every passenger is checked against every route in one pass over the
+        precomputed `visa_index`, following the same rule as the traveller
+        specific values of a flight search.
+
+        Args:
+            passport_ids (list[str]): The passengers' passport IDs.
+            routes (list[VisaCheckRoute]): The routes to check.
+
+        Returns:
+            list[PassengerVisaRequirements]: The requirements of each passenger,
+            in the order given. Unknown passport IDs have no requirements.
+        """
+        index = self.visa_index
+        rows = index.check(passport_ids, [(route.sourceAirport, route.destinationAirport) for route in routes])
+
+        # Passengers with the same citizenship share a row, and so its converted values
+        converted: dict[int, tuple[list[bool], int]] = {}
+        requirements: list[PassengerVisaRequirements] = []
+        for passport_id, row in zip(passport_ids, rows):
+            if row is None:
+                requirements.append(PassengerVisaRequirements(passportId=passport_id))
+                continue
+            if id(row) not in converted:
+                converted[id(row)] = ([flag == 1 for flag in row], row.count(1))
+            visa_required, routes_requiring_visa = converted[id(row)]
+            requirements.append(PassengerVisaRequirements(
+                passportId=passport_id, countryCitizenship=self.passport_numbers[passport_id].countryCitizenship,
+                visaRequired=visa_required, routesRequiringVisa=routes_requiring_visa))
+        return requirements
+
     @staticmethod
     def airport_country(airport: AirportCode):
         """
@@ -84,21 +205,11 @@ class FlightsDataAccessObject:
 
         Returns:
             CountryCode: The corresponding country code for the airport.
-        """
 
-        airport_countries: dict[AirportCode, CountryCode] = {
-            "MCO": "US",  # Orlando International Airport
-            "MIA": "US",  # Miami International Airport
-            "LAX": "US",  # Los Angeles International Airport
-            "ATL": "US",  # Hartsfield–Jackson Atlanta International Airport
-            "YYZ": "CA",  # Toronto Pearson International Airport
-            "YVR": "CA",  # Vancouver International Airport
-            "YUL": "CA",  # Montréal–Trudeau International Airport
-            "CUN": "MX",  # Cancún International Airport
-            "MEX": "MX",  # Mexico City International Airport
-        }
-
-        return airport_countries[airport]
+        Raises:
+            KeyError: If the airport is not in the airport registry.
+        """
+        return get_airport_registry().country(airport)
 
     def search_flights(self, search_date: str, source_airport: AirportCode, destination_airport: AirportCode):
         """
@@ -113,17 +224,95 @@ class FlightsDataAccessObject:
             list[FlightAvailability] | None: A list of matching flight
             availabilities if found, otherwise None.
         """
-        initial_results = self.get_availability(search_date=search_date)
-        if len(initial_results) < 1:
-            return []
+        return list(self.database.get_route_availability(departure_date=search_date,
+                                                         source_airport=source_airport,
+                                                         destination_airport=destination_airport))
 
-        search_results: list[FlightAvailability] = []
-        for flight_item in initial_results:
-            if flight_item.sourceAirport == source_airport and flight_item.destinationAirport == destination_airport:
-                search_results.append(flight_item)
-        if len(search_results) > 0:
-            return search_results
-        return []
+    def search_flights_batch(self, queries: list[FlightSearchQuery]) -> list[FlightSearchResult]:
+        """
+        Answer several flight searches in one pass over the route index.
+
+        A query with an `endDate` covers every available date from its
+        `searchDate` through its `endDate`. Identical route lookups shared by
+        several queries are only performed once.
+
+        Args:
+            queries (list[FlightSearchQuery]): The searches to run.
+
+        Returns:
+            list[FlightSearchResult]: One result per query, in the order given.
+        """
+        available_dates = self.get_available_dates()
+        route_lookups: dict[tuple[str, str, str], list[FlightAvailability]] = {}
+        search_results: list[FlightSearchResult] = []
+
+        for query in queries:
+            if query.endDate is None:
+                search_dates = [query.searchDate]
+            else:
+                search_dates = [d for d in available_dates if query.searchDate <= d <= query.endDate]
+
+            flights: list[FlightAvailability] = []
+            for search_date in search_dates:
+                route_key = (search_date, query.sourceAirport, query.destinationAirport)
+                if route_key not in route_lookups:
+                    route_lookups[route_key] = self.search_flights(*route_key)
+                flights.extend(route_lookups[route_key])
+            search_results.append(FlightSearchResult(query=query, flights=flights))
+
+        return search_results
+
+    @property
+    def route_graph(self) -> RouteGraph:
+        """The route graph of the current records, built on first use."""
+        if self._route_graph is None:
+            self._route_graph = RouteGraph(self.database)
+        return self._route_graph
+
+    def search_connections(self, start_date: str, end_date: str, source_airport: AirportCode,
+                           destination_airport: AirportCode, max_legs: int = 2, max_results: int = 10) -> list[Itinerary]:
+        """
+        Search for direct and connecting itineraries within a date range.
+
+        Args:
+            start_date (str): Earliest departure date in YYYY-MM-DD format.
+            end_date (str): Latest departure date of any leg in YYYY-MM-DD format.
+            source_airport (AirportCode): The departure airport code.
+            destination_airport (AirportCode): The arrival airport code.
+            max_legs (int): The maximum number of flights in an itinerary.
+            max_results (int): The maximum number of itineraries to return.
+
+        Returns:
+            list[Itinerary]: The best itineraries, fewest legs and earliest arrival first.
+        """
+        return self.route_graph.search(start_date=start_date, end_date=end_date, source_airport=source_airport,
+                                       destination_airport=destination_airport, max_legs=max_legs,
+                                       max_results=max_results)
+
+    def get_departures(self, source_airport: AirportCode, search_date: str):
+        """
+        Retrieve all flights leaving an airport on a given date.
+
+        Args:
+            source_airport (AirportCode): The departure airport code.
+            search_date (str): The departure date in YYYY-MM-DD format.
+
+        Returns:
+            list[FlightAvailability]: The flights departing from the airport.
+        """
+        return list(self.database.get_source_availability(source_airport=source_airport, departure_date=search_date))
+
+    def get_airline_flights(self, airline: str):
+        """
+        Retrieve all flights operated by an airline.
+
+        Args:
+            airline (str): The airline name, e.g. "Air Canada".
+
+        Returns:
+            list[FlightAvailability]: The flights operated by the airline.
+        """
+        return list(self.database.get_airline_availability(airline=airline))
 
     def get_availability(self, search_date: str):
         """
@@ -146,53 +335,126 @@ class FlightsDataAccessObject:
         """
         return self.database.get_available_dates()
 
-    def populate_records(self):
+    def roll_window(self, today: date | None = None) -> tuple[list[str], list[str]]:
+        """
+        Move the availability window forward without rebuilding it.
+
+        Days before `today` are evicted together with their index entries, and
+        days missing from the end of the window are generated. Days that are
+        still inside the window are left untouched.
+
+        Args:
+            today (date | None): The first day of the window. Defaults to today.
+
+        Returns:
+            tuple[list[str], list[str]]: The dates that were added and the
+            dates that were evicted, in YYYY-MM-DD format.
+        """
+        today = today or date.today()
+        first_date = today.strftime("%Y-%m-%d")
+        available_dates = set(self.get_available_dates())
+
+        evicted_dates = sorted(d for d in available_dates if d < first_date)
+        for departure_date in evicted_dates:
+            self.database.remove_date(departure_date=departure_date)
+
+        added_dates: list[str] = []
+        for i in range(self.number_of_days_from_today):
+            current_date = (today + timedelta(days=i)).strftime("%Y-%m-%d")
+            if current_date not in available_dates:
+                self.populate_date(current_date=current_date, day_offset=i)
+                added_dates.append(current_date)
+
+        if added_dates or evicted_dates:
+            self._route_graph = None
+        return added_dates, evicted_dates
+
+    def apply_changes(self, changes: Iterable[FlightAvailabilityChange]) -> set[tuple[str, str, str]]:
+        """
+        Apply record level upserts and deletes, e.g. from a change feed.
+
+        A record is identified by its departure date, route and id. An upsert
+        replaces any record with the same identity, or adds it.
+
+        Args:
+            changes (Iterable[FlightAvailabilityChange]): The changes, applied in order.
+
+        Returns:
+            set[tuple[str, str, str]]: The (date, source, destination) routes
+            whose flights changed.
+        """
+        changed_routes: set[tuple[str, str, str]] = set()
+        for change in changes:
+            availability = change.availability
+            route = (availability.departureDate, availability.sourceAirport, availability.destinationAirport)
+            removed = self.database.remove_flight_availability(departure_date=availability.departureDate,
+                                                               source_airport=availability.sourceAirport,
+                                                               destination_airport=availability.destinationAirport,
+                                                               availability_id=availability.id)
+            if change.action == "upsert":
+                self.database.add_flight_availability(departure_date=availability.departureDate,
+                                                      availability=availability)
+                changed_routes.add(route)
+            elif removed:
+                changed_routes.add(route)
+
+        if changed_routes:
+            self._route_graph = None
+        return changed_routes
+
+    def populate_records(self, number_of_days_from_today: int = 8):
         """
         Populate the flight database with sample flight availabilities.
 
-        Generates flight availability records for today and the next three days,
+        Generates flight availability records for today and the following days,
         covering all combinations of source and destination airports.
 
+        Args:
+            number_of_days_from_today (int): How many days of availability to
+                generate, starting from today.
+
         Returns:
             FlightDatabase: The updated flight database with populated records.
         """
         # Start from today
         today = date.today()
 
-        availability_id:int = 1000
-        number_of_days_from_today = 8
-
         # Loop through today and the next {number_of_days_from_today} days
         for i in range(number_of_days_from_today):
             next_date = today + timedelta(days=i)
-            current_date = next_date.strftime("%Y-%m-%d")
-
-            # Loop through all source and destination combinations
-            for source in self.source_airports:
-                for destination in self.source_airports:
-                    if source != destination:  # avoid source == destination
-                        source_country:CountryCode = FlightsDataAccessObject.airport_country(source)
-                        destination_country:CountryCode = FlightsDataAccessObject.airport_country(destination)
-                        visa_required:bool = source_country is not destination_country
-
-                        record_id_1 = str(availability_id)
-                        record_id_2 = str(availability_id + 1)
-                        record_id_3 = str(availability_id + 2)
-                        record_id_4 = str(availability_id + 3)
-                        record_id_5 = str(availability_id + 4)
-                        
-                        availability_1 = FlightAvailability(id=record_id_1, sourceAirport=source, destinationAirport=destination, departureDate=current_date, sourceAirportCountry=source_country, destinationAirportCountry=destination_country, airline="Air Canada", visaRequired=visa_required)
-                        availability_2 = FlightAvailability(id=record_id_2, sourceAirport=source, destinationAirport=destination, departureDate=current_date, sourceAirportCountry=source_country, destinationAirportCountry=destination_country, airline="Air Mexico", visaRequired=visa_required)
-                        availability_3 = FlightAvailability(id=record_id_3, sourceAirport=source, destinationAirport=destination, departureDate=current_date, sourceAirportCountry=source_country, destinationAirportCountry=destination_country, airline="Alaska Air", visaRequired=visa_required)
-                        availability_4 = FlightAvailability(id=record_id_4, sourceAirport=source, destinationAirport=destination, departureDate=current_date, sourceAirportCountry=source_country, destinationAirportCountry=destination_country, airline="Delta Airlines", visaRequired=visa_required)
-                        availability_5 = FlightAvailability(id=record_id_5, sourceAirport=source, destinationAirport=destination, departureDate=current_date, sourceAirportCountry=source_country, destinationAirportCountry=destination_country, airline="United Airlines", visaRequired=visa_required)
-                        
-                        self.database.add_flight_availability(departure_date=current_date, availability=availability_1)
-                        self.database.add_flight_availability(departure_date=current_date, availability=availability_2)
-                        self.database.add_flight_availability(departure_date=current_date, availability=availability_3)
-                        self.database.add_flight_availability(departure_date=current_date, availability=availability_4)
-                        self.database.add_flight_availability(departure_date=current_date, availability=availability_5)
-
-                availability_id = availability_id + 100
-
-        return self.database
\ No newline at end of file
+            self.populate_date(current_date=next_date.strftime("%Y-%m-%d"), day_offset=i)
+
+        return self.database
+
+    def populate_date(self, current_date: str, day_offset: int):
+        """
+        Generate the sample flight availabilities of a single day.
+
+        The day is written with a single `add_flight_availabilities` call, so
+        a store that fails part way through does not keep half a day.
+
+        Args:
+            current_date (str): The departure date in YYYY-MM-DD format.
+            day_offset (int): How many days after the start of the window the
+                date is; it determines the availability ids.
+        """
+        availability_id:int = 1000 + day_offset * len(self.source_airports) * 100
+
+        airports = get_airport_registry()
+        availabilities: list[FlightAvailability] = []
+
+        # Loop through all source and destination combinations
+        for source in self.source_airports:
+            for destination in self.source_airports:
+                if source != destination:  # avoid source == destination
+                    source_country:CountryCode = airports.country(source)
+                    destination_country:CountryCode = airports.country(destination)
+                    visa_required:bool = source_country != destination_country
+
+                    for offset, airline in enumerate(SAMPLE_AIRLINES):
+                        availabilities.append(FlightAvailability(id=str(availability_id + offset), sourceAirport=source, destinationAirport=destination, departureDate=current_date, sourceAirportCountry=source_country, destinationAirportCountry=destination_country, airline=airline, visaRequired=visa_required))
+
+            availability_id = availability_id + 100
+
+        # One batch per day, a single transaction for stores that support them
+        self.database.add_flight_availabilities(departure_date=current_date, availabilities=availabilities)
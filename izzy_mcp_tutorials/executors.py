@@ -0,0 +1,289 @@
+import asyncio
+import functools
+import threading
+import time
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable
+
+from pydantic import BaseModel, Field
+
+EXECUTOR_KINDS = ("inline", "thread", "process")
+
+# The data access object of a process pool worker, created by initialize_worker
+_worker_dao = None
+
+
+def initialize_worker(dao_factory: Callable[[], Any]):
+    """Build the data access object used by calls in this worker process."""
+    global _worker_dao
+    _worker_dao = dao_factory()
+
+
+def call_worker_dao(method_name: str, *args: Any, **kwargs: Any) -> Any:
+    """Call a method of this worker process's data access object."""
+    return getattr(_worker_dao, method_name)(*args, **kwargs)
+
+
+class ExecutorOverloadedError(RuntimeError):
+    """Raised when the executor queue is full and a call is rejected."""
+
+
+class ExecutorStats(BaseModel):
+    kind: str = Field(..., description="Where calls run: inline, thread or process")
+    maxWorkers: int = Field(..., description="Maximum number of calls running at once")
+    maxQueueDepth: int = Field(..., description="Maximum number of calls waiting for a worker")
+    running: int = Field(default=0, description="Calls currently running")
+    queueDepth: int = Field(default=0, description="Calls currently waiting for a worker")
+    completed: int = Field(default=0, description="Calls that ran to completion or raised")
+    rejected: int = Field(default=0, description="Calls refused because the queue was full")
+    timedOut: int = Field(default=0, description="Calls that exceeded the timeout")
+    totalWaitSeconds: float = Field(default=0.0, description="Sum of the time calls spent waiting for a worker")
+    maxWaitSeconds: float = Field(default=0.0, description="Longest time a call waited for a worker")
+
+
+class DaoExecutor:
+    """
+        Bounded executor for CPU-bound or blocking data access work.
+
+        Calls run in a thread pool, a process pool or inline on the event loop.
+        At most `max_workers` calls run at once and at most `max_queue_depth`
+        more wait for a slot; further calls are rejected with
+        ExecutorOverloadedError, so overload turns into fast errors instead of
+        an ever-growing backlog. Each call is bounded by `timeout` seconds,
+        including its time in the queue. A call that times out keeps its
+        worker slot until the work it started actually finishes, so slow
+        calls cannot pile up behind the pool.
+
+        With a process pool every worker builds its own data access object
+        with `dao_factory` (cheap when it maps a snapshot), so `call` only
+        sends the method name and arguments across the process boundary.
+        Workers cannot see changes made to the data in this process, so when
+        `generation` reports a new generation, `call` first asks `export_dao`
+        for a factory of the current data and replaces the pool with workers
+        built from it. Calls already sent to the old pool still finish there.
+
+    Attributes:
+        kind (str): One of "inline", "thread" or "process".
+        max_workers (int): Maximum number of calls running at once.
+        max_queue_depth (int): Maximum number of calls waiting for a worker.
+        timeout (float | None): Seconds before a call fails with TimeoutError.
+        dao_factory (Callable[[], Any] | None): Builds the data access object
+            of each process pool worker.
+        generation (Callable[[], int] | None): The current generation of the
+            data, checked before every process pool call.
+        export_dao (Callable[[], Callable[[], Any]] | None): Called in this
+            process when the generation changes. Returns the picklable
+            `dao_factory` of the replacement workers, e.g. one that maps a
+            snapshot of the current data.
+    """
+    def __init__(self, kind: str = "thread", max_workers: int = 4, max_queue_depth: int = 64,
+                 timeout: float | None = 30.0, dao_factory: Callable[[], Any] | None = None,
+                 generation: Callable[[], int] | None = None,
+                 export_dao: Callable[[], Callable[[], Any]] | None = None):
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown executor kind {kind!r}, expected one of {', '.join(EXECUTOR_KINDS)}")
+        if kind == "process" and dao_factory is None:
+            raise ValueError("A process executor needs a dao_factory to build the data access object of each worker")
+
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self.timeout = timeout
+        self.dao_factory = dao_factory
+        self.generation = generation
+        self.export_dao = export_dao
+
+        self._executor: Executor | None = None
+        self._slots: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = weakref.WeakKeyDictionary()
+        self._stats = ExecutorStats(kind=kind, maxWorkers=max_workers, maxQueueDepth=max_queue_depth)
+        self._lock = threading.Lock()
+        # Serializes worker restarts, which export the data and can take a while
+        self._restart_lock = threading.Lock()
+        self._worker_generation: int | None = None
+
+    def start(self):
+        """Create the worker pool. Called automatically by the first `run`."""
+        if self.kind == "process" and self.generation is not None:
+            if self._executor is None:
+                self.restart_workers(self.generation())
+            return
+        with self._lock:
+            if self._executor is not None or self.kind == "inline":
+                return
+            if self.kind == "thread":
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="flights-dao")
+            else:
+                self._executor = self._process_pool(self.dao_factory)
+
+    def restart_workers(self, generation: int | None = None):
+        """
+        Replace the process pool with workers built from the current data.
+
+        Blocks while `export_dao` runs. Calls already running or queued in the
+        old pool finish there, its workers exit once they are done.
+
+        Args:
+            generation (int | None): The generation the new workers serve.
+                Read before exporting, so changes made during the export start
+                another restart. Nothing is done if the workers already serve
+                this generation or a later one.
+        """
+        with self._restart_lock:
+            if generation is not None and self._worker_generation is not None \
+                    and generation <= self._worker_generation:
+                return
+            dao_factory = self.export_dao() if self.export_dao is not None else self.dao_factory
+            pool = self._process_pool(dao_factory)
+            with self._lock:
+                previous, self._executor = self._executor, pool
+                self.dao_factory = dao_factory
+                self._worker_generation = generation
+        if previous is not None:
+            previous.shutdown(wait=False)
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker pool, optionally waiting for running calls."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    async def call(self, dao: Any, method_name: str, *args: Any, **kwargs: Any) -> Any:
+        """
+        Call a data access object method on the executor.
+
+        Args:
+            dao (Any): The data access object, used by inline and thread executors.
+            method_name (str): The method to call.
+            *args (Any): Positional arguments for the method.
+            **kwargs (Any): Keyword arguments for the method.
+
+        Returns:
+            Any: The method's return value.
+        """
+        if self.kind == "process":
+            if self.generation is not None:
+                generation = self.generation()
+                if generation != self._worker_generation:
+                    await asyncio.to_thread(self.restart_workers, generation)
+            return await self.run(call_worker_dao, method_name, *args, **kwargs)
+        if self.kind == "inline" and getattr(dao, "performs_io", False):
+            # Even inline, blocking I/O must not run on the event loop
+            return await asyncio.to_thread(getattr(dao, method_name), *args, **kwargs)
+        return await self.run(getattr(dao, method_name), *args, **kwargs)
+
+    async def run(self, function: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a function on the executor and wait for its result.
+
+        Args:
+            function (Callable[..., Any]): The function to call. It must be
+                picklable when the executor uses processes.
+            *args (Any): Positional arguments for the function.
+            **kwargs (Any): Keyword arguments for the function.
+
+        Returns:
+            Any: The function's return value.
+
+        Raises:
+            ExecutorOverloadedError: If the queue is already full.
+            TimeoutError: If the call does not finish within `timeout` seconds.
+        """
+        if self.kind == "inline":
+            return function(*args, **kwargs)
+
+        with self._lock:
+            if self._stats.queueDepth >= self.max_queue_depth:
+                self._stats.rejected += 1
+                raise ExecutorOverloadedError(f"DAO executor queue is full ({self.max_queue_depth} calls waiting)")
+            self._stats.queueDepth += 1
+
+        self.start()
+        loop = asyncio.get_running_loop()
+        slots = self._slots_for(loop)
+        queued_at = time.perf_counter()
+        started = False
+        try:
+            async with asyncio.timeout(self.timeout):
+                await slots.acquire()
+                self._record_start(time.perf_counter() - queued_at)
+                started = True
+                try:
+                    future = self._executor.submit(functools.partial(function, *args, **kwargs))
+                except BaseException:
+                    self._record_finish(loop, slots)
+                    raise
+                # A timeout stops the wait, not the work: the slot is only freed once the worker is done
+                future.add_done_callback(lambda _: self._record_finish(loop, slots))
+                return await asyncio.wrap_future(future, loop=loop)
+        except TimeoutError:
+            with self._lock:
+                self._stats.timedOut += 1
+            raise
+        finally:
+            if not started:
+                with self._lock:
+                    self._stats.queueDepth -= 1
+
+    def stats(self) -> ExecutorStats:
+        """
+        Snapshot the executor counters.
+
+        Returns:
+            ExecutorStats: Queue depth, running calls, rejections, timeouts and wait times.
+        """
+        with self._lock:
+            return self._stats.model_copy()
+
+    def prometheus_text(self, prefix: str = "flights_mcp") -> str:
+        """
+        Render the executor counters in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): Prefix of every metric name.
+
+        Returns:
+            str: The metrics, one sample per line.
+        """
+        stats = self.stats()
+        samples = (("running", "gauge", stats.running), ("queue_depth", "gauge", stats.queueDepth),
+                   ("completed_total", "counter", stats.completed), ("rejected_total", "counter", stats.rejected),
+                   ("timed_out_total", "counter", stats.timedOut),
+                   ("wait_seconds_total", "counter", stats.totalWaitSeconds),
+                   ("wait_seconds_max", "gauge", stats.maxWaitSeconds))
+        lines: list[str] = []
+        for name, metric_type, value in samples:
+            lines.append(f"# TYPE {prefix}_executor_{name} {metric_type}")
+            lines.append(f'{prefix}_executor_{name}{{kind="{stats.kind}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def _process_pool(self, dao_factory: Callable[[], Any]) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.max_workers, initializer=initialize_worker,
+                                   initargs=(dao_factory,))
+
+    def _slots_for(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        # Semaphores belong to one event loop; the server runs a single loop
+        with self._lock:
+            slots = self._slots.get(loop)
+            if slots is None:
+                slots = self._slots[loop] = asyncio.Semaphore(self.max_workers)
+            return slots
+
+    def _record_start(self, wait_seconds: float):
+        with self._lock:
+            self._stats.queueDepth -= 1
+            self._stats.running += 1
+            self._stats.totalWaitSeconds += wait_seconds
+            self._stats.maxWaitSeconds = max(self._stats.maxWaitSeconds, wait_seconds)
+
+    def _record_finish(self, loop: asyncio.AbstractEventLoop, slots: asyncio.Semaphore):
+        # Runs in the worker's completion callback, usually outside the event loop thread
+        with self._lock:
+            self._stats.running -= 1
+            self._stats.completed += 1
+        try:
+            loop.call_soon_threadsafe(slots.release)
+        except RuntimeError:
+            # The event loop is closed, and its semaphore with it
+            pass
@@ -0,0 +1,84 @@
+import dataclasses
+
+from pydantic_ai.messages import (ModelMessage, ModelMessagesTypeAdapter, ModelRequest, ToolReturnPart,
+                                  UserPromptPart)
+
+# Rough size of a token, used to estimate history size without a tokenizer
+CHARACTERS_PER_TOKEN = 4
+
+
+def split_turns(messages: list[ModelMessage]) -> list[list[ModelMessage]]:
+    """
+    Split a message history into turns, each starting with a user prompt.
+
+    Tool calls and their results always stay in the same turn, so whole turns
+    can be dropped without leaving an unanswered tool call behind.
+
+    Args:
+        messages (list[ModelMessage]): The message history.
+
+    Returns:
+        list[list[ModelMessage]]: The messages of each turn, oldest first.
+    """
+    turns: list[list[ModelMessage]] = []
+    for message in messages:
+        starts_turn = isinstance(message, ModelRequest) and any(isinstance(part, UserPromptPart) for part in message.parts)
+        if starts_turn or not turns:
+            turns.append([])
+        turns[-1].append(message)
+    return turns
+
+
+def estimate_tokens(messages: list[ModelMessage]) -> int:
+    """Estimate how many tokens the messages take up when sent to the model."""
+    return len(ModelMessagesTypeAdapter.dump_json(messages)) // CHARACTERS_PER_TOKEN
+
+
+class HistoryCompactor:
+    """
+        History processor that keeps the conversation sent to the model bounded.
+
+        Tool results older than the most recent `keep_tool_results_turns` turns
+        are replaced with a short placeholder, since the model has already
+        answered from them. Then the oldest turns are dropped until the
+        estimated size fits `max_tokens`. The current turn is always kept.
+
+        Pass an instance in an Agent's `history_processors`. The compacted
+        history replaces the run's history, so `all_messages()` stays bounded
+        as well.
+
+    Attributes:
+        max_tokens (int | None): Estimated token budget of the history, or
+            None for no limit.
+        keep_tool_results_turns (int | None): Number of recent turns whose tool
+            results are kept in full, or None to keep every tool result.
+    """
+    def __init__(self, max_tokens: int | None = 8000, keep_tool_results_turns: int | None = 2):
+        self.max_tokens = max_tokens
+        self.keep_tool_results_turns = keep_tool_results_turns
+
+    async def __call__(self, messages: list[ModelMessage]) -> list[ModelMessage]:
+        turns = split_turns(messages)
+
+        if self.keep_tool_results_turns is not None:
+            older_turns = max(len(turns) - self.keep_tool_results_turns, 0)
+            turns[:older_turns] = [[self._without_tool_results(message) for message in turn]
+                                   for turn in turns[:older_turns]]
+
+        if self.max_tokens is not None:
+            sizes = [estimate_tokens(turn) for turn in turns]
+            total = sum(sizes)
+            while len(turns) > 1 and total > self.max_tokens:
+                total -= sizes.pop(0)
+                turns.pop(0)
+
+        return [message for turn in turns for message in turn]
+
+    @staticmethod
+    def _without_tool_results(message: ModelMessage) -> ModelMessage:
+        if not isinstance(message, ModelRequest) or not any(isinstance(part, ToolReturnPart) for part in message.parts):
+            return message
+        parts = [dataclasses.replace(part, content=f"[Result of {part.tool_name} omitted from the history]")
+                 if isinstance(part, ToolReturnPart) else part
+                 for part in message.parts]
+        return dataclasses.replace(message, parts=parts)
@@ -0,0 +1,182 @@
+import asyncio
+import logging
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from pydantic import BaseModel, Field
+
+from .data_access_objects import FlightsDataAccessObject
+from .models import FlightAvailabilityChange
+from .shared_database import SharedFlightsDatabase
+
+logger = logging.getLogger(__name__)
+
+
+class MaintenanceReport(BaseModel):
+    generation: int = Field(..., description="Database generation after the changes were applied")
+    fullRebuild: bool = Field(default=False, description="Whether the data was rebuilt instead of updated in place")
+    addedDates: list[str] = Field(default_factory=list, description="Dates added at the end of the availability window")
+    evictedDates: list[str] = Field(default_factory=list, description="Past dates evicted from the availability window")
+    changedRoutes: list[tuple[str, str, str]] = Field(default_factory=list, description="(date, source, destination) routes changed by the feed")
+    upserts: int = Field(default=0, description="Feed records added or replaced")
+    deletes: int = Field(default=0, description="Feed records deleted")
+
+
+class JsonLinesChangeFeed:
+    """
+        Change feed read from a file of FlightAvailabilityChange JSON lines.
+
+        Producers append one change per line. `read` returns the complete
+        lines appended since the last `commit`; a partially written last line
+        is left for a later read. Lines that are not valid changes are logged
+        and skipped one at a time. Call `commit` once the changes are applied,
+        so a failed pass reads them again.
+
+    Attributes:
+        path (Path): The feed file. A missing file is treated as empty.
+        rejected (int): Number of invalid lines skipped so far.
+    """
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.rejected = 0
+        self._offset = 0
+        self._read_offset = 0
+
+    def read(self) -> list[FlightAvailabilityChange]:
+        """
+        Read the changes appended since the last commit.
+
+        Returns:
+            list[FlightAvailabilityChange]: The new changes, in feed order.
+        """
+        try:
+            with self.path.open("rb") as feed:
+                feed.seek(self._offset)
+                data = feed.read()
+        except FileNotFoundError:
+            return []
+
+        complete = data[:data.rfind(b"\n") + 1]
+        self._read_offset = self._offset + len(complete)
+        changes: list[FlightAvailabilityChange] = []
+        for line in complete.splitlines():
+            if not line.strip():
+                continue
+            try:
+                changes.append(FlightAvailabilityChange.model_validate_json(line))
+            except ValueError:
+                logger.warning("Skipping invalid change feed line %r", line[:200])
+                self.rejected += 1
+        return changes
+
+    def commit(self):
+        """Mark the changes returned by the last `read` as applied."""
+        self._offset = self._read_offset
+
+
+class FlightDataMaintainer:
+    """
+        Keeps the shared flight data current without rebuilding it.
+
+        Each pass rolls the availability window forward to today and applies
+        the changes read from the feed, in place and in a single generation, so
+        the response cache is invalidated once per pass that changed anything.
+        Stores that cannot be changed in place, such as an in-memory SQLite
+        database, are rebuilt once stale instead. Snapshots are left alone:
+        they stay frozen until a new snapshot is written and the data is
+        reloaded, see `reload`.
+
+        A process executor replaces its workers once it sees the new
+        generation, see `DaoExecutor`.
+
+    Attributes:
+        shared_database (SharedFlightsDatabase): The data to maintain.
+        interval (float): Seconds between maintenance passes.
+        feed (JsonLinesChangeFeed | None): Source of record level changes.
+        on_change (Callable[[MaintenanceReport], Awaitable[None]] | None):
+            Called after every pass that changed the data, e.g. to notify clients.
+    """
+    def __init__(self, shared_database: SharedFlightsDatabase, interval: float = 300.0,
+                 feed: JsonLinesChangeFeed | None = None,
+                 on_change: Callable[[MaintenanceReport], Awaitable[None]] | None = None):
+        self.shared_database = shared_database
+        self.interval = interval
+        self.feed = feed
+        self.on_change = on_change
+        self._task: asyncio.Task | None = None
+
+    def maintain(self) -> MaintenanceReport | None:
+        """
+        Run one maintenance pass. Blocks while changes are applied.
+
+        Returns:
+            MaintenanceReport | None: What changed, or None if nothing did.
+        """
+        dao = self.shared_database.get()
+        if dao.is_snapshot:
+            # Reloading would map the same file again; snapshots only change when a new one is written
+            return None
+        if not dao.supports_updates:
+            # The feed is left unread, it cannot be applied to this store
+            if not self.shared_database.is_stale():
+                return None
+            self.shared_database.refresh()
+            return MaintenanceReport(generation=self.shared_database.generation, fullRebuild=True)
+
+        def apply(dao: FlightsDataAccessObject) -> dict | None:
+            added_dates, evicted_dates = dao.roll_window()
+            changed_routes = dao.apply_changes(changes)
+            if not (added_dates or evicted_dates or changed_routes):
+                return None
+            return {"addedDates": added_dates, "evictedDates": evicted_dates, "changedRoutes": sorted(changed_routes),
+                    "upserts": sum(1 for change in changes if change.action == "upsert"),
+                    "deletes": sum(1 for change in changes if change.action == "delete")}
+
+        changes = self.feed.read() if self.feed is not None else []
+        changed = self.shared_database.update(apply)
+        # Only after the changes are applied, so a failed pass reads them again
+        if self.feed is not None:
+            self.feed.commit()
+        if changed is None:
+            return None
+        return MaintenanceReport(generation=self.shared_database.generation, **changed)
+
+    async def reload(self) -> MaintenanceReport:
+        """
+        Rebuild the shared data now, e.g. after a new snapshot was written.
+
+        Returns:
+            MaintenanceReport: A full rebuild report, also passed to `on_change`.
+        """
+        await asyncio.to_thread(self.shared_database.refresh)
+        report = MaintenanceReport(generation=self.shared_database.generation, fullRebuild=True)
+        if self.on_change is not None:
+            await self.on_change(report)
+        return report
+
+    async def run(self):
+        """Run maintenance passes every `interval` seconds until cancelled."""
+        while True:
+            try:
+                report = await asyncio.to_thread(self.maintain)
+                if report is not None and self.on_change is not None:
+                    await self.on_change(report)
+            except Exception:
+                logger.exception("Flight data maintenance failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> asyncio.Task:
+        """Start running maintenance passes in the background of the current event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run(), name="flight-data-maintenance")
+        return self._task
+
+    async def stop(self):
+        """Stop the background maintenance passes."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
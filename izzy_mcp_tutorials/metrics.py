@@ -0,0 +1,183 @@
+import functools
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable
+
+from pydantic import BaseModel, Field
+
+# Upper bounds, in seconds, of the latency histogram buckets
+DEFAULT_BUCKETS: tuple[float, ...] = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_DISABLED_TIMER = nullcontext()
+
+
+class LatencySummary(BaseModel):
+    calls: int = Field(default=0, description="Number of calls, including failed ones")
+    errors: int = Field(default=0, description="Number of calls that raised an exception")
+    totalSeconds: float = Field(default=0.0, description="Sum of all call durations in seconds")
+    buckets: dict[str, int] = Field(default_factory=dict, description="Cumulative call counts keyed by bucket upper bound in seconds")
+
+
+class ServerMetrics(BaseModel):
+    enabled: bool = Field(..., description="Whether instrumentation is collecting data")
+    handlers: dict[str, LatencySummary] = Field(default_factory=dict, description="Latency of MCP tool and resource handlers")
+    operations: dict[str, LatencySummary] = Field(default_factory=dict, description="Latency of operations inside handlers")
+
+
+class LatencyHistogram:
+    """
+        Call count, error count and latency histogram for one handler or operation.
+
+    Attributes:
+        buckets (tuple[float, ...]): Upper bounds of the buckets in seconds.
+    """
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts: list[int] = [0] * (len(buckets) + 1)
+        self.calls: int = 0
+        self.errors: int = 0
+        self.total_seconds: float = 0.0
+
+    def observe(self, seconds: float, failed: bool = False):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.calls += 1
+        self.total_seconds += seconds
+        if failed:
+            self.errors += 1
+
+    def cumulative_counts(self) -> list[tuple[str, int]]:
+        cumulative: list[tuple[str, int]] = []
+        running = 0
+        for upper_bound, count in zip([*map(str, self.buckets), "+Inf"], self.counts):
+            running += count
+            cumulative.append((upper_bound, running))
+        return cumulative
+
+    def summary(self) -> LatencySummary:
+        return LatencySummary(calls=self.calls, errors=self.errors, totalSeconds=self.total_seconds,
+                              buckets=dict(self.cumulative_counts()))
+
+
+class MetricsRegistry:
+    """
+        Opt-in timing instrumentation for the MCP server.
+
+        Handlers are wrapped with `instrument` and operations inside them are
+        timed with `timer`. When the registry is disabled `instrument` returns
+        the handler unchanged and `timer` returns a shared no-op context
+        manager, so instrumentation costs next to nothing.
+
+    Attributes:
+        enabled (bool): Whether measurements are recorded.
+    """
+    def __init__(self, enabled: bool = False, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = buckets
+        self._handlers: dict[str, LatencyHistogram] = {}
+        self._operations: dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def instrument(self, kind: str, name: str | None = None) -> Callable:
+        """
+        Decorator recording calls, errors and latency of an async handler.
+
+        Args:
+            kind (str): The kind of handler, e.g. "tool" or "resource".
+            name (str | None): The handler name. Defaults to the function name.
+
+        Returns:
+            Callable: A decorator returning the wrapped handler, or the handler
+            itself when the registry is disabled.
+        """
+        def decorator(fn: Callable) -> Callable:
+            if not self.enabled:
+                return fn
+
+            handler_name = f"{kind}:{name or fn.__name__}"
+
+            @functools.wraps(fn)
+            async def wrapper(*args: Any, **kwargs: Any):
+                started = time.perf_counter()
+                failed = True
+                try:
+                    result = await fn(*args, **kwargs)
+                    failed = False
+                    return result
+                finally:
+                    self._observe(self._handlers, handler_name, time.perf_counter() - started, failed)
+
+            return wrapper
+
+        return decorator
+
+    def timer(self, operation: str):
+        """
+        Context manager timing an operation inside a handler.
+
+        Args:
+            operation (str): The operation name, e.g. "dao.search_flights".
+
+        Returns:
+            ContextManager: Records the duration of the block when enabled.
+        """
+        if not self.enabled:
+            return _DISABLED_TIMER
+        return self._timed(operation)
+
+    @contextmanager
+    def _timed(self, operation: str):
+        started = time.perf_counter()
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            self._observe(self._operations, operation, time.perf_counter() - started, failed)
+
+    def _observe(self, series: dict[str, LatencyHistogram], name: str, seconds: float, failed: bool):
+        with self._lock:
+            histogram = series.get(name)
+            if histogram is None:
+                histogram = series[name] = LatencyHistogram(self.buckets)
+            histogram.observe(seconds, failed)
+
+    def snapshot(self) -> ServerMetrics:
+        """
+        Capture the current measurements.
+
+        Returns:
+            ServerMetrics: Handler and operation latency summaries.
+        """
+        with self._lock:
+            return ServerMetrics(enabled=self.enabled,
+                                 handlers={name: histogram.summary() for name, histogram in self._handlers.items()},
+                                 operations={name: histogram.summary() for name, histogram in self._operations.items()})
+
+    def prometheus_text(self, prefix: str = "flights_mcp") -> str:
+        """
+        Render the current measurements in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): Prefix of every metric name.
+
+        Returns:
+            str: The metrics, one sample per line.
+        """
+        lines: list[str] = []
+        with self._lock:
+            for family, label, series in (("handler", "handler", self._handlers),
+                                          ("operation", "operation", self._operations)):
+                metric = f"{prefix}_{family}"
+                lines.append(f"# TYPE {metric}_calls_total counter")
+                lines.extend(f'{metric}_calls_total{{{label}="{name}"}} {h.calls}' for name, h in series.items())
+                lines.append(f"# TYPE {metric}_errors_total counter")
+                lines.extend(f'{metric}_errors_total{{{label}="{name}"}} {h.errors}' for name, h in series.items())
+                lines.append(f"# TYPE {metric}_duration_seconds histogram")
+                for name, histogram in series.items():
+                    for upper_bound, count in histogram.cumulative_counts():
+                        lines.append(f'{metric}_duration_seconds_bucket{{{label}="{name}",le="{upper_bound}"}} {count}')
+                    lines.append(f'{metric}_duration_seconds_sum{{{label}="{name}"}} {histogram.total_seconds}')
+                    lines.append(f'{metric}_duration_seconds_count{{{label}="{name}"}} {histogram.calls}')
+        return "\n".join(lines) + "\n"
@@ -1,10 +1,13 @@
-from typing import Literal
+from typing import Annotated, Any, Literal
 
-from pydantic import Field, BaseModel
+from pydantic import Field, BaseModel, PrivateAttr, ConfigDict, AfterValidator
 
-CountryCode = Literal['US', 'MX', 'CA']
+from .airports import validate_airport_code, validate_country_code
 
-AirportCode = Literal["MCO", "MIA", "LAX", "ATL", "YYZ", "YVR", "YUL", "CUN", "MEX"]
+# Validated against the airport registry; the pattern keeps the JSON schema small at any registry size
+CountryCode = Annotated[str, Field(pattern=r"^[A-Z]{2}$"), AfterValidator(validate_country_code)]
+
+AirportCode = Annotated[str, Field(pattern=r"^[A-Z]{3}$"), AfterValidator(validate_airport_code)]
 
 
 class PassportOwner(BaseModel):
@@ -13,30 +16,172 @@ class PassportOwner(BaseModel):
     countryCitizenship: CountryCode = Field(..., description="Country of Citizenship")
 
 class FlightAvailability(BaseModel):
+    # Records are shared across requests, so they are never modified in place
+    model_config = ConfigDict(frozen=True)
+
     id: str = Field(..., description="A unique identifier for the availability")
     sourceAirport: AirportCode = Field(..., description="Departure IATA airport code")
     destinationAirport: AirportCode = Field(..., description="Destination IATA airport code")
     departureDate: str = Field(..., description="Departure date in YYYY-MM-DD format")
     sourceAirportCountry: CountryCode = Field(..., description="The IATA country code of the departure airport")
     destinationAirportCountry: CountryCode = Field(..., description="The IATA country code of the arrival airport")
+    airline: str = Field(default="", description="The airline operating the flight")
     travellerId: str = Field(default="", description="The traveller identifier (Passport ID)")
     visaRequired: bool = Field(default=False, description="Whether or not the traveler needs a travel visa")
 
+FlightField = Literal["id", "sourceAirport", "destinationAirport", "departureDate", "sourceAirportCountry",
+                      "destinationAirportCountry", "airline", "travellerId", "visaRequired"]
+
+class FlightSearchPage(BaseModel):
+    flights: list[dict[str, Any]] = Field(..., description="The flight availabilities of this page, with only the requested fields")
+    totalCount: int = Field(..., description="How many flights match the search across all pages")
+    nextCursor: str | None = Field(default=None, description="Pass as cursor to fetch the next page, null on the last page")
+
+class FlightAvailabilityChange(BaseModel):
+    action: Literal["upsert", "delete"] = Field(..., description="Whether the availability is added or replaced, or removed")
+    availability: FlightAvailability = Field(..., description="The availability, identified by its departure date, route and id")
+
+class FlightSearchQuery(BaseModel):
+    searchDate: str = Field(..., description="The departure date in YYYY-MM-DD format")
+    endDate: str | None = Field(default=None, description="Optional last departure date in YYYY-MM-DD format, to search every date from searchDate to endDate")
+    sourceAirport: AirportCode = Field(..., description="Departure IATA airport code")
+    destinationAirport: AirportCode = Field(..., description="Destination IATA airport code")
+
+class FlightSearchResult(BaseModel):
+    query: FlightSearchQuery = Field(..., description="The query these flights answer")
+    flights: list[FlightAvailability] = Field(..., description="The matching flight availabilities")
+
+class VisaCheckRoute(BaseModel):
+    sourceAirport: AirportCode = Field(..., description="Departure IATA airport code")
+    destinationAirport: AirportCode = Field(..., description="Destination IATA airport code")
+
+class PassengerVisaRequirements(BaseModel):
+    passportId: str = Field(..., description="Passport identifier")
+    countryCitizenship: CountryCode | None = Field(default=None, description="Country of Citizenship, null when the passport id is unknown")
+    visaRequired: list[bool] | None = Field(default=None, description="Whether the passenger needs a travel visa for each route, in the order given, null when the passport id is unknown")
+    routesRequiringVisa: int = Field(default=0, description="How many of the routes the passenger needs a travel visa for")
+
+class ItineraryLeg(BaseModel):
+    sourceAirport: AirportCode = Field(..., description="Departure IATA airport code of the leg")
+    destinationAirport: AirportCode = Field(..., description="Arrival IATA airport code of the leg")
+    departureDate: str = Field(..., description="Departure date of the leg in YYYY-MM-DD format")
+    flights: list[FlightAvailability] = Field(..., description="The flights available for the leg")
+
+class Itinerary(BaseModel):
+    legs: list[ItineraryLeg] = Field(..., description="The legs of the itinerary, in travel order")
+    numberOfLegs: int = Field(..., description="How many flights the itinerary takes")
+    departureDate: str = Field(..., description="Departure date of the first leg in YYYY-MM-DD format")
+    arrivalDate: str = Field(..., description="Departure date of the last leg in YYYY-MM-DD format")
+
+class TravellerOverlay(BaseModel):
+    """Traveller specific values layered over shared FlightAvailability records"""
+    model_config = ConfigDict(frozen=True)
+
+    travellerId: str = Field(..., description="The traveller identifier (Passport ID)")
+    visaRequired: bool = Field(..., description="Whether or not the traveler needs a travel visa")
+
+    def apply(self, availabilities: list[FlightAvailability]) -> list[FlightAvailability]:
+        """
+        Personalize flight availabilities without touching the shared records.
+
+        Each result is a shallow copy of its record with only the traveller
+        fields replaced, so no validation or deep copying takes place.
+
+        Args:
+            availabilities (list[FlightAvailability]): The shared records.
+
+        Returns:
+            list[FlightAvailability]: Personalized copies, in the same order.
+        """
+        update = {"travellerId": self.travellerId, "visaRequired": self.visaRequired}
+        return [availability.model_copy(update=update) for availability in availabilities]
+
 class FlightDatabase(BaseModel):
     records : dict[str, list[FlightAvailability]] = Field(..., description="A map of availability dates to FlightAvailabilityRecords")
 
+    # Secondary indexes, kept in sync by add_flight_availability and the remove methods.
+    # Removals replace index lists instead of editing them, so concurrent readers are unaffected.
+    _route_index: dict[tuple[str, str, str], list[FlightAvailability]] = PrivateAttr(default_factory=dict)
+    _source_index: dict[tuple[str, str], list[FlightAvailability]] = PrivateAttr(default_factory=dict)
+    _airline_index: dict[str, list[FlightAvailability]] = PrivateAttr(default_factory=dict)
+
+    def model_post_init(self, context):
+        for departure_date, availabilities in self.records.items():
+            for availability in availabilities:
+                self._index_flight_availability(departure_date, availability)
+
+    def _index_flight_availability(self, departure_date: str, availability: FlightAvailability):
+        route_key = (departure_date, availability.sourceAirport, availability.destinationAirport)
+        self._route_index.setdefault(route_key, []).append(availability)
+
+        source_key = (availability.sourceAirport, departure_date)
+        self._source_index.setdefault(source_key, []).append(availability)
+
+        self._airline_index.setdefault(availability.airline, []).append(availability)
+
     def add_flight_availability(self, departure_date: str, availability: FlightAvailability):
 
         if departure_date not in self.records:
             self.records[departure_date] = []
 
         self.records[departure_date].append(availability)
+        self._index_flight_availability(departure_date, availability)
         return self.records[departure_date]
 
+    def add_flight_availabilities(self, departure_date: str, availabilities: list[FlightAvailability]):
+        for availability in availabilities:
+            self.add_flight_availability(departure_date, availability)
+        return self.records.get(departure_date, [])
+
+    def remove_date(self, departure_date: str) -> int:
+        availabilities = self.records.pop(departure_date, [])
+        self._remove_from_indexes(departure_date, availabilities)
+        return len(availabilities)
+
+    def remove_flight_availability(self, departure_date: str, source_airport: str, destination_airport: str,
+                                   availability_id: str) -> int:
+        route = self._route_index.get((departure_date, source_airport, destination_airport), [])
+        removed = [availability for availability in route if availability.id == availability_id]
+        if not removed:
+            return 0
+
+        removed_ids = {id(availability) for availability in removed}
+        remaining = [availability for availability in self.records[departure_date] if id(availability) not in removed_ids]
+        if remaining:
+            self.records[departure_date] = remaining
+        else:
+            del self.records[departure_date]
+        self._remove_from_indexes(departure_date, removed)
+        return len(removed)
+
+    def _remove_from_indexes(self, departure_date: str, removed: list[FlightAvailability]):
+        removed_ids = {id(availability) for availability in removed}
+
+        def without_removed(index: dict, key):
+            remaining = [availability for availability in index.get(key, []) if id(availability) not in removed_ids]
+            if remaining:
+                index[key] = remaining
+            else:
+                index.pop(key, None)
+
+        for availability in removed:
+            without_removed(self._route_index, (departure_date, availability.sourceAirport, availability.destinationAirport))
+            without_removed(self._source_index, (availability.sourceAirport, departure_date))
+        for airline in {availability.airline for availability in removed}:
+            without_removed(self._airline_index, airline)
+
+    def get_route_availability(self, departure_date: str, source_airport: str, destination_airport: str) -> list[FlightAvailability]:
+        return self._route_index.get((departure_date, source_airport, destination_airport), [])
+
+    def get_source_availability(self, source_airport: str, departure_date: str) -> list[FlightAvailability]:
+        return self._source_index.get((source_airport, departure_date), [])
+
+    def get_airline_availability(self, airline: str) -> list[FlightAvailability]:
+        return self._airline_index.get(airline, [])
+
     def get_availability(self, departure_date: str)->  list[FlightAvailability]:
-        if departure_date not in self.records:
-            return []
-        return self.records[departure_date]
+        # A single lookup, so a concurrent remove_date cannot slip in between
+        return self.records.get(departure_date, [])
 
     def get_available_dates(self):
         available_dates = list(self.records.keys())
@@ -0,0 +1,94 @@
+import base64
+import hashlib
+import json
+from itertools import chain, islice
+from operator import attrgetter
+from typing import Hashable, Iterable
+
+from .models import FlightAvailability, FlightField
+
+
+def _query_digest(query: Hashable) -> str:
+    return hashlib.sha256(repr(query).encode()).hexdigest()[:16]
+
+
+def encode_cursor(offset: int, generation: int, query: Hashable) -> str:
+    """
+    Encode the position of the next page as an opaque cursor.
+
+    Args:
+        offset (int): Index of the first result of the next page.
+        generation (int): The database generation the results came from.
+        query (Hashable): The parameters that determine the result order.
+
+    Returns:
+        str: The cursor.
+    """
+    payload = json.dumps([offset, generation, _query_digest(query)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str, generation: int, query: Hashable) -> int:
+    """
+    Decode a cursor returned by `encode_cursor`.
+
+    Args:
+        cursor (str): The cursor.
+        generation (int): The current database generation.
+        query (Hashable): The parameters of the current request.
+
+    Returns:
+        int: Index of the first result of the page.
+
+    Raises:
+        ValueError: If the cursor is malformed, belongs to another query, or
+            the data changed since it was issued.
+    """
+    try:
+        offset, cursor_generation, digest = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor") from None
+    if digest != _query_digest(query):
+        raise ValueError("The cursor belongs to a different search")
+    if cursor_generation != generation:
+        raise ValueError("The flight data changed since the cursor was issued, start the search again")
+    return offset
+
+
+def select_page(results: list[list[FlightAvailability]], offset: int, limit: int,
+                sort_by: FlightField | None = None, descending: bool = False) -> list[FlightAvailability]:
+    """
+    Select one page from several result lists, e.g. one per date.
+
+    Without `sort_by` the results keep their order and only the page is
+    visited; sorting has to look at every result.
+
+    Args:
+        results (list[list[FlightAvailability]]): The result lists, in order.
+        offset (int): Index of the first result of the page.
+        limit (int): Maximum number of results on the page.
+        sort_by (FlightField | None): Field to order the results by.
+        descending (bool): Whether to sort in descending order.
+
+    Returns:
+        list[FlightAvailability]: The results of the page.
+    """
+    flights: Iterable[FlightAvailability] = chain.from_iterable(results)
+    if sort_by is not None:
+        flights = sorted(flights, key=attrgetter(sort_by), reverse=descending)
+    return list(islice(flights, offset, offset + limit))
+
+
+def project_flights(flights: list[FlightAvailability], fields: list[FlightField] | None) -> list[dict]:
+    """
+    Convert flights to dictionaries with only the requested fields.
+
+    Args:
+        flights (list[FlightAvailability]): The flights.
+        fields (list[FlightField] | None): The fields to keep, or None for all.
+
+    Returns:
+        list[dict]: One dictionary per flight.
+    """
+    include = set(fields) if fields else None
+    return [flight.model_dump(include=include) for flight in flights]
@@ -0,0 +1,131 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable
+
+import pydantic_core
+from pydantic import BaseModel, Field
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A query result together with its JSON encoding."""
+    value: Any
+    payload: str
+
+
+class ResponseCacheStats(BaseModel):
+    hits: int = Field(default=0, description="Lookups answered from the cache")
+    misses: int = Field(default=0, description="Lookups that had to build the response")
+    evictions: int = Field(default=0, description="Entries evicted to stay within the size limits")
+    invalidations: int = Field(default=0, description="Times the whole cache was dropped because the data changed")
+    entries: int = Field(default=0, description="Entries currently cached")
+    bytes: int = Field(default=0, description="Size of the cached payloads in bytes")
+    maxBytes: int = Field(..., description="Maximum size of the cached payloads in bytes")
+    generation: int = Field(default=0, description="Database generation the cached entries belong to")
+
+
+class ResponseCache:
+    """
+        Size-bounded LRU cache of query results and their encoded JSON payloads.
+
+        Entries belong to one database generation. A lookup or insert for a
+        different generation drops every entry first, so responses built from
+        replaced data are never served. Results are cached without traveller
+        specific values; personalized responses are built from the cached
+        value rather than cached themselves.
+
+    Attributes:
+        max_bytes (int): Maximum total size of the cached payloads.
+        max_entries (int): Maximum number of cached entries.
+    """
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024, max_entries: int = 4096):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, CachedResponse] = OrderedDict()
+        self._generation = 0
+        self._size = 0
+        self._stats = ResponseCacheStats(maxBytes=max_bytes)
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, generation: int) -> CachedResponse | None:
+        """
+        Look up a cached response.
+
+        Args:
+            key (Hashable): Identifies the query, e.g. a resource URI or a
+                (tool, date, source, destination) tuple.
+            generation (int): The generation of the data the caller is using.
+
+        Returns:
+            CachedResponse | None: The cached response, or None on a miss.
+        """
+        with self._lock:
+            self._check_generation(generation)
+            cached = self._entries.get(key)
+            if cached is None:
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return cached
+
+    def put(self, key: Hashable, generation: int, value: Any) -> CachedResponse:
+        """
+        Encode a query result and cache it.
+
+        Args:
+            key (Hashable): Identifies the query.
+            generation (int): The generation of the data the value was built from.
+            value (Any): The query result; pydantic models and JSON types are supported.
+
+        Returns:
+            CachedResponse: The value and its JSON payload.
+        """
+        cached = CachedResponse(value=value, payload=pydantic_core.to_json(value).decode())
+        size = len(cached.payload)
+
+        with self._lock:
+            self._check_generation(generation)
+            if generation != self._generation or size > self.max_bytes:
+                return cached
+
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous.payload)
+            self._entries[key] = cached
+            self._size += size
+
+            while self._size > self.max_bytes or len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.payload)
+                self._stats.evictions += 1
+        return cached
+
+    def clear(self):
+        """Drop every cached entry."""
+        with self._lock:
+            self._drop_entries()
+
+    def stats(self) -> ResponseCacheStats:
+        """
+        Snapshot the cache counters.
+
+        Returns:
+            ResponseCacheStats: Hits, misses, evictions, invalidations and size.
+        """
+        with self._lock:
+            return self._stats.model_copy(update={"entries": len(self._entries), "bytes": self._size,
+                                                  "generation": self._generation})
+
+    def _check_generation(self, generation: int):
+        # Only move forward, so a request still holding older data cannot wipe newer entries
+        if generation > self._generation:
+            self._drop_entries()
+            self._generation = generation
+
+    def _drop_entries(self):
+        if self._entries:
+            self._stats.invalidations += 1
+        self._entries.clear()
+        self._size = 0
@@ -0,0 +1,138 @@
+import heapq
+from bisect import bisect_left, bisect_right
+from collections import deque
+
+from .models import Itinerary, ItineraryLeg
+from .storage import FlightStore
+
+
+class RouteGraph:
+    """
+        Precomputed adjacency graph of the routes in a flight database.
+
+        Each airport maps to the airports it has direct flights to, and each of
+        those routes to the sorted list of dates it operates on. Connection
+        searches run entirely on this graph and only fetch the flights of the
+        legs that make it into a returned itinerary.
+
+    Attributes:
+        database (FlightStore): The database the graph was built from.
+        routes (dict[str, dict[str, list[str]]]): Source airport to destination
+            airport to the dates with flights on that route.
+    """
+    def __init__(self, database: FlightStore):
+        self.database = database
+        self.routes: dict[str, dict[str, list[str]]] = {}
+        self._hops_to: dict[str, dict[str, int]] = {}
+
+        route_dates: dict[tuple[str, str], set[str]] = {}
+        for departure_date in database.get_available_dates():
+            for availability in database.get_availability(departure_date=departure_date):
+                route = (availability.sourceAirport, availability.destinationAirport)
+                route_dates.setdefault(route, set()).add(departure_date)
+
+        for (source, destination), dates in sorted(route_dates.items()):
+            self.routes.setdefault(source, {})[destination] = sorted(dates)
+
+    def hops_to(self, destination: str) -> dict[str, int]:
+        """
+        Compute the fewest legs needed to reach a destination from each airport.
+
+        The distances ignore dates and are used to prune partial itineraries
+        that can no longer arrive within the allowed number of legs.
+
+        Args:
+            destination (str): The destination airport code.
+
+        Returns:
+            dict[str, int]: Minimum number of legs, keyed by airport code. Airports
+            that cannot reach the destination are absent.
+        """
+        if destination in self._hops_to:
+            return self._hops_to[destination]
+
+        reverse_routes: dict[str, list[str]] = {}
+        for source, destinations in self.routes.items():
+            for next_airport in destinations:
+                reverse_routes.setdefault(next_airport, []).append(source)
+
+        hops = {destination: 0}
+        queue = deque([destination])
+        while queue:
+            airport = queue.popleft()
+            for previous_airport in reverse_routes.get(airport, []):
+                if previous_airport not in hops:
+                    hops[previous_airport] = hops[airport] + 1
+                    queue.append(previous_airport)
+
+        self._hops_to[destination] = hops
+        return hops
+
+    def search(self, start_date: str, end_date: str, source_airport: str, destination_airport: str,
+               max_legs: int = 2, max_results: int = 10) -> list[Itinerary]:
+        """
+        Find the best itineraries between two airports within a date range.
+
+        Itineraries are ranked by number of legs, then arrival date, then
+        departure date. A leg may depart on the same day as the previous leg
+        arrives or later, and no airport is visited twice. The search is a
+        best-first search whose bound is the legs taken so far plus the fewest
+        legs still needed, so results are produced in rank order and the
+        search stops once `max_results` itineraries are found.
+
+        Args:
+            start_date (str): Earliest departure date in YYYY-MM-DD format.
+            end_date (str): Latest departure date of any leg in YYYY-MM-DD format.
+            source_airport (str): The departure airport code.
+            destination_airport (str): The arrival airport code.
+            max_legs (int): The maximum number of flights in an itinerary.
+            max_results (int): The maximum number of itineraries to return.
+
+        Returns:
+            list[Itinerary]: The best itineraries, best first.
+        """
+        hops = self.hops_to(destination_airport)
+        if source_airport == destination_airport or hops.get(source_airport, max_legs + 1) > max_legs:
+            return []
+
+        # Entries are (bound, arrival date, departure date, tie breaker, airport, legs)
+        frontier: list = [(hops[source_airport], "", "", 0, source_airport, ())]
+        counter = 1
+        itineraries: list[Itinerary] = []
+
+        while frontier and len(itineraries) < max_results:
+            _, arrival_date, _, _, airport, legs = heapq.heappop(frontier)
+
+            if airport == destination_airport:
+                itineraries.append(self._build_itinerary(legs))
+                continue
+
+            visited = {source_airport, *(leg[1] for leg in legs)}
+            earliest_date = arrival_date or start_date
+            for next_airport, dates in self.routes.get(airport, {}).items():
+                remaining_hops = hops.get(next_airport)
+                if next_airport in visited or remaining_hops is None:
+                    continue
+                if len(legs) + 1 + remaining_hops > max_legs:
+                    continue
+
+                first = bisect_left(dates, earliest_date)
+                last = bisect_right(dates, end_date)
+                for departure_date in dates[first:last]:
+                    next_legs = legs + ((airport, next_airport, departure_date),)
+                    bound = len(next_legs) + remaining_hops
+                    heapq.heappush(frontier, (bound, departure_date, next_legs[0][2], counter, next_airport, next_legs))
+                    counter += 1
+
+        return itineraries
+
+    def _build_itinerary(self, legs: tuple[tuple[str, str, str], ...]) -> Itinerary:
+        itinerary_legs = [
+            ItineraryLeg(sourceAirport=source, destinationAirport=destination, departureDate=departure_date,
+                         flights=self.database.get_route_availability(departure_date=departure_date,
+                                                                      source_airport=source,
+                                                                      destination_airport=destination))
+            for source, destination, departure_date in legs
+        ]
+        return Itinerary(legs=itinerary_legs, numberOfLegs=len(itinerary_legs),
+                         departureDate=legs[0][2], arrivalDate=legs[-1][2])
@@ -0,0 +1,97 @@
+import itertools
+import os
+
+import httpx
+from mcp.server.streamable_http import MCP_SESSION_ID_HEADER
+from starlette.background import BackgroundTask
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, StreamingResponse
+
+# Headers that apply to a single connection and must not be forwarded
+_HOP_BY_HOP_HEADERS = {"connection", "keep-alive", "proxy-authenticate", "proxy-authorization", "te", "trailer",
+                       "transfer-encoding", "upgrade", "host", "content-length"}
+
+
+class SessionAffinityRouter:
+    """
+        ASGI reverse proxy that spreads MCP sessions over several servers.
+
+        Streamable HTTP sessions, and elicitations waiting for an answer, live
+        in the memory of the server that created them, so every request of a
+        session has to reach that server. New sessions are assigned to the
+        servers in turn, and the router prefixes the session id the server
+        returns with the server's index. Later requests are routed by that
+        prefix, which is removed before forwarding. The router keeps no
+        session table, so several router processes can share one port.
+
+    Attributes:
+        backends (list[str]): Base URLs of the servers, e.g. "http://127.0.0.1:8001".
+    """
+    def __init__(self, backends: list[str]):
+        if not backends:
+            raise ValueError("The router needs at least one backend server")
+        self.backends = [backend.rstrip("/") for backend in backends]
+        self._next_backend = itertools.count()
+        self._client: httpx.AsyncClient | None = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+
+        request = Request(scope, receive)
+        response = await self.forward(request)
+        await response(scope, receive, send)
+
+    async def forward(self, request: Request):
+        """
+        Forward a request to the server of its session, streaming the response back.
+
+        Args:
+            request (Request): The client request.
+
+        Returns:
+            Response: The server's response, with the session id prefixed.
+        """
+        headers = [(name, value) for name, value in request.headers.items() if name not in _HOP_BY_HOP_HEADERS]
+
+        session_id = request.headers.get(MCP_SESSION_ID_HEADER)
+        if session_id is None:
+            backend = next(self._next_backend) % len(self.backends)
+        else:
+            prefix, _, server_session_id = session_id.partition("-")
+            if not prefix.isdigit() or int(prefix) >= len(self.backends) or not server_session_id:
+                return PlainTextResponse("Session not found", status_code=404)
+            backend = int(prefix)
+            headers = [(name, server_session_id if name == MCP_SESSION_ID_HEADER else value) for name, value in headers]
+
+        url = httpx.URL(self.backends[backend] + request.url.path, query=request.url.query.encode())
+        upstream_request = self._client.build_request(request.method, url, headers=headers, content=request.stream())
+        try:
+            upstream = await self._client.send(upstream_request, stream=True)
+        except httpx.TransportError:
+            return PlainTextResponse("MCP server unavailable", status_code=502)
+
+        response_headers = {name: value for name, value in upstream.headers.items() if name not in _HOP_BY_HOP_HEADERS}
+        if MCP_SESSION_ID_HEADER in response_headers:
+            response_headers[MCP_SESSION_ID_HEADER] = f"{backend}-{response_headers[MCP_SESSION_ID_HEADER]}"
+        return StreamingResponse(upstream.aiter_raw(), status_code=upstream.status_code, headers=response_headers,
+                                 background=BackgroundTask(upstream.aclose))
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                # Server-sent event streams stay open indefinitely, so reads never time out
+                self._client = httpx.AsyncClient(timeout=httpx.Timeout(5.0, read=None),
+                                                 limits=httpx.Limits(max_connections=None, max_keepalive_connections=100))
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self._client.aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+def create_router_from_environment() -> SessionAffinityRouter:
+    """Create a router for the comma separated FLIGHTS_ROUTER_BACKENDS base URLs, for `uvicorn --factory`."""
+    return SessionAffinityRouter(os.environ["FLIGHTS_ROUTER_BACKENDS"].split(","))
@@ -0,0 +1,195 @@
+import threading
+from datetime import date, datetime, timedelta
+from typing import Callable, TypeVar
+
+from pydantic import BaseModel, Field
+
+from .data_access_objects import FlightsDataAccessObject
+
+T = TypeVar("T")
+
+
+class DatabaseStatus(BaseModel):
+    generation: int = Field(..., description="Number of times the shared database has been built or updated")
+    builtAt: str = Field(default="", description="When the shared database was last built, in ISO 8601 format")
+    updatedAt: str = Field(default="", description="When the shared database was last built or updated, in ISO 8601 format")
+    isStale: bool = Field(..., description="Whether the shared data should be refreshed")
+
+
+class SharedFlightsDatabase:
+    """
+        Process-wide holder for a single, lazily built FlightsDataAccessObject.
+
+        Building a FlightsDataAccessObject populates every flight availability
+        record, so the MCP tools share one instance instead of creating a new
+        one per call. The instance is treated as read-mostly: readers grab the
+        current reference without locking, while `refresh` builds a replacement
+        off to the side and swaps it in atomically. `update` instead changes
+        the current instance in place, for stores whose writes are safe to run
+        alongside readers.
+
+    Attributes:
+        factory (Callable[[], FlightsDataAccessObject]): Builds a fully
+            populated data access object.
+        max_age (timedelta | None): How long a build remains fresh. The data is
+            also considered stale once the calendar day changes, because the
+            availability window starts from the day it was built.
+    """
+    def __init__(self, factory: Callable[[], FlightsDataAccessObject] = FlightsDataAccessObject,
+                 max_age: timedelta | None = None):
+        self.factory = factory
+        self.max_age = max_age
+        self._dao: FlightsDataAccessObject | None = None
+        self._built_at: datetime | None = None
+        self._updated_at: datetime | None = None
+        self._generation: int = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        """The number of builds so far; changes whenever the data is replaced."""
+        return self._generation
+
+    @property
+    def built_at(self) -> datetime | None:
+        """When the current data was built, or None if it has not been built yet."""
+        return self._built_at
+
+    def get(self) -> FlightsDataAccessObject:
+        """
+        Retrieve the shared data access object, building it on first use.
+
+        Returns:
+            FlightsDataAccessObject: The shared, populated data access object.
+        """
+        dao = self._dao
+        if dao is not None:
+            return dao
+
+        with self._lock:
+            if self._dao is None:
+                self._build()
+            return self._dao
+
+    def get_with_generation(self) -> tuple[FlightsDataAccessObject, int]:
+        """
+        Retrieve the shared data access object together with its generation.
+
+        Returns:
+            tuple[FlightsDataAccessObject, int]: The data access object and the
+            generation it belongs to, read consistently.
+        """
+        while True:
+            generation = self._generation
+            dao = self.get()
+            if generation == self._generation and generation > 0:
+                return dao, generation
+
+    def start(self) -> FlightsDataAccessObject:
+        """
+        Eagerly build the shared data, typically at server startup.
+
+        Returns:
+            FlightsDataAccessObject: The shared, populated data access object.
+        """
+        return self.get()
+
+    def refresh(self) -> FlightsDataAccessObject:
+        """
+        Rebuild the shared data and replace the current instance.
+
+        Requests already holding the previous instance keep using it until they
+        finish; new requests see the replacement.
+
+        Returns:
+            FlightsDataAccessObject: The newly built data access object.
+        """
+        with self._lock:
+            self._build()
+            return self._dao
+
+    def update(self, function: Callable[[FlightsDataAccessObject], T | None]) -> T | None:
+        """
+        Change the current data in place, starting a new generation if anything changed.
+
+        Updates are serialized with builds and with each other; readers keep
+        running while the update is applied. If `function` raises, part of
+        the changes may already be applied, so a new generation starts anyway.
+
+        Args:
+            function (Callable[[FlightsDataAccessObject], T | None]): Applies
+                the changes to the data access object, returning None if
+                nothing changed.
+
+        Returns:
+            T | None: The value returned by `function`.
+        """
+        with self._lock:
+            if self._dao is None:
+                self._build()
+            try:
+                result = function(self._dao)
+            except BaseException:
+                self._generation = self._generation + 1
+                raise
+            self._updated_at = datetime.now()
+            if result is not None:
+                self._generation = self._generation + 1
+            return result
+
+    def refresh_if_stale(self) -> FlightsDataAccessObject:
+        """
+        Rebuild the shared data only when it is stale.
+
+        Returns:
+            FlightsDataAccessObject: The current data access object.
+        """
+        if self.is_stale():
+            return self.refresh()
+        return self.get()
+
+    def shutdown(self):
+        """Release the shared data. A later `get` builds it again."""
+        with self._lock:
+            self._dao = None
+            self._built_at = None
+            self._updated_at = None
+
+    def is_stale(self) -> bool:
+        """
+        Determine whether the shared data should be refreshed.
+
+        Returns:
+            bool: True if the data has not been built yet, was last built or
+            updated on an earlier day, or is older than `max_age`.
+        """
+        updated_at = self._updated_at
+        if updated_at is None:
+            return True
+
+        now = datetime.now()
+        if updated_at.date() != date.today():
+            return True
+        if self.max_age is not None and now - updated_at > self.max_age:
+            return True
+        return False
+
+    def status(self) -> DatabaseStatus:
+        """
+        Describe the current state of the shared data.
+
+        Returns:
+            DatabaseStatus: The generation, build time and staleness.
+        """
+        built_at, updated_at = self._built_at, self._updated_at
+        return DatabaseStatus(generation=self._generation,
+                              builtAt=built_at.isoformat() if built_at else "",
+                              updatedAt=updated_at.isoformat() if updated_at else "",
+                              isStale=self.is_stale())
+
+    def _build(self):
+        dao = self.factory()
+        self._built_at = self._updated_at = datetime.now()
+        # Publish the data before its generation, see get_with_generation
+        self._dao = dao
+        self._generation = self._generation + 1
@@ -0,0 +1,359 @@
+"""
+Binary snapshots of the flight database.
+
+A snapshot file is laid out as:
+
+    magic (8 bytes) | header length (uint32, little endian) | JSON header | columns
+
+The JSON header only carries the format version and the byte offset of every
+column, so its size does not depend on the data. Everything else is a
+column: the record fields, the dictionary-encoded string tables (UTF-8 bytes
+plus the offsets between the values) and the route, departure, date and
+airline indexes (sorted integer keys with the row range of each). Rows are
+written sorted by (date, source, destination), so each index entry is a
+contiguous range of rows and the airline index is a single column of row
+numbers. Columns are aligned to 8 bytes and stored in the byte order of the
+machine that wrote them.
+
+`load_snapshot` memory-maps the file and exposes the columns as zero-copy
+memoryviews. Strings are decoded and index keys found by binary search when
+a query needs them, so loading is constant time and every process that loads
+the same file shares the same physical pages.
+"""
+import argparse
+import csv
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable, Iterator
+
+from .columnar import ColumnarFlightDatabase
+from .models import FlightDatabase, FlightAvailability
+
+SNAPSHOT_MAGIC = b"FLTSNAP1"
+SNAPSHOT_VERSION = 2
+
+_HEADER_LENGTH = struct.Struct("<I")
+_ALIGNMENT = 8
+
+_TABLES = ("ids", "dates", "airports", "countries", "airlines", "travellers")
+_COLUMNS = ("id_column", "date_column", "source_column", "destination_column", "source_country_column",
+            "destination_country_column", "airline_column", "traveller_column", "visa_column")
+
+# Tables with a value per record; their decoded values are not kept
+_PER_RECORD_TABLES = ("ids",)
+
+_KEY = "Q"
+_OFFSET = "Q"
+
+
+def _route_key(key: tuple[int, int, int]) -> int:
+    departure_date, source, destination = key
+    return (departure_date << 32) | (source << 16) | destination
+
+
+def _departure_key(key: tuple[int, int]) -> int:
+    source, departure_date = key
+    return (source << 16) | departure_date
+
+
+def _code_key(key: int) -> int:
+    return key
+
+
+class MappedStringTable:
+    """
+        Read-only StringTable whose values stay in a mapped snapshot.
+
+        The values are stored as concatenated UTF-8 bytes plus the offset of
+        each value, and decoded when a query needs them. The reverse mapping
+        used by `lookup` is built on first use; queries only look up dates,
+        airports and airlines, which are small tables.
+    """
+    def __init__(self, offsets: memoryview, blob: memoryview, keep_decoded: bool = True):
+        self._offsets = offsets
+        self._blob = blob
+        self._decoded: dict[int, str] | None = {} if keep_decoded else None
+        self._codes: dict[str, int] | None = None
+
+    @property
+    def values(self) -> "MappedStringTable":
+        return self
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, code: int) -> str:
+        decoded = self._decoded
+        if decoded is not None and code in decoded:
+            return decoded[code]
+        if not 0 <= code < len(self):
+            raise IndexError(code)
+        value = str(self._blob[self._offsets[code]:self._offsets[code + 1]], "utf-8")
+        if decoded is not None:
+            decoded[code] = sys.intern(value)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return (self[code] for code in range(len(self)))
+
+    def decode(self, code: int) -> str:
+        return self[code]
+
+    def lookup(self, value: str) -> int | None:
+        if self._codes is None:
+            self._codes = {decoded: code for code, decoded in enumerate(self)}
+        return self._codes.get(value)
+
+
+class MappedRangeIndex:
+    """
+        Read-only index of a mapped snapshot.
+
+        Keys are encoded as integers and stored sorted, next to the row range
+        of each key; `get` finds a key by binary search. Without `rows` the
+        range is returned as is, otherwise the slice of `rows` it covers.
+    """
+    def __init__(self, keys: memoryview, starts: memoryview, ends: memoryview,
+                 encode_key: Callable, rows: memoryview | None = None):
+        self._keys = keys
+        self._starts = starts
+        self._ends = ends
+        self._encode_key = encode_key
+        self._rows = rows
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key, default=None):
+        encoded = self._encode_key(key)
+        position = bisect_left(self._keys, encoded)
+        if position == len(self._keys) or self._keys[position] != encoded:
+            return default
+        start, end = self._starts[position], self._ends[position]
+        return range(start, end) if self._rows is None else self._rows[start:end]
+
+
+def _all_records(database: FlightDatabase | ColumnarFlightDatabase) -> list[FlightAvailability]:
+    records: list[FlightAvailability] = []
+    for departure_date in database.get_available_dates():
+        records.extend(database.get_availability(departure_date=departure_date))
+    return records
+
+
+def _string_table_columns(name: str, values: list[str]) -> dict[str, array]:
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = array(_OFFSET, [0])
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    return {f"{name}_offsets": offsets, f"{name}_blob": array("B", b"".join(encoded))}
+
+
+def _range_index_columns(name: str, ranges: list[tuple[int, int, int]]) -> dict[str, array]:
+    """Columns of an index, given its (encoded key, start, end) entries."""
+    ranges = sorted(ranges)
+    return {f"{name}_keys": array(_KEY, [key for key, _, _ in ranges]),
+            f"{name}_starts": array(ColumnarFlightDatabase.LARGE_CODE, [start for _, start, _ in ranges]),
+            f"{name}_ends": array(ColumnarFlightDatabase.LARGE_CODE, [end for _, _, end in ranges])}
+
+
+def _row_ranges(keys: list[int]) -> list[tuple[int, int, int]]:
+    """Collapse the key of every row into (key, start, end) ranges of consecutive rows."""
+    ranges: list[list[int]] = []
+    for row, key in enumerate(keys):
+        if ranges and ranges[-1][0] == key:
+            ranges[-1][2] = row + 1
+        else:
+            ranges.append([key, row, row + 1])
+    return [(key, start, end) for key, start, end in ranges]
+
+
+def write_snapshot(database: FlightDatabase | ColumnarFlightDatabase, path: str | Path) -> int:
+    """
+    Write the contents of a flight database to a snapshot file.
+
+    Args:
+        database (FlightDatabase | ColumnarFlightDatabase): The database to export.
+        path (str | Path): Where to write the snapshot. An existing snapshot
+            is replaced atomically, so processes that mapped it are unaffected.
+
+    Returns:
+        int: The number of records written.
+    """
+    records = sorted(_all_records(database),
+                     key=lambda record: (record.departureDate, record.sourceAirport, record.destinationAirport))
+
+    columnar = ColumnarFlightDatabase()
+    for record in records:
+        columnar.add_flight_availability(departure_date=record.departureDate, availability=record)
+
+    row_count = len(columnar)
+    dates, sources, destinations = columnar.date_column, columnar.source_column, columnar.destination_column
+
+    columns: dict[str, array] = {name: getattr(columnar, name) for name in _COLUMNS}
+    for name in _TABLES:
+        columns.update(_string_table_columns(name, getattr(columnar, name).values))
+
+    # Sorting by date and route makes every route, departure and date a single range of rows
+    columns.update(_range_index_columns("route", _row_ranges(
+        [_route_key((dates[row], sources[row], destinations[row])) for row in range(row_count)])))
+    columns.update(_range_index_columns("departure", _row_ranges(
+        [_departure_key((sources[row], dates[row])) for row in range(row_count)])))
+    columns.update(_range_index_columns("date", _row_ranges(list(dates))))
+
+    airline_rows = array(ColumnarFlightDatabase.LARGE_CODE)
+    airline_ranges: list[tuple[int, int, int]] = []
+    for airline_code, rows in columnar._airline_index.items():
+        airline_ranges.append((airline_code, len(airline_rows), len(airline_rows) + len(rows)))
+        airline_rows.extend(rows)
+    columns.update(_range_index_columns("airline", airline_ranges))
+    columns["airline_rows"] = airline_rows
+
+    # Lay the columns out first so the header can record their offsets
+    layout: dict[str, dict] = {}
+    offset = 0
+    for name, column in columns.items():
+        offset = -(-offset // _ALIGNMENT) * _ALIGNMENT
+        layout[name] = {"typecode": column.typecode, "offset": offset, "length": len(column)}
+        offset += len(column) * column.itemsize
+
+    header = {
+        "version": SNAPSHOT_VERSION,
+        "byteorder": sys.byteorder,
+        "rows": row_count,
+        "columns": layout,
+    }
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    prefix_length = len(SNAPSHOT_MAGIC) + _HEADER_LENGTH.size + len(header_bytes)
+    header_bytes += b" " * (-prefix_length % _ALIGNMENT)
+
+    # Written next to the target and renamed over it, so processes mapping the old file keep their pages
+    path = Path(path)
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f".{path.name}.", delete=False) as snapshot:
+        try:
+            snapshot.write(SNAPSHOT_MAGIC)
+            snapshot.write(_HEADER_LENGTH.pack(len(header_bytes)))
+            snapshot.write(header_bytes)
+            data_start = snapshot.tell()
+            for name, column in columns.items():
+                snapshot.write(b"\0" * (data_start + layout[name]["offset"] - snapshot.tell()))
+                snapshot.write(column.tobytes())
+        except BaseException:
+            snapshot.close()
+            os.unlink(snapshot.name)
+            raise
+    os.replace(snapshot.name, path)
+
+    return row_count
+
+
+def load_snapshot(path: str | Path) -> ColumnarFlightDatabase:
+    """
+    Memory-map a snapshot file as a read-only ColumnarFlightDatabase.
+
+    Args:
+        path (str | Path): The snapshot to load.
+
+    Returns:
+        ColumnarFlightDatabase: A database whose columns, string tables and
+        indexes point into the mapped file.
+
+    Raises:
+        ValueError: If the file is not a snapshot this version can read.
+    """
+    with open(path, "rb") as snapshot:
+        mapped = mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_READ)
+
+    prefix_length = len(SNAPSHOT_MAGIC) + _HEADER_LENGTH.size
+    if mapped[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+        raise ValueError(f"{path} is not a flight database snapshot")
+    (header_length,) = _HEADER_LENGTH.unpack(mapped[len(SNAPSHOT_MAGIC):prefix_length])
+    header = json.loads(mapped[prefix_length:prefix_length + header_length])
+    if header["version"] != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {header['version']} in {path}, write it again")
+    if header["byteorder"] != sys.byteorder:
+        raise ValueError(f"{path} was written on a {header['byteorder']} endian machine")
+
+    data = memoryview(mapped)[prefix_length + header_length:]
+
+    def column(name: str) -> memoryview:
+        spec = header["columns"][name]
+        itemsize = array(spec["typecode"]).itemsize
+        start = spec["offset"]
+        return data[start:start + spec["length"] * itemsize].cast(spec["typecode"])
+
+    def range_index(name: str, encode_key: Callable, rows: memoryview | None = None) -> MappedRangeIndex:
+        return MappedRangeIndex(column(f"{name}_keys"), column(f"{name}_starts"), column(f"{name}_ends"),
+                                encode_key, rows)
+
+    database = ColumnarFlightDatabase()
+    for name in _TABLES:
+        setattr(database, name, MappedStringTable(column(f"{name}_offsets"), column(f"{name}_blob"),
+                                                  keep_decoded=name not in _PER_RECORD_TABLES))
+    for name in _COLUMNS:
+        setattr(database, name, column(name))
+
+    database._route_index = range_index("route", _route_key)
+    database._source_index = range_index("departure", _departure_key)
+    database._date_index = range_index("date", _code_key)
+    database._airline_index = range_index("airline", _code_key, rows=column("airline_rows"))
+
+    database.read_only = True
+    database._snapshot = mapped
+    return database
+
+
+def read_csv_schedule(path: str | Path) -> FlightDatabase:
+    """
+    Load a CSV schedule feed into a FlightDatabase.
+
+    The CSV must have a header row naming FlightAvailability fields, at least
+    id, sourceAirport, destinationAirport, departureDate, sourceAirportCountry
+    and destinationAirportCountry.
+
+    Args:
+        path (str | Path): The CSV file to read.
+
+    Returns:
+        FlightDatabase: A database holding every row of the feed.
+    """
+    database = FlightDatabase(records={})
+    with open(path, newline="", encoding="utf-8") as feed:
+        for row in csv.DictReader(feed):
+            availability = FlightAvailability(**{key: value for key, value in row.items() if value != ""})
+            database.add_flight_availability(departure_date=availability.departureDate, availability=availability)
+    return database
+
+
+def main():
+    from .data_access_objects import FlightsDataAccessObject
+
+    parser = argparse.ArgumentParser(description="Export the flight database to a binary snapshot")
+    parser.add_argument("output", help="Path of the snapshot file to write")
+    parser.add_argument("--csv", dest="csv_path", help="Read the schedule from a CSV feed instead of generating it")
+    parser.add_argument("--days", type=int, default=8, help="Days of generated availability, starting today")
+    args = parser.parse_args()
+
+    if args.csv_path:
+        database = read_csv_schedule(args.csv_path)
+    else:
+        database = FlightsDataAccessObject(database=ColumnarFlightDatabase(), number_of_days_from_today=args.days).database
+
+    row_count = write_snapshot(database, args.output)
+    print(f"Wrote {row_count} flight availability records to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
+
+
+#  uv run -m izzy_mcp_tutorials.snapshots flights.snapshot
@@ -0,0 +1,160 @@
+import itertools
+import queue
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+
+from .models import FlightAvailability
+
+_COLUMNS = ("id", "sourceAirport", "destinationAirport", "departureDate", "sourceAirportCountry",
+            "destinationAirportCountry", "airline", "travellerId", "visaRequired")
+
+_SELECT = f"SELECT {', '.join(_COLUMNS)} FROM flight_availability"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS flight_availability (
+    rowId INTEGER PRIMARY KEY,
+    id TEXT NOT NULL,
+    sourceAirport TEXT NOT NULL,
+    destinationAirport TEXT NOT NULL,
+    departureDate TEXT NOT NULL,
+    sourceAirportCountry TEXT NOT NULL,
+    destinationAirportCountry TEXT NOT NULL,
+    airline TEXT NOT NULL DEFAULT '',
+    travellerId TEXT NOT NULL DEFAULT '',
+    visaRequired INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS flight_availability_route ON flight_availability (departureDate, sourceAirport, destinationAirport);
+CREATE INDEX IF NOT EXISTS flight_availability_source ON flight_availability (sourceAirport, departureDate);
+CREATE INDEX IF NOT EXISTS flight_availability_airline ON flight_availability (airline);
+"""
+
+_memory_database_names = itertools.count()
+
+
+class SqliteConnectionPool:
+    """
+        Fixed-size pool of reusable SQLite connections.
+
+        Connections may be used from any thread, one thread at a time. An
+        in-memory database is opened in shared-cache mode so every connection
+        in the pool sees the same data.
+
+    Attributes:
+        size (int): Number of connections in the pool.
+        timeout (float): Seconds to wait for a free connection.
+    """
+    def __init__(self, path: str | Path = ":memory:", size: int = 4, timeout: float = 30.0):
+        self.size = size
+        self.timeout = timeout
+        self._connections: queue.Queue[sqlite3.Connection] = queue.Queue(maxsize=size)
+
+        if str(path) == ":memory:":
+            database, uri = f"file:flights-{next(_memory_database_names)}?mode=memory&cache=shared", True
+        else:
+            database, uri = str(path), False
+
+        for _ in range(size):
+            connection = sqlite3.connect(database, uri=uri, check_same_thread=False, timeout=timeout)
+            if not uri:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=NORMAL")
+            self._connections.put(connection)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection, returning it to the pool afterwards."""
+        connection = self._connections.get(timeout=self.timeout)
+        try:
+            yield connection
+        finally:
+            self._connections.put(connection)
+
+    def close(self):
+        """Close every connection in the pool."""
+        while not self._connections.empty():
+            self._connections.get_nowait().close()
+
+
+class SqliteFlightDatabase:
+    """
+        SQLite storage backend with the same methods as `FlightDatabase`.
+
+        Records live in a single indexed table, so the data set is bounded by
+        disk rather than RAM and one database file can be shared by several
+        worker processes. Every method performs blocking I/O, which is why
+        `performs_io` is set: async callers should run queries off the event
+        loop.
+
+    Attributes:
+        pool (SqliteConnectionPool): The connections used to run queries.
+        concurrent_writes (bool): Whether records can be changed while other
+            connections read. False for an in-memory database, whose shared
+            cache locks whole tables and fails writes instead of waiting.
+    """
+    performs_io = True
+
+    def __init__(self, path: str | Path = ":memory:", pool_size: int = 4):
+        self.pool = SqliteConnectionPool(path, size=pool_size)
+        self.concurrent_writes: bool = str(path) != ":memory:"
+        with self.pool.connection() as connection:
+            connection.executescript(_SCHEMA)
+
+    def add_flight_availability(self, departure_date: str, availability: FlightAvailability):
+        self.add_flight_availabilities(departure_date, [availability])
+
+    def add_flight_availabilities(self, departure_date: str, availabilities: list[FlightAvailability]):
+        rows = [(availability.id, availability.sourceAirport, availability.destinationAirport, departure_date,
+                 availability.sourceAirportCountry, availability.destinationAirportCountry, availability.airline,
+                 availability.travellerId, int(availability.visaRequired))
+                for availability in availabilities]
+        with self.pool.connection() as connection, connection:
+            connection.executemany(f"INSERT INTO flight_availability ({', '.join(_COLUMNS)}) "
+                                   f"VALUES ({', '.join('?' * len(_COLUMNS))})", rows)
+
+    def remove_date(self, departure_date: str) -> int:
+        return self._delete("DELETE FROM flight_availability WHERE departureDate = ?", (departure_date,))
+
+    def remove_flight_availability(self, departure_date: str, source_airport: str, destination_airport: str,
+                                   availability_id: str) -> int:
+        return self._delete("DELETE FROM flight_availability WHERE departureDate = ? AND sourceAirport = ? "
+                            "AND destinationAirport = ? AND id = ?",
+                            (departure_date, source_airport, destination_airport, availability_id))
+
+    def get_availability(self, departure_date: str) -> list[FlightAvailability]:
+        return self._query(f"{_SELECT} WHERE departureDate = ? ORDER BY rowId", (departure_date,))
+
+    def get_available_dates(self):
+        with self.pool.connection() as connection:
+            rows = connection.execute("SELECT DISTINCT departureDate FROM flight_availability ORDER BY departureDate")
+            return [departure_date for (departure_date,) in rows]
+
+    def get_route_availability(self, departure_date: str, source_airport: str, destination_airport: str) -> list[FlightAvailability]:
+        return self._query(f"{_SELECT} WHERE departureDate = ? AND sourceAirport = ? AND destinationAirport = ? ORDER BY rowId",
+                           (departure_date, source_airport, destination_airport))
+
+    def get_source_availability(self, source_airport: str, departure_date: str) -> list[FlightAvailability]:
+        return self._query(f"{_SELECT} WHERE sourceAirport = ? AND departureDate = ? ORDER BY rowId",
+                           (source_airport, departure_date))
+
+    def get_airline_availability(self, airline: str) -> list[FlightAvailability]:
+        return self._query(f"{_SELECT} WHERE airline = ? ORDER BY rowId", (airline,))
+
+    def close(self):
+        """Close the connection pool."""
+        self.pool.close()
+
+    def _delete(self, sql: str, parameters: tuple) -> int:
+        with self.pool.connection() as connection, connection:
+            return connection.execute(sql, parameters).rowcount
+
+    def _query(self, sql: str, parameters: tuple) -> list[FlightAvailability]:
+        with self.pool.connection() as connection:
+            rows = connection.execute(sql, parameters).fetchall()
+        # Rows were validated on insert, so they are not validated again
+        return [FlightAvailability.model_construct(id=flight_id, sourceAirport=source, destinationAirport=destination,
+                                                   departureDate=departure_date, sourceAirportCountry=source_country,
+                                                   destinationAirportCountry=destination_country, airline=airline,
+                                                   travellerId=traveller_id, visaRequired=bool(visa_required))
+                for (flight_id, source, destination, departure_date, source_country, destination_country,
+                     airline, traveller_id, visa_required) in rows]
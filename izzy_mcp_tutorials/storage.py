@@ -0,0 +1,60 @@
+from pathlib import Path
+from typing import Any, Protocol, runtime_checkable
+
+from .columnar import ColumnarFlightDatabase
+from .models import FlightDatabase, FlightAvailability
+from .sqlite_database import SqliteFlightDatabase
+
+STORAGE_BACKENDS = ("memory", "columnar", "sqlite")
+
+
+class FlightStore(Protocol):
+    """The storage operations FlightsDataAccessObject relies on."""
+
+    def add_flight_availability(self, departure_date: str, availability: FlightAvailability) -> Any: ...
+
+    def add_flight_availabilities(self, departure_date: str, availabilities: list[FlightAvailability]) -> Any: ...
+
+    def get_availability(self, departure_date: str) -> list[FlightAvailability]: ...
+
+    def get_available_dates(self) -> list[str]: ...
+
+    def get_route_availability(self, departure_date: str, source_airport: str, destination_airport: str) -> list[FlightAvailability]: ...
+
+    def get_source_availability(self, source_airport: str, departure_date: str) -> list[FlightAvailability]: ...
+
+    def get_airline_availability(self, airline: str) -> list[FlightAvailability]: ...
+
+
+@runtime_checkable
+class MutableFlightStore(FlightStore, Protocol):
+    """A FlightStore whose records can also be removed, for incremental maintenance."""
+
+    def remove_date(self, departure_date: str) -> int: ...
+
+    def remove_flight_availability(self, departure_date: str, source_airport: str, destination_airport: str,
+                                   availability_id: str) -> int: ...
+
+
+def create_flight_store(backend: str = "memory", sqlite_path: str | Path = ":memory:", sqlite_pool_size: int = 4) -> FlightStore:
+    """
+    Create an empty flight store for the named storage backend.
+
+    Args:
+        backend (str): One of "memory", "columnar" or "sqlite".
+        sqlite_path (str | Path): The SQLite database file, for the sqlite backend.
+        sqlite_pool_size (int): Number of pooled connections, for the sqlite backend.
+
+    Returns:
+        FlightStore: The new flight store.
+
+    Raises:
+        ValueError: If the backend is not recognized.
+    """
+    if backend == "memory":
+        return FlightDatabase(records={})
+    if backend == "columnar":
+        return ColumnarFlightDatabase()
+    if backend == "sqlite":
+        return SqliteFlightDatabase(path=sqlite_path, pool_size=sqlite_pool_size)
+    raise ValueError(f"Unknown storage backend {backend!r}, expected one of {', '.join(STORAGE_BACKENDS)}")
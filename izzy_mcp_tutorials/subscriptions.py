@@ -0,0 +1,63 @@
+import threading
+import weakref
+from typing import Any, Callable
+
+from pydantic import AnyUrl
+
+
+class ResourceSubscriptions:
+    """
+        Resource URIs each client session has subscribed to.
+
+        Entries are keyed by the session object and held weakly, so they are
+        dropped together with the session. `notify` sends a resource updated
+        notification for every subscribed URI a change affects.
+    """
+    def __init__(self):
+        self._subscriptions: weakref.WeakKeyDictionary[Any, set[str]] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def subscribe(self, session: Any, uri: str):
+        """Subscribe a session to updates of a resource URI."""
+        with self._lock:
+            self._subscriptions.setdefault(session, set()).add(uri)
+
+    def unsubscribe(self, session: Any, uri: str):
+        """Stop sending a session updates of a resource URI."""
+        with self._lock:
+            uris = self._subscriptions.get(session)
+            if uris is not None:
+                uris.discard(uri)
+
+    def subscribed_uris(self) -> set[str]:
+        """Every URI at least one session is subscribed to."""
+        with self._lock:
+            return set().union(*self._subscriptions.values())
+
+    async def notify(self, is_affected: Callable[[str], bool]) -> int:
+        """
+        Notify subscribed sessions of the resources affected by a change.
+
+        Sessions that can no longer be reached are unsubscribed from everything.
+
+        Args:
+            is_affected (Callable[[str], bool]): Whether the resource with the
+                given URI changed.
+
+        Returns:
+            int: The number of notifications sent.
+        """
+        with self._lock:
+            subscriptions = [(session, [uri for uri in uris if is_affected(uri)])
+                             for session, uris in self._subscriptions.items()]
+
+        sent = 0
+        for session, uris in subscriptions:
+            try:
+                for uri in uris:
+                    await session.send_resource_updated(AnyUrl(uri))
+                    sent += 1
+            except Exception:
+                with self._lock:
+                    self._subscriptions.pop(session, None)
+        return sent
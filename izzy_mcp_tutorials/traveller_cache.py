@@ -0,0 +1,112 @@
+import threading
+import time
+import weakref
+from typing import Any, Callable
+
+from pydantic import BaseModel, Field
+
+from .models import TravellerInformation
+
+
+class TravellerCacheMetrics(BaseModel):
+    hits: int = Field(default=0, description="Lookups answered from the cache")
+    misses: int = Field(default=0, description="Lookups that found no usable entry")
+    expirations: int = Field(default=0, description="Entries dropped because their time to live had passed")
+    invalidations: int = Field(default=0, description="Entries removed explicitly")
+    elicitations: int = Field(default=0, description="Elicitation requests issued to clients")
+    size: int = Field(default=0, description="Sessions currently holding a cached entry")
+
+
+class TravellerInformationCache:
+    """
+        Per-session cache of accepted traveller information elicitations.
+
+        Entries are keyed by the session object and held weakly, so they are
+        dropped together with the session. Each entry expires after `ttl`
+        seconds and can be removed early with `invalidate`.
+
+    Attributes:
+        ttl (float): How long, in seconds, an entry stays valid.
+        clock (Callable[[], float]): Monotonic clock used to expire entries.
+    """
+    def __init__(self, ttl: float = 1800.0, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: weakref.WeakKeyDictionary[Any, tuple[TravellerInformation, float]] = weakref.WeakKeyDictionary()
+        self._metrics = TravellerCacheMetrics()
+        self._lock = threading.Lock()
+
+    def get(self, session: Any) -> TravellerInformation | None:
+        """
+        Retrieve the cached traveller information for a session.
+
+        Args:
+            session (Any): The session the information was collected in.
+
+        Returns:
+            TravellerInformation | None: The cached information, or None if
+            there is no entry or it has expired.
+        """
+        with self._lock:
+            entry = self._entries.get(session)
+            if entry is None:
+                self._metrics.misses += 1
+                return None
+
+            traveller_information, expires_at = entry
+            if self.clock() >= expires_at:
+                del self._entries[session]
+                self._metrics.expirations += 1
+                self._metrics.misses += 1
+                return None
+
+            self._metrics.hits += 1
+            return traveller_information
+
+    def put(self, session: Any, traveller_information: TravellerInformation):
+        """
+        Cache the traveller information accepted in a session.
+
+        Args:
+            session (Any): The session the information was collected in.
+            traveller_information (TravellerInformation): The accepted answers.
+        """
+        with self._lock:
+            self._entries[session] = (traveller_information, self.clock() + self.ttl)
+
+    def invalidate(self, session: Any) -> bool:
+        """
+        Remove the cached traveller information for a session.
+
+        Args:
+            session (Any): The session to forget.
+
+        Returns:
+            bool: True if an entry was removed.
+        """
+        with self._lock:
+            if self._entries.pop(session, None) is None:
+                return False
+            self._metrics.invalidations += 1
+            return True
+
+    def clear(self):
+        """Remove every cached entry."""
+        with self._lock:
+            self._metrics.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def record_elicitation(self):
+        """Count an elicitation request issued because the cache could not answer."""
+        with self._lock:
+            self._metrics.elicitations += 1
+
+    def metrics(self) -> TravellerCacheMetrics:
+        """
+        Snapshot the cache counters.
+
+        Returns:
+            TravellerCacheMetrics: Hits, misses, elicitations issued and size.
+        """
+        with self._lock:
+            return self._metrics.model_copy(update={"size": len(self._entries)})
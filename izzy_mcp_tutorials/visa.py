@@ -0,0 +1,73 @@
+from array import array
+
+from .airports import AirportRegistry
+from .columnar import StringTable
+from .models import PassportOwner
+
+# Country code of passports that are not in the index
+UNKNOWN_COUNTRY = -1
+
+
+class VisaRequirementIndex:
+    """
+        Precomputed citizenship and airport country codes for bulk visa checks.
+
+        Countries are dictionary encoded through a StringTable, so checking a
+        manifest compares small integers instead of looking up passport owners
+        and airports one pair at a time. A traveller needs a visa for an
+        international route unless they are a citizen of the destination
+        country. Passengers with the same citizenship need a visa for the same
+        routes, so `check` computes one row of results per distinct
+        citizenship and shares it between those passengers.
+
+    Attributes:
+        countries (StringTable): The country codes, indexed by code number.
+        citizenships (dict[str, int]): Passport ID to citizenship country code number.
+        airport_countries (dict[str, int]): Airport code to country code number.
+    """
+    def __init__(self, passport_owners: dict[str, PassportOwner], airports: AirportRegistry):
+        self.countries = StringTable()
+        self.airport_countries: dict[str, int] = {}
+        for code in airports:
+            self.airport_countries[code] = self.countries.encode(airports.country(code))
+        self.citizenships: dict[str, int] = {passport_id: self.countries.encode(owner.countryCitizenship)
+                                             for passport_id, owner in passport_owners.items()}
+
+    def encode_routes(self, routes: list[tuple[str, str]]) -> tuple[array, bytes]:
+        """
+        Encode routes as destination country code numbers and international flags.
+
+        Raises:
+            KeyError: If an airport is not in the index.
+        """
+        destinations = array("i", [self.airport_countries[destination] for _, destination in routes])
+        international = bytes(self.airport_countries[source] != destination_country
+                              for (source, _), destination_country in zip(routes, destinations))
+        return destinations, international
+
+    def check(self, passport_ids: list[str], routes: list[tuple[str, str]]) -> list[bytes | None]:
+        """
+        Determine which routes each passenger needs a visa for.
+
+        Args:
+            passport_ids (list[str]): The passengers' passport IDs.
+            routes (list[tuple[str, str]]): Source and destination airport of each route.
+
+        Returns:
+            list[bytes | None]: For each passenger, in order, one byte per
+                route that is 1 if a visa is required, or None if the passport
+                is unknown. Passengers with the same citizenship share a row.
+
+        Raises:
+            KeyError: If an airport is not in the index.
+        """
+        destinations, international = self.encode_routes(routes)
+        rows: dict[int, bytes | None] = {UNKNOWN_COUNTRY: None}
+        results: list[bytes | None] = []
+        for passport_id in passport_ids:
+            citizenship = self.citizenships.get(passport_id, UNKNOWN_COUNTRY)
+            if citizenship not in rows:
+                rows[citizenship] = bytes(is_international and destination != citizenship
+                                          for is_international, destination in zip(international, destinations))
+            results.append(rows[citizenship])
+        return results
@@ -1,17 +1,20 @@
+import os
 from typing import Any
 
 from mcp import ClientSession
+from mcp.client.session import ElicitationFnT
 from mcp.shared.context import RequestContext
-from mcp.types import ElicitRequestParams, ElicitResult
+from mcp.types import ElicitRequestParams, ElicitResult, Tool
 from pydantic_ai import Agent
 from pydantic_ai.mcp import MCPServerStreamableHTTP
-from pydantic_ai.messages import ModelRequest, ModelResponse
+from pydantic_ai.messages import ModelMessage
+from pydantic_ai.models import Model
 from pydantic_ai.models.openai import OpenAIChatModel, OpenAIModelName
 from rich.prompt import Prompt
 
-model_name: OpenAIModelName = 'gpt-4o-mini'
+from izzy_mcp_tutorials.history import HistoryCompactor
 
-ai_foundry_model = OpenAIChatModel(model_name=model_name, provider='azure')
+model_name: OpenAIModelName = 'gpt-4o-mini'
 
 instructions = """
 You are an AI agent named Eagle. 
@@ -58,34 +61,84 @@ async def handle_elicitation(
     else:
         return ElicitResult(action='cancel')
 
+class CachedToolsMCPServer(MCPServerStreamableHTTP):
+    """
+        Streamable HTTP MCP server whose tool list is fetched once per connection.
+
+        The agent asks for the tools before every model request. The flights
+        service does not change its tools at runtime, so the list is reused
+        until the connection is closed.
+    """
+    def __post_init__(self):
+        super().__post_init__()
+        self._cached_tools: list[Tool] | None = None
+
+    async def list_tools(self) -> list[Tool]:
+        if self._cached_tools is None:
+            self._cached_tools = await super().list_tools()
+        return self._cached_tools
+
+    async def __aexit__(self, *args: Any) -> bool | None:
+        result = await super().__aexit__(*args)
+        if not self.is_running:
+            self._cached_tools = None
+        return result
+
+def create_agent(model: Model, url: str = 'http://localhost:8000/mcp',
+                 history_compactor: HistoryCompactor | None = None,
+                 elicitation_callback: ElicitationFnT = handle_elicitation) -> Agent:
+    """
+    Create the flight search agent, connected to the Flights MCP Service.
+
+    Args:
+        model (Model): The model that answers the passenger.
+        url (str): The Flights MCP Service endpoint.
+        history_compactor (HistoryCompactor | None): Keeps the history sent to
+            the model bounded. None sends the full history.
+        elicitation_callback (ElicitationFnT): Answers the service's
+            elicitation requests, by default by asking the passenger.
+
+    Returns:
+        Agent: The agent. Enter it with `async with` to keep one MCP session
+            open across runs.
+    """
+    flight_service_definition = CachedToolsMCPServer(url=url, elicitation_callback=elicitation_callback)
+    return Agent(model, instructions=instructions, toolsets=[flight_service_definition],
+                 history_processors=[history_compactor] if history_compactor else [])
+
 async def thank_you_message():
     print("\n\nThank you for using the Flight Search Agent. Have a wonderful day\n\n")
 
 
 async def main():
-    flight_service_definition = MCPServerStreamableHTTP(url='http://localhost:8000/mcp', elicitation_callback=handle_elicitation)
-    mcp_servers: list[MCPServerStreamableHTTP] = [flight_service_definition]
+    ai_foundry_model = OpenAIChatModel(model_name=model_name, provider='azure')
+
+    # Bound the history sent to the model, FLIGHTS_CLIENT_HISTORY_TOKENS=0 sends all of it
+    max_tokens = int(os.environ.get('FLIGHTS_CLIENT_HISTORY_TOKENS', '8000'))
+    history_compactor = HistoryCompactor(max_tokens=max_tokens) if max_tokens > 0 else None
+    employee_experience_agent = create_agent(ai_foundry_model, history_compactor=history_compactor)
 
     # Keeping track of the Message history
-    message_history: list[ModelRequest | ModelResponse] = []
+    message_history: list[ModelMessage] = []
 
     # initial prompt to get started
     current_prompt = "\nHow can I help you?"
 
-    while True:
+    # One MCP session for the whole conversation
+    async with employee_experience_agent:
+        while True:
 
-        user_prompt = Prompt.ask(current_prompt)
-        employee_experience_agent = Agent(ai_foundry_model, instructions=instructions, toolsets=mcp_servers)
-        results = await employee_experience_agent.run(user_prompt, message_history=message_history)
-        print(results.output)
-        message_history = results.all_messages()
+            user_prompt = Prompt.ask(current_prompt)
+            results = await employee_experience_agent.run(user_prompt, message_history=message_history)
+            print(results.output)
+            message_history = results.all_messages()
 
-        exit_or_not = Prompt.ask("\nIs there anything else you would like me to assist you with?", choices=['y', 'n'])
+            exit_or_not = Prompt.ask("\nIs there anything else you would like me to assist you with?", choices=['y', 'n'])
 
-        if exit_or_not == 'n':
-            await thank_you_message()
-            break
-        current_prompt = "\nWhat else would you like me to help you with?"
+            if exit_or_not == 'n':
+                await thank_you_message()
+                break
+            current_prompt = "\nWhat else would you like me to help you with?"
 
 
 if __name__ == '__main__':
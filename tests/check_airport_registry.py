@@ -0,0 +1,88 @@
+import csv
+import tempfile
+from itertools import product
+from pathlib import Path
+from string import ascii_uppercase
+
+from pydantic import ValidationError
+
+from izzy_mcp_tutorials import FlightsDataAccessObject, get_airport_registry, load_airport_registry
+from izzy_mcp_tutorials.airports import DEFAULT_AIRPORTS_PATH
+from izzy_mcp_tutorials.models import FlightAvailability, FlightSearchQuery
+
+
+def write_airports(path: Path, count: int):
+    bundled = list(csv.DictReader(DEFAULT_AIRPORTS_PATH.open(encoding="utf-8")))
+    bundled_codes = {airport["code"] for airport in bundled}
+    with path.open("w", newline="", encoding="utf-8") as airports_file:
+        writer = csv.DictWriter(airports_file, fieldnames=["code", "country", "name", "served"])
+        writer.writeheader()
+        writer.writerows(bundled)
+        generated = ("".join(letters) for letters in product(ascii_uppercase, repeat=3))
+        for code in [code for code in generated if code not in bundled_codes][:count]:
+            writer.writerow({"code": code, "country": code[:2], "name": f"Airport {code}", "served": "0"})
+
+
+def main():
+    bundled = get_airport_registry()
+    assert bundled.served_airports == ["MCO", "MIA", "LAX", "ATL", "YYZ", "YVR", "YUL", "CUN", "MEX"]
+    assert FlightsDataAccessObject.airport_country("YUL") == "CA"
+
+    # Validated codes are the registry's interned strings
+    flight = FlightAvailability(id="1", sourceAirport="".join(["L", "A", "X"]), destinationAirport="YUL",
+                                departureDate="2025-01-01", sourceAirportCountry="US", destinationAirportCountry="CA")
+    assert flight.sourceAirport is bundled.airport_code("LAX")
+
+    for invalid in ({"sourceAirport": "ZZZ"}, {"sourceAirportCountry": "FR"}, {"destinationAirport": "yul"}):
+        try:
+            FlightAvailability.model_validate({**flight.model_dump(), **invalid})
+        except ValidationError:
+            pass
+        else:
+            raise AssertionError(f"{invalid} was accepted")
+
+    # The JSON schema does not grow with the registry
+    assert "enum" not in FlightSearchQuery.model_json_schema()["properties"]["sourceAirport"]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "airports.csv"
+        write_airports(path, count=5000)
+        registry = load_airport_registry(path)
+        try:
+            assert len(registry) == 5009
+            assert registry.country("BQQ") == "BQ" and registry.name("BQQ") == "Airport BQQ"
+            FlightSearchQuery(searchDate="2025-01-01", sourceAirport="BQQ", destinationAirport="YUL")
+
+            # Only served airports are scheduled
+            dao = FlightsDataAccessObject(number_of_days_from_today=1)
+            assert dao.source_airports == bundled.served_airports
+            assert dao.is_international_flight("BQQ", "YUL") and not dao.is_international_flight("LAX", "MCO")
+        finally:
+            load_airport_registry(DEFAULT_AIRPORTS_PATH)
+
+    # Citizenships stay valid with airports in other countries only
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "airports.csv"
+        path.write_text("code,country,name,served\n"
+                        "CDG,FR,Paris Charles de Gaulle,1\n"
+                        "LHR,GB,London Heathrow,1\n"
+                        "FRA,DE,Frankfurt,1\n", encoding="utf-8")
+        european = load_airport_registry(path)
+        try:
+            assert european.country_code("US") == "US" and european.country_code("FR") == "FR"
+            assert european.country_code("JP") is None
+            dao = FlightsDataAccessObject(number_of_days_from_today=1)
+            assert dao.get_passport_owner("12345").countryCitizenship == "US"
+            assert dao.source_airports == ["CDG", "LHR", "FRA"]
+            assert dao.is_international_flight("CDG", "LHR")
+            assert not dao.is_destination_citizen("12345", "CDG")
+        finally:
+            load_airport_registry(DEFAULT_AIRPORTS_PATH)
+    print(f"{len(registry)} airports: ok")
+
+
+if __name__ == "__main__":
+    main()
+
+
+#  uv run -m tests.check_airport_registry
@@ -0,0 +1,84 @@
+import asyncio
+from datetime import date, timedelta
+
+import flights_mcp_service
+from izzy_mcp_tutorials.models import FlightSearchQuery
+from tests.check_traveller_overlays import StubContext
+
+
+class CountingContext(StubContext):
+    """Counts the elicitations it answers"""
+    def __init__(self, passport_id: str):
+        super().__init__(passport_id)
+        self.elicitations = 0
+
+    async def elicit(self, message, schema):
+        self.elicitations += 1
+        return await super().elicit(message, schema)
+
+
+async def check_flight_search_batch():
+    dao = flights_mcp_service.flights_database.get()
+    today = date.today().isoformat()
+    tomorrow = (date.today() + timedelta(days=1)).isoformat()
+    queries = [
+        FlightSearchQuery(searchDate=today, sourceAirport="LAX", destinationAirport="MCO"),
+        FlightSearchQuery(searchDate=today, sourceAirport="LAX", destinationAirport="YUL"),
+        FlightSearchQuery(searchDate="1999-01-01", sourceAirport="LAX", destinationAirport="YUL"),
+        FlightSearchQuery(searchDate=today, endDate=tomorrow, sourceAirport="YYZ", destinationAirport="CUN"),
+        FlightSearchQuery(searchDate=today, sourceAirport="LAX", destinationAirport="MCO"),
+    ]
+    passport_id = dao.get_passport_ids()[0]
+
+    # One elicitation for the whole batch, misses are empty results in their place
+    ctx = CountingContext(passport_id)
+    results = await flights_mcp_service.flight_search_batch(queries, ctx=ctx)
+    assert ctx.elicitations == 1
+    assert [result.query for result in results] == queries
+    assert results[2].flights == []
+    assert results[0] == results[4]
+
+    # Each result is what the single searches return for the same traveller
+    for result in results:
+        search_dates = [today, tomorrow] if result.query.endDate else [result.query.searchDate]
+        expected = []
+        for search_date in search_dates:
+            expected += await flights_mcp_service.flight_search(search_date, result.query.sourceAirport,
+                                                                result.query.destinationAirport,
+                                                                ctx=StubContext(passport_id))
+        assert result.flights == expected, result.query
+    assert {flight.travellerId for flight in results[1].flights} == {passport_id}
+    assert {flight.travellerId for flight in results[0].flights} == {""}
+
+    # A batch of domestic queries does not ask for a passport
+    ctx = CountingContext(passport_id)
+    domestic = await flights_mcp_service.flight_search_batch([queries[0], queries[4]], ctx=ctx)
+    assert ctx.elicitations == 0 and domestic == [results[0], results[4]]
+    assert await flights_mcp_service.flight_search_batch([], ctx=ctx) == []
+    return len(queries)
+
+
+async def check_get_passport_owners():
+    dao = flights_mcp_service.flights_database.get()
+    passport_ids = dao.get_passport_ids()
+    requested = [passport_ids[0], "00000", passport_ids[-1], passport_ids[0], ""]
+    owners = await flights_mcp_service.get_passport_owners(requested)
+    assert list(owners) == [passport_ids[0], "00000", passport_ids[-1], ""]
+    assert owners[passport_ids[0]] == dao.get_passport_owner(passport_ids[0])
+    assert owners[passport_ids[-1]] == dao.get_passport_owner(passport_ids[-1])
+    assert owners["00000"] is None and owners[""] is None
+    assert await flights_mcp_service.get_passport_owners([]) == {}
+    return len(requested)
+
+
+def main():
+    queries = asyncio.run(check_flight_search_batch())
+    passport_ids = asyncio.run(check_get_passport_owners())
+    print(f"{queries} batched searches and {passport_ids} passport lookups matched the single calls")
+
+
+if __name__ == "__main__":
+    main()
+
+
+#  uv run -m tests.check_batch_tools
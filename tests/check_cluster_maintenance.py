@@ -0,0 +1,81 @@
+import asyncio
+import json
+import sqlite3
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+
+from benchmarks.service_load import start_server
+
+HOST, PORT = "127.0.0.1", 8893
+URL = f"http://{HOST}:{PORT}/mcp"
+
+
+async def domestic_search(search_date: str) -> tuple[str, list[str]]:
+    async with streamablehttp_client(URL) as (read_stream, write_stream, get_session_id):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            result = await session.call_tool("flight_search", {"search_date": search_date, "source_airport": "LAX",
+                                                               "destination_airport": "MCO"})
+            assert not result.isError, result
+            return get_session_id().split("-")[0], [flight["id"] for flight in result.structuredContent["result"]]
+
+
+async def search_every_worker(search_date: str) -> dict[str, list[str]]:
+    results = await asyncio.gather(*(domestic_search(search_date) for _ in range(4)))
+    ids_per_worker = dict(results)
+    assert sorted(ids_per_worker) == ["0", "1"], ids_per_worker
+    return ids_per_worker
+
+
+def check_cluster(directory: Path, environment: dict[str, str]) -> str:
+    search_date = date.today().isoformat()
+    feed_path = directory / "changes.jsonl"
+    feed_path.write_text("")
+    server = start_server(HOST, PORT, {"FLIGHTS_WORKERS": "2", "FLIGHTS_MAINTENANCE_INTERVAL_SECONDS": "1",
+                                       "FLIGHTS_CHANGE_FEED_PATH": str(feed_path), **environment})
+    try:
+        before = asyncio.run(search_every_worker(search_date))
+        flights = next(iter(before.values()))
+
+        # The coordinator applies the change once and every worker reloads
+        added = {"id": "999999", "sourceAirport": "LAX", "destinationAirport": "MCO", "departureDate": search_date,
+                 "sourceAirportCountry": "US", "destinationAirportCountry": "US", "airline": "Sun Country"}
+        feed_path.write_text(json.dumps({"action": "upsert", "availability": added}) + "\n")
+        deadline = time.monotonic() + 30
+        while True:
+            after = asyncio.run(search_every_worker(search_date))
+            if all(ids == flights + ["999999"] for ids in after.values()):
+                break
+            assert time.monotonic() < deadline, after
+            time.sleep(0.5)
+    finally:
+        server.terminate()
+        server.wait()
+    return f"{len(flights)} flights on every worker, then the change on every worker"
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        print("snapshot:", check_cluster(directory, {}))
+
+        sqlite_path = directory / "flights.sqlite3"
+        print("sqlite:", check_cluster(directory, {"FLIGHTS_STORAGE_BACKEND": "sqlite",
+                                                   "FLIGHTS_SQLITE_PATH": str(sqlite_path)}))
+        # Built and changed once, not once per worker
+        with sqlite3.connect(sqlite_path) as connection:
+            (rows,) = connection.execute("SELECT COUNT(*) FROM flight_availability").fetchone()
+            (dates,) = connection.execute("SELECT COUNT(DISTINCT departureDate) FROM flight_availability").fetchone()
+        assert rows == dates * 360 + 1, (rows, dates)
+
+
+if __name__ == "__main__":
+    main()
+
+
+#  uv run -m tests.check_cluster_maintenance
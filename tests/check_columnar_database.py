@@ -0,0 +1,61 @@
+from itertools import product
+
+from izzy_mcp_tutorials import ColumnarFlightDatabase, FlightDatabase, FlightsDataAccessObject
+
+
+def check_same_answers(columnar: ColumnarFlightDatabase, reference: FlightDatabase, step: str) -> int:
+    """Ask both databases every query and check the answers are identical, order included."""
+    queries = 0
+    dates = reference.get_available_dates()
+    assert columnar.get_available_dates() == dates, step
+    airports = sorted({flight.sourceAirport for departure_date in dates
+                       for flight in reference.get_availability(departure_date)}) + ["XXX"]
+    for departure_date in dates + ["1999-01-01"]:
+        assert columnar.get_availability(departure_date) == reference.get_availability(departure_date), step
+        for source_airport in airports:
+            assert columnar.get_source_availability(source_airport, departure_date) == \
+                   reference.get_source_availability(source_airport, departure_date), step
+        for source_airport, destination_airport in product(airports, airports):
+            assert columnar.get_route_availability(departure_date, source_airport, destination_airport) == \
+                   reference.get_route_availability(departure_date, source_airport, destination_airport), step
+        queries += 1 + len(airports) + len(airports) ** 2
+    for airline in list(reference._airline_index) + ["No Such Airline"]:
+        assert columnar.get_airline_availability(airline) == reference.get_airline_availability(airline), step
+        queries += 1
+    return queries
+
+
+def main():
+    generated = FlightsDataAccessObject(number_of_days_from_today=3).database
+    dates = generated.get_available_dates()
+    reference = FlightDatabase(records={})
+    columnar = ColumnarFlightDatabase()
+    for departure_date in dates:
+        reference.add_flight_availabilities(departure_date, generated.get_availability(departure_date))
+        columnar.add_flight_availabilities(departure_date, generated.get_availability(departure_date))
+    assert len(columnar) == sum(len(reference.get_availability(departure_date)) for departure_date in dates)
+    queries = check_same_answers(columnar, reference, "populated")
+
+    # The same changes leave both answering the same way
+    flight = generated.get_availability(dates[1])[7]
+    removed = generated.get_availability(dates[2])[12]
+    for database in (reference, columnar):
+        database.add_flight_availability(dates[1], flight.model_copy(update={"airline": "Sun Country",
+                                                                             "travellerId": "12345",
+                                                                             "visaRequired": True}))
+        database.add_flight_availabilities("2030-01-01", [flight.model_copy(update={"departureDate": "2030-01-01"})])
+        assert database.remove_flight_availability(dates[1], flight.sourceAirport, flight.destinationAirport,
+                                                   "no such id") == 0
+        assert database.remove_flight_availability(dates[2], removed.sourceAirport, removed.destinationAirport,
+                                                   removed.id) == 1
+        assert database.remove_date(dates[0]) == 360
+        assert database.remove_date(dates[0]) == 0
+    queries += check_same_answers(columnar, reference, "changed")
+    print(f"{queries} queries answered the same by both databases")
+
+
+if __name__ == "__main__":
+    main()
+
+
+#  uv run -m tests.check_columnar_database
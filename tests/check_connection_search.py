@@ -0,0 +1,130 @@
+from datetime import date, timedelta
+
+from izzy_mcp_tutorials import FlightsDataAccessObject, get_airport_registry
+from izzy_mcp_tutorials.models import FlightAvailability, FlightDatabase, Itinerary
+from izzy_mcp_tutorials.route_graph import RouteGraph
+
+DAY_1, DAY_2, DAY_3, DAY_4, DAY_5 = "2026-05-01", "2026-05-02", "2026-05-03", "2026-05-04", "2026-05-05"
+
+# Legs of a small schedule, (source, destination, departure date)
+SCHEDULE = [
+    ("LAX", "MCO", DAY_3),  # direct, but late
+    ("LAX", "ATL", DAY_1), ("ATL", "MCO", DAY_2),  # two legs, arriving early
+    ("LAX", "MIA", DAY_2), ("MIA", "MCO", DAY_1),  # the connection leaves before the first leg
+    ("LAX", "YYZ", DAY_1), ("YYZ", "MCO", DAY_5),  # the connection leaves after the end date
+    ("ATL", "LAX", DAY_1),  # only leads back to the source
+    ("MIA", "YUL", DAY_2), ("YUL", "MCO", DAY_2),  # three legs
+    ("ATL", "MIA", DAY_2),  # four legs
+]
+
+
+def rank(itinerary: Itinerary) -> tuple[int, str, str]:
+    return itinerary.numberOfLegs, itinerary.arrivalDate, itinerary.departureDate
+
+
+def route(itinerary: Itinerary) -> list[tuple[str, str, str]]:
+    return [(leg.sourceAirport, leg.destinationAirport, leg.departureDate) for leg in itinerary.legs]
+
+
+def all_itineraries(routes: dict[str, dict[str, list[str]]], start_date: str, end_date: str, source_airport: str,
+                    destination_airport: str, max_legs: int) -> list[list[tuple[str, str, str]]]:
+    """Every valid itinerary, found by trying each path."""
+    itineraries = []
+
+    def extend(legs: list[tuple[str, str, str]]):
+        airport = legs[-1][1] if legs else source_airport
+        if airport == destination_airport:
+            itineraries.append(legs)
+            return
+        if len(legs) == max_legs:
+            return
+        visited = {source_airport, *(leg[1] for leg in legs)}
+        earliest_date = legs[-1][2] if legs else start_date
+        for next_airport, dates in routes.get(airport, {}).items():
+            if next_airport in visited:
+                continue
+            for departure_date in dates:
+                if earliest_date <= departure_date <= end_date:
+                    extend(legs + [(airport, next_airport, departure_date)])
+
+    extend([])
+    return itineraries
+
+
+def check_itinerary(itinerary: Itinerary, start_date: str, end_date: str, source_airport: str,
+                    destination_airport: str, max_legs: int):
+    legs = route(itinerary)
+    assert 1 <= itinerary.numberOfLegs == len(legs) <= max_legs, legs
+    assert legs[0][0] == source_airport and legs[-1][1] == destination_airport, legs
+    assert all(previous[1] == leg[0] and previous[2] <= leg[2] for previous, leg in zip(legs, legs[1:])), legs
+    assert all(start_date <= leg[2] <= end_date for leg in legs), legs
+    airports = [source_airport] + [leg[1] for leg in legs]
+    assert len(set(airports)) == len(airports), legs
+    assert (itinerary.departureDate, itinerary.arrivalDate) == (legs[0][2], legs[-1][2]), legs
+    assert all(leg.flights for leg in itinerary.legs), legs
+
+
+def check_small_schedule():
+    database = FlightDatabase(records={})
+    airports = get_airport_registry()
+    for number, (source, destination, departure_date) in enumerate(SCHEDULE):
+        database.add_flight_availability(departure_date=departure_date, availability=FlightAvailability(
+            id=str(number), sourceAirport=source, destinationAirport=destination, departureDate=departure_date,
+            sourceAirportCountry=airports.country(source), destinationAirportCountry=airports.country(destination)))
+    graph = RouteGraph(database)
+
+    # Fewest legs first, then earliest arrival; invalid connections and revisits are never returned
+    itineraries = graph.search(DAY_1, DAY_4, "LAX", "MCO", max_legs=4, max_results=10)
+    assert [route(itinerary) for itinerary in itineraries] == [
+        [("LAX", "MCO", DAY_3)],
+        [("LAX", "ATL", DAY_1), ("ATL", "MCO", DAY_2)],
+        [("LAX", "MIA", DAY_2), ("MIA", "YUL", DAY_2), ("YUL", "MCO", DAY_2)],
+        [("LAX", "ATL", DAY_1), ("ATL", "MIA", DAY_2), ("MIA", "YUL", DAY_2), ("YUL", "MCO", DAY_2)],
+    ], itineraries
+
+    # The limits on legs and results
+    assert [route(itinerary) for itinerary in graph.search(DAY_1, DAY_4, "LAX", "MCO", max_legs=1)] == \
+           [[("LAX", "MCO", DAY_3)]]
+    assert len(graph.search(DAY_1, DAY_4, "LAX", "MCO", max_legs=2)) == 2
+    assert graph.search(DAY_1, DAY_4, "LAX", "MCO", max_legs=4, max_results=2) == itineraries[:2]
+
+    # The date window applies to every leg
+    assert [route(itinerary) for itinerary in graph.search(DAY_2, DAY_4, "LAX", "MCO", max_legs=4)] == \
+           [[("LAX", "MCO", DAY_3)], [("LAX", "MIA", DAY_2), ("MIA", "YUL", DAY_2), ("YUL", "MCO", DAY_2)]]
+    assert graph.search(DAY_1, DAY_2, "LAX", "MCO", max_legs=1) == []
+    assert len(graph.search(DAY_1, DAY_5, "LAX", "MCO", max_legs=2)) == 3
+
+    # Nothing to search
+    assert graph.search(DAY_1, DAY_4, "LAX", "LAX") == []
+    assert graph.search(DAY_1, DAY_4, "MCO", "LAX") == []
+    assert graph.hops_to("MCO") == {"MCO": 0, "LAX": 1, "ATL": 1, "MIA": 1, "YYZ": 1, "YUL": 1}
+
+
+def check_generated_schedule():
+    dao = FlightsDataAccessObject(number_of_days_from_today=3)
+    start_date = date.today().isoformat()
+    end_date = (date.today() + timedelta(days=2)).isoformat()
+    for max_legs, max_results in [(1, 10), (2, 10), (3, 25), (3, 1000)]:
+        itineraries = dao.search_connections(start_date, end_date, "LAX", "YUL", max_legs=max_legs,
+                                             max_results=max_results)
+        expected = all_itineraries(dao.route_graph.routes, start_date, end_date, "LAX", "YUL", max_legs)
+        expected_ranks = sorted((len(legs), legs[-1][2], legs[0][2]) for legs in expected)
+
+        # The best itineraries in rank order, each one valid and distinct
+        assert [rank(itinerary) for itinerary in itineraries] == expected_ranks[:max_results], max_legs
+        for itinerary in itineraries:
+            check_itinerary(itinerary, start_date, end_date, "LAX", "YUL", max_legs)
+        assert len({tuple(route(itinerary)) for itinerary in itineraries}) == len(itineraries)
+    print(f"{len(expected)} itineraries of up to 3 legs ranked like an exhaustive search")
+
+
+def main():
+    check_small_schedule()
+    check_generated_schedule()
+
+
+if __name__ == "__main__":
+    main()
+
+
+#  uv run -m tests.check_connection_search
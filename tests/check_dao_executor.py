@@ -0,0 +1,56 @@
+import asyncio
+import time
+
+from izzy_mcp_tutorials import DaoExecutor, ExecutorOverloadedError
+
+
+async def outcome(executor: DaoExecutor, seconds: float) -> str:
+    try:
+        await executor.run(time.sleep, seconds)
+    except TimeoutError:
+        return "timeout"
+    except ExecutorOverloadedError:
+        return "rejected"
+    return "ok"
+
+
+async def check_timeouts_keep_their_slot():
+    executor = DaoExecutor("thread", max_workers=1, max_queue_depth=2, timeout=0.2)
+
+    # The first call times out while still running, the queued ones while waiting for its slot
+    assert await asyncio.gather(*(outcome(executor, 0.6) for _ in range(3))) == ["timeout"] * 3
+    stats = executor.stats()
+    assert (stats.running, stats.queueDepth, stats.completed, stats.timedOut) == (1, 0, 0, 3), stats
+
+    # The worker is still busy, so the queue limit holds and nothing piles up in the pool
+    assert sorted(await asyncio.gather(*(outcome(executor, 0.6) for _ in range(3)))) == ["rejected", "timeout", "timeout"]
+    assert executor._executor._work_queue.qsize() == 0
+
+    # Once the timed out call finishes its slot is free again
+    await asyncio.sleep(0.4)
+    stats = executor.stats()
+    assert (stats.running, stats.completed, stats.rejected, stats.timedOut) == (0, 1, 1, 5), stats
+    assert await outcome(executor, 0.01) == "ok"
+    executor.shutdown()
+
+
+async def check_limits():
+    executor = DaoExecutor("thread", max_workers=2, max_queue_depth=1, timeout=5.0)
+    results = await asyncio.gather(*(outcome(executor, 0.1) for _ in range(4)))
+    assert sorted(results) == ["ok", "ok", "ok", "rejected"], results
+    stats = executor.stats()
+    assert (stats.running, stats.queueDepth, stats.completed, stats.rejected) == (0, 0, 3, 1), stats
+    executor.shutdown()
+
+
+def main():
+    asyncio.run(check_timeouts_keep_their_slot())
+    asyncio.run(check_limits())
+    print("Timed out calls kept their worker slot until they finished")
+
+
+if __name__ == "__main__":
+    main()
+
+
+#  uv run -m tests.check_dao_executor
@@ -0,0 +1,67 @@
+from izzy_mcp_tutorials import FlightDatabase, FlightsDataAccessObject
+
+
+def scanned_indexes(database: FlightDatabase) -> tuple[dict, dict, dict]:
+    """The route, source and airline indexes, rebuilt by scanning every record."""
+    routes, sources, airlines = {}, {}, {}
+    for departure_date, availabilities in database.records.items():
+        for availability in availabilities:
+            routes.setdefault((departure_date, availability.sourceAirport, availability.destinationAirport),
+                              []).append(availability)
+            sources.setdefault((availability.sourceAirport, departure_date), []).append(availability)
+            airlines.setdefault(availability.airline, []).append(availability)
+    return routes, sources, airlines
+
+
+def check_indexes(database: FlightDatabase, step: str):
+    routes, sources, airlines = scanned_indexes(database)
+    assert database._route_index == routes, step
+    assert database._source_index == sources, step
+    # Airline lists span dates, so only their contents are compared
+    assert {airline: sorted(map(id, flights)) for airline, flights in database._airline_index.items()} == \
+           {airline: sorted(map(id, flights)) for airline, flights in airlines.items()}, step
+    assert all(database.records.values()), step
+
+
+def main():
+    generated = FlightsDataAccessObject(number_of_days_from_today=3).database
+    dates = generated.get_available_dates()
+
+    # Indexes are built from records passed to the constructor
+    database = FlightDatabase(records={departure_date: list(generated.get_availability(departure_date))
+                                       for departure_date in dates})
+    check_indexes(database, "constructed")
+
+    # Adding a new date and a second flight with the same id on an existing route
+    extra = generated.get_availability(dates[0])[0].model_copy(update={"airline": "Sun Country"})
+    database.add_flight_availabilities(dates[0], [extra])
+    database.add_flight_availabilities("2030-01-01", [flight.model_copy(update={"departureDate": "2030-01-01"})
+                                                     for flight in generated.get_availability(dates[1])[:20]])
+    check_indexes(database, "added")
+    assert database.get_airline_availability("Sun Country") == [extra]
+    assert len(database.get_route_availability(dates[0], extra.sourceAirport, extra.destinationAirport)) == 6
+
+    # Removing one id removes every flight with it on that route, and nothing else
+    removed = database.remove_flight_availability(dates[0], extra.sourceAirport, extra.destinationAirport, extra.id)
+    assert removed == 2, removed
+    check_indexes(database, "removed flight")
+    assert database.get_airline_availability("Sun Country") == []
+    assert "Sun Country" not in database._airline_index
+
+    # Removing whole dates, including one emptied flight by flight
+    assert database.remove_date(dates[1]) == 360
+    for flight in list(database.get_availability("2030-01-01")):
+        database.remove_flight_availability("2030-01-01", flight.sourceAirport, flight.destinationAirport, flight.id)
+    assert database.get_available_dates() == [dates[0], dates[2]]
+    assert database.remove_date(dates[1]) == 0
+    check_indexes(database, "removed dates")
+    assert all(key[0] != dates[1] for key in database._route_index)
+    print(f"{len(database._route_index)} route, {len(database._source_index)} departure and "
+          f"{len(database._airline_index)} airline index entries in step with the records")
+
+
+if __name__ == "__main__":
+    main()
+
+
+#  uv run -m tests.check_flight_indexes
@@ -0,0 +1,55 @@
+import asyncio
+
+from pydantic_ai.messages import (ModelRequest, ModelResponse, TextPart, ToolCallPart, ToolReturnPart,
+                                  UserPromptPart)
+
+from izzy_mcp_tutorials.history import HistoryCompactor, estimate_tokens, split_turns
+
+
+def conversation(turns: int) -> list:
+    messages = []
+    for turn in range(turns):
+        messages += [
+            ModelRequest(parts=[UserPromptPart(f"Find me flights ({turn})")]),
+            ModelResponse(parts=[ToolCallPart("flight_search", {"source_airport": "LAX"}, tool_call_id=f"call-{turn}")]),
+            ModelRequest(parts=[ToolReturnPart("flight_search",
+                                               [{"id": str(n), "airline": "Delta Airlines"} for n in range(50)],
+                                               tool_call_id=f"call-{turn}")]),
+            ModelResponse(parts=[TextPart(f"Here are the flights ({turn})")]),
+        ]
+    return messages
+
+
+def tool_results(messages: list) -> list:
+    return [part.content for message in messages for part in message.parts if isinstance(part, ToolReturnPart)]
+
+
+def main():
+    messages = conversation(10)
+    assert [len(turn) for turn in split_turns(messages)] == [4] * 10
+
+    # Only the most recent turns keep their tool results, the calls are still answered
+    compacted = asyncio.run(HistoryCompactor(max_tokens=None, keep_tool_results_turns=2)(messages))
+    assert len(compacted) == len(messages)
+    results = tool_results(compacted)
+    assert results[:8] == ["[Result of flight_search omitted from the history]"] * 8
+    assert results[8:] == tool_results(messages)[8:]
+    assert estimate_tokens(compacted) < estimate_tokens(messages)
+
+    # Whole turns are dropped, oldest first, until the history fits
+    budget = estimate_tokens(compacted) // 2
+    bounded = asyncio.run(HistoryCompactor(max_tokens=budget, keep_tool_results_turns=2)(messages))
+    assert estimate_tokens(bounded) <= budget
+    assert bounded == compacted[-len(bounded):]
+    assert isinstance(bounded[0].parts[0], UserPromptPart)
+
+    # The current turn is kept even if it does not fit
+    assert asyncio.run(HistoryCompactor(max_tokens=1)(messages)) == messages[-4:]
+    print(f"{estimate_tokens(messages)} estimated tokens compacted to {estimate_tokens(bounded)}")
+
+
+if __name__ == "__main__":
+    main()
+
+
+#  uv run -m tests.check_history_compaction
@@ -0,0 +1,258 @@
+import asyncio
+import json
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+import anyio
+from mcp import ClientSession
+from mcp.shared.memory import create_client_server_memory_streams
+from mcp.types import ResourceUpdatedNotification, ServerNotification
+from pydantic import AnyUrl
+
+import flights_mcp_service
+from izzy_mcp_tutorials import (FlightsDataAccessObject, SharedFlightsDatabase, FlightDataMaintainer, JsonLinesChangeFeed,
+                                MaintenanceReport, create_flight_store, write_snapshot)
+from tests.check_storage_backends import sort_key
+from tests.check_traveller_overlays import StubContext
+
+
+def all_flights(dao: FlightsDataAccessObject):
+    # Ids depend on the window a day was generated in, so records are compared without them
+    return {available_date: [flight.model_dump(exclude={"id"})
+                             for flight in sorted(dao.get_availability(available_date), key=sort_key)]
+            for available_date in dao.get_available_dates()}
+
+
+def check_roll_window(backend: str):
+    today = date.today()
+    tomorrow = today + timedelta(days=2)
+
+    rolled = FlightsDataAccessObject(database=create_flight_store(backend))
+    rolled.search_connections(today.isoformat(), tomorrow.isoformat(), "LAX", "YUL")
+    added, evicted = rolled.roll_window(today=tomorrow)
+    assert evicted == [today.isoformat(), (today + timedelta(days=1)).isoformat()], backend
+    assert added == [(today + timedelta(days=8)).isoformat(), (today + timedelta(days=9)).isoformat()], backend
+    assert rolled.roll_window(today=tomorrow) == ([], []), backend
+
+    # Rolling an empty store generates the whole window, the same as rolling an existing one
+    built = FlightsDataAccessObject(database=create_flight_store(backend), populate=False)
+    built.roll_window(today=tomorrow)
+    assert all_flights(rolled) == all_flights(built), backend
+    assert rolled.get_departures("LAX", today.isoformat()) == [], backend
+    assert all(flight.departureDate >= tomorrow.isoformat() for flight in rolled.get_airline_flights("Air Canada")), backend
+
+    # The route graph is rebuilt from the rolled window
+    end_date = (tomorrow + timedelta(days=9)).isoformat()
+    itineraries = rolled.search_connections(tomorrow.isoformat(), end_date, "LAX", "YUL", max_results=50)
+    assert max(itinerary.arrivalDate for itinerary in itineraries) == (today + timedelta(days=9)).isoformat(), backend
+    print(f"{backend}: rolled")
+
+
+def check_failed_day(directory: Path):
+    today = date.today()
+    tomorrow = today + timedelta(days=1)
+    new_date = (today + timedelta(days=8)).isoformat()
+    store = create_flight_store("sqlite", sqlite_path=directory / "flights.sqlite3")
+    shared_database = SharedFlightsDatabase(factory=lambda: FlightsDataAccessObject(database=store))
+    assert shared_database.get().supports_updates
+    assert not FlightsDataAccessObject(database=create_flight_store("sqlite"), populate=False).supports_updates
+
+    # Fail half way through writing the new day
+    with store.pool.connection() as connection:
+        connection.execute(f"CREATE TRIGGER fail_insert BEFORE INSERT ON flight_availability "
+                           f"WHEN NEW.departureDate = '{new_date}' AND NEW.sourceAirport = 'MIA' "
+                           f"BEGIN SELECT RAISE(ABORT, 'injected failure'); END")
+    generation = shared_database.generation
+    try:
+        shared_database.update(lambda dao: dao.roll_window(today=tomorrow))
+    except Exception:
+        pass
+    else:
+        raise AssertionError("The injected failure was not raised")
+    assert new_date not in store.get_available_dates()
+    assert shared_database.generation == generation + 1
+
+    # The day is written in full by the next pass
+    with store.pool.connection() as connection:
+        connection.execute("DROP TRIGGER fail_insert")
+    added, evicted = shared_database.update(lambda dao: dao.roll_window(today=tomorrow))
+    assert added == [new_date] and evicted == []
+    assert len(store.get_availability(new_date)) == len(store.get_availability(tomorrow.isoformat()))
+    store.close()
+    print("failed day: rolled back and written again")
+
+
+def change(action: str, flight, **update) -> str:
+    return json.dumps({"action": action, "availability": flight.model_copy(update=update).model_dump()})
+
+
+def check_change_feed(directory: Path):
+    search_date = date.today().isoformat()
+    shared_database = SharedFlightsDatabase()
+    flights_mcp_service.flights_database = shared_database
+    ctx = StubContext("12345")
+
+    before = asyncio.run(flights_mcp_service.flight_search(search_date=search_date, source_airport="LAX",
+                                                           destination_airport="MCO", ctx=ctx))
+    generation = shared_database.generation
+
+    feed_path = directory / "changes.jsonl"
+    partial_change = change("delete", before[0], airline="Sun Country")
+    feed_path.write_text(change("upsert", before[0], airline="Sun Country") + "\n" +
+                         change("delete", before[1]) + "\n" +
+                         change("delete", before[2], departureDate="1999-01-01") + "\n" +
+                         partial_change[:20])
+    maintainer = FlightDataMaintainer(shared_database, feed=JsonLinesChangeFeed(feed_path))
+
+    report = maintainer.maintain()
+    assert (report.upserts, report.deletes, report.generation) == (1, 2, generation + 1)
+    assert report.changedRoutes == [(search_date, "LAX", "MCO")]
+    assert maintainer.maintain() is None and shared_database.generation == generation + 1
+
+    # The response cache drops results of the previous generation
+    after = asyncio.run(flights_mcp_service.flight_search(search_date=search_date, source_airport="LAX",
+                                                          destination_airport="MCO", ctx=ctx))
+    assert [flight.id for flight in after] == [flight.id for flight in before[2:]] + [before[0].id]
+    assert after[-1].airline == "Sun Country"
+
+    # The partial last line is applied once it is complete
+    with feed_path.open("a") as feed:
+        feed.write(partial_change[20:] + "\n")
+    report = maintainer.maintain()
+    assert (report.upserts, report.deletes) == (0, 1)
+    assert [flight.id for flight in shared_database.get().search_flights(search_date, "LAX", "MCO")] == \
+           [flight.id for flight in before[2:]]
+
+    # An invalid line is skipped on its own, the lines after it still apply
+    with feed_path.open("a") as feed:
+        feed.write("not json\n" + change("delete", before[2]) + "\n")
+    report = maintainer.maintain()
+    assert report.deletes == 1 and maintainer.feed.rejected == 1
+
+    # Changes of a pass that failed are read again by the next one
+    def failing_update(function):
+        raise RuntimeError("database is locked")
+
+    update, shared_database.update = shared_database.update, failing_update
+    with feed_path.open("a") as feed:
+        feed.write(change("delete", before[3]) + "\n")
+    try:
+        maintainer.maintain()
+    except RuntimeError:
+        pass
+    shared_database.update = update
+    report = maintainer.maintain()
+    assert report.deletes == 1
+    assert [flight.id for flight in shared_database.get().search_flights(search_date, "LAX", "MCO")] == \
+           [flight.id for flight in before[4:]]
+    print("change feed: applied")
+
+
+def check_snapshot(directory: Path):
+    snapshot_path = directory / "flights.snapshot"
+    write_snapshot(FlightsDataAccessObject().database, snapshot_path)
+    shared_database = SharedFlightsDatabase(factory=lambda: FlightsDataAccessObject.from_snapshot(snapshot_path))
+    assert not shared_database.get().supports_updates
+
+    # The feed cannot be applied to a snapshot, so it is left for a store that can take it
+    feed = JsonLinesChangeFeed(directory / "changes.jsonl")
+    pending = feed.read()
+    assert FlightDataMaintainer(shared_database, feed=feed).maintain() is None
+    assert pending and feed.read() == pending
+
+    # A stale snapshot is not reloaded, mapping the same file again would change nothing
+    generation = shared_database.generation
+    shared_database.max_age = timedelta(0)
+    assert shared_database.is_stale()
+    assert FlightDataMaintainer(shared_database).maintain() is None
+    assert shared_database.generation == generation
+
+    # Until a new snapshot is written and reloaded
+    tomorrow = date.today() + timedelta(days=1)
+    rolled = FlightsDataAccessObject()
+    rolled.roll_window(today=tomorrow)
+    write_snapshot(rolled.database, snapshot_path)
+    report = asyncio.run(FlightDataMaintainer(shared_database).reload())
+    assert report.fullRebuild and report.generation == generation + 1
+    assert shared_database.get().get_available_dates()[0] == tomorrow.isoformat()
+    print("snapshot: frozen until a new one is written")
+
+
+async def receive_notifications(directory: Path) -> tuple[list[str], list[str]]:
+    """Subscribe over a connected client session, then collect the notifications of two maintenance passes."""
+    search_date = date.today().isoformat()
+    updated: list[str] = []
+
+    async def message_handler(message):
+        if isinstance(message, ServerNotification) and isinstance(message.root, ResourceUpdatedNotification):
+            updated.append(str(message.root.params.uri))
+
+    async def maintenance_pass(maintainer: FlightDataMaintainer, expected: int):
+        report = await asyncio.to_thread(maintainer.maintain)
+        await maintainer.on_change(report)
+        for _ in range(100):
+            if len(updated) >= expected:
+                break
+            await asyncio.sleep(0.01)
+        # Long enough for unexpected notifications to arrive too
+        await asyncio.sleep(0.1)
+
+    shared_database = flights_mcp_service.flights_database
+    flight = shared_database.get().search_flights(search_date, "LAX", "MCO")[0]
+    feed_path = directory / "notified-changes.jsonl"
+    maintainer = FlightDataMaintainer(shared_database, feed=JsonLinesChangeFeed(feed_path),
+                                      on_change=flights_mcp_service.notify_resource_changes)
+
+    server = flights_mcp_service.mcp._mcp_server
+    async with (create_client_server_memory_streams() as ((client_read, client_write), (server_read, server_write)),
+                anyio.create_task_group() as task_group):
+        task_group.start_soon(server.run, server_read, server_write, server.create_initialization_options())
+        async with ClientSession(client_read, client_write, message_handler=message_handler) as session:
+            initialized = await session.initialize()
+            assert initialized.capabilities.resources.subscribe, initialized.capabilities
+
+            for uri in ("flights://available-dates", "flights://database/status", "passport://passport-owner/12345",
+                        f"flights://availability/{search_date}/LAX/MCO", f"flights://availability/{search_date}/LAX/YUL"):
+                await session.subscribe_resource(AnyUrl(uri))
+
+            # Only the resources the change affects are notified
+            feed_path.write_text(change("upsert", flight, airline="Sun Country") + "\n")
+            await maintenance_pass(maintainer, expected=2)
+            first_pass = sorted(updated)
+
+            # Unsubscribed resources are no longer notified
+            updated.clear()
+            await session.unsubscribe_resource(AnyUrl(f"flights://availability/{search_date}/LAX/MCO"))
+            with feed_path.open("a") as feed:
+                feed.write(change("delete", flight, airline="Sun Country") + "\n")
+            await maintenance_pass(maintainer, expected=1)
+            second_pass = sorted(updated)
+        task_group.cancel_scope.cancel()
+    return first_pass, second_pass
+
+
+def check_notifications(directory: Path):
+    search_date = date.today().isoformat()
+    first_pass, second_pass = asyncio.run(receive_notifications(directory))
+    assert first_pass == [f"flights://availability/{search_date}/LAX/MCO", "flights://database/status"], first_pass
+    assert second_pass == ["flights://database/status"], second_pass
+    print("notifications: sent to subscribed sessions")
+
+
+def main():
+    for backend in ("memory", "columnar", "sqlite"):
+        check_roll_window(backend)
+
+    with tempfile.TemporaryDirectory() as directory:
+        check_failed_day(Path(directory))
+        check_change_feed(Path(directory))
+        check_snapshot(Path(directory))
+        check_notifications(Path(directory))
+
+
+if __name__ == "__main__":
+    main()
+
+
+#  uv run -m tests.check_incremental_refresh
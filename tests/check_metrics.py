@@ -0,0 +1,103 @@
+import asyncio
+import os
+import re
+
+# Instrumentation is decided when the service module is imported
+os.environ["FLIGHTS_METRICS_ENABLED"] = "1"
+
+import flights_mcp_service
+from izzy_mcp_tutorials import MetricsRegistry
+
+SAMPLE = re.compile(r'^[a-z_]+\{[a-z]+="[^"]+"(,le="[^"]+")?\} [0-9.e+-]+$')
+
+
+def parse_samples(text: str) -> dict[str, float]:
+    """Check every line is a TYPE comment or a sample, and return the samples."""
+    samples = {}
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            assert line.split()[-1] in ("counter", "gauge", "histogram"), line
+            continue
+        assert SAMPLE.match(line), line
+        name, value = line.rsplit(" ", 1)
+        samples[name] = float(value)
+    return samples
+
+
+async def check_registry():
+    registry = MetricsRegistry(enabled=True, buckets=(0.01, 0.1))
+
+    @registry.instrument("tool")
+    async def search(fail: bool = False):
+        """Searches"""
+        await asyncio.sleep(0.02)
+        if fail:
+            raise ValueError("no flights")
+        return "flights"
+
+    @registry.instrument("resource", name="dates")
+    async def get_dates():
+        return []
+
+    assert search.__name__ == "search" and search.__doc__ == "Searches"
+    assert await search() == "flights" and await get_dates() == []
+    try:
+        await search(fail=True)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("the handler error was swallowed")
+    with registry.timer("dao.search"):
+        pass
+
+    metrics = registry.snapshot()
+    assert metrics.enabled and set(metrics.handlers) == {"tool:search", "resource:dates"}
+    search_metrics = metrics.handlers["tool:search"]
+    assert (search_metrics.calls, search_metrics.errors) == (2, 1)
+    assert search_metrics.buckets == {"0.01": 0, "0.1": 2, "+Inf": 2}, search_metrics.buckets
+    assert 0.04 <= search_metrics.totalSeconds < 0.2
+    assert metrics.operations["dao.search"].buckets["0.01"] == 1
+
+    samples = parse_samples(registry.prometheus_text())
+    assert samples['flights_mcp_handler_calls_total{handler="tool:search"}'] == 2
+    assert samples['flights_mcp_handler_errors_total{handler="tool:search"}'] == 1
+    assert samples['flights_mcp_handler_errors_total{handler="resource:dates"}'] == 0
+    assert samples['flights_mcp_handler_duration_seconds_bucket{handler="tool:search",le="0.01"}'] == 0
+    assert samples['flights_mcp_handler_duration_seconds_bucket{handler="tool:search",le="+Inf"}'] == 2
+    assert samples['flights_mcp_handler_duration_seconds_count{handler="tool:search"}'] == 2
+    assert samples['flights_mcp_operation_calls_total{operation="dao.search"}'] == 1
+
+    # Disabled, handlers are left as they are and nothing is recorded
+    disabled = MetricsRegistry()
+    assert disabled.instrument("tool")(get_dates) is get_dates
+    with disabled.timer("dao.search"):
+        pass
+    assert disabled.snapshot().handlers == {} and disabled.snapshot().operations == {}
+
+
+async def check_service():
+    await flights_mcp_service.mcp.call_tool("get_available_dates", {})
+    await flights_mcp_service.mcp.call_tool("get_passport_owners", {"passport_ids": ["00000"]})
+    await flights_mcp_service.mcp.read_resource("metrics://server")
+
+    response = await flights_mcp_service.prometheus_metrics(None)
+    assert response.media_type.startswith("text/plain")
+    samples = parse_samples(response.body.decode())
+    assert samples['flights_mcp_handler_calls_total{handler="tool:get_available_dates"}'] == 1
+    assert samples['flights_mcp_handler_calls_total{handler="tool:get_passport_owners"}'] == 1
+    assert samples['flights_mcp_handler_calls_total{handler="resource:get_server_metrics"}'] == 1
+    assert samples['flights_mcp_operation_calls_total{operation="dao.construct"}'] == 1
+    return len(samples)
+
+
+def main():
+    asyncio.run(check_registry())
+    samples = asyncio.run(check_service())
+    print(f"Handlers instrumented, {samples} samples served at /metrics")
+
+
+if __name__ == "__main__":
+    main()
+
+
+#  uv run -m tests.check_metrics
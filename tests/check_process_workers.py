@@ -0,0 +1,68 @@
+import asyncio
+import json
+import os
+from datetime import date, timedelta
+
+# The service reads its executor configuration when it is imported
+os.environ["FLIGHTS_EXECUTOR"] = "process"
+os.environ["FLIGHTS_EXECUTOR_WORKERS"] = "2"
+
+import flights_mcp_service
+from izzy_mcp_tutorials.models import FlightAvailabilityChange
+
+flights_database = flights_mcp_service.flights_database
+
+
+async def flight_ids(search_date: str) -> list[str]:
+    flights = await flights_mcp_service.flight_search(search_date, "LAX", "MCO", ctx=None)
+    return [flight.id for flight in flights]
+
+
+async def check_rolled_day():
+    today = date.today()
+    tomorrow = today + timedelta(days=1)
+    new_day = (today + timedelta(days=8)).isoformat()
+
+    dates = await flights_mcp_service.get_available_dates()
+    assert dates[0] == today.isoformat() and new_day not in dates
+    assert await flight_ids(today.isoformat())
+    workers = flights_mcp_service.dao_executor._executor
+
+    # The day rolls over in this process, as a maintenance pass would do it
+    added, evicted = flights_database.update(lambda dao: dao.roll_window(today=tomorrow))
+    assert (added, evicted) == ([new_day], [today.isoformat()])
+
+    # The next calls run on new workers that see the rolled window, cached or not
+    dates = await flights_mcp_service.get_available_dates()
+    assert dates[0] == tomorrow.isoformat() and dates[-1] == new_day, dates
+    assert flights_mcp_service.dao_executor._executor is not workers
+    assert await flight_ids(today.isoformat()) == []
+    assert len(await flight_ids(new_day)) == 5
+    resource = json.loads(await flights_mcp_service.get_available_dates_resource())
+    assert resource == dates
+
+    # Record level changes made in place reach the workers too
+    added = flights_database.get().search_flights(new_day, "LAX", "MCO")[0].model_copy(update={"id": "999999"})
+    flights_database.update(lambda dao: dao.apply_changes([FlightAvailabilityChange(action="upsert",
+                                                                                    availability=added)]))
+    assert (await flight_ids(new_day))[-1] == "999999"
+
+    # Without a change the workers are kept
+    workers = flights_mcp_service.dao_executor._executor
+    await flight_ids(tomorrow.isoformat())
+    assert flights_mcp_service.dao_executor._executor is workers
+
+
+def main():
+    try:
+        asyncio.run(check_rolled_day())
+    finally:
+        flights_mcp_service.dao_executor.shutdown()
+    print("Process workers serve the rolled window and in place changes")
+
+
+if __name__ == "__main__":
+    main()
+
+
+#  uv run -m tests.check_process_workers
@@ -0,0 +1,83 @@
+import asyncio
+import json
+from datetime import date
+
+import flights_mcp_service
+from izzy_mcp_tutorials import ResponseCache
+from tests.check_traveller_overlays import StubContext
+
+
+async def read_json(uri: str):
+    contents = list(await flights_mcp_service.mcp.read_resource(uri))
+    return json.loads(contents[0].content)
+
+
+def check_cache_limits():
+    cache = ResponseCache(max_bytes=64, max_entries=2)
+    cache.put("a", 1, ["x" * 10])
+    cache.put("b", 1, ["y" * 10])
+    assert cache.get("a", 1) is not None
+
+    # Least recently used entries are evicted first
+    cache.put("c", 1, ["z" * 10])
+    assert cache.get("b", 1) is None and cache.get("a", 1) is not None
+
+    # Values larger than the whole cache are encoded but not kept
+    assert cache.put("d", 1, ["w" * 100]).payload.startswith('["w')
+    assert cache.get("d", 1) is None
+
+    # Older generations never replace newer entries
+    cache.put("e", 0, ["stale"])
+    assert cache.get("e", 1) is None
+
+    # A newer generation drops every entry
+    assert cache.get("a", 2) is None
+    stats = cache.stats()
+    assert (stats.entries, stats.evictions, stats.invalidations, stats.generation) == (0, 1, 1, 2)
+
+
+def main():
+    check_cache_limits()
+
+    search_date = date.today().strftime("%Y-%m-%d")
+    flights_mcp_service.response_cache = ResponseCache()
+    cache = flights_mcp_service.response_cache
+
+    async def search(ctx: StubContext, destination_airport: str):
+        return await flights_mcp_service.flight_search(search_date=search_date, source_airport="LAX",
+                                                       destination_airport=destination_airport, ctx=ctx)
+
+    # Domestic searches are answered from the cache after the first call
+    first = asyncio.run(search(StubContext("77889"), "MCO"))
+    second = asyncio.run(search(StubContext("77889"), "MCO"))
+    assert first == second and first
+    assert (cache.stats().hits, cache.stats().misses) == (1, 1)
+
+    # International searches share the cached flights but are personalized per traveller
+    jane_doe = asyncio.run(search(StubContext("12345"), "YUL"))
+    other = asyncio.run(search(StubContext("77889"), "YUL"))
+    assert {flight.travellerId for flight in jane_doe} == {"12345"}
+    assert {flight.travellerId for flight in other} == {"77889"}
+    assert cache.stats().hits == 2
+
+    # The cached entry itself stays traveller independent
+    route = asyncio.run(read_json(f"flights://availability/{search_date}/LAX/YUL"))
+    assert all(flight["travellerId"] == "" for flight in route)
+    assert [flight["id"] for flight in route] == [flight.id for flight in jane_doe]
+
+    dates = asyncio.run(read_json("flights://available-dates"))
+    assert dates == asyncio.run(flights_mcp_service.get_available_dates())
+
+    # Rebuilding the shared data invalidates every cached response
+    flights_mcp_service.flights_database.refresh()
+    asyncio.run(search(StubContext("77889"), "MCO"))
+    stats = cache.stats()
+    assert stats.invalidations == 1 and stats.entries == 1
+    print(stats)
+
+
+if __name__ == "__main__":
+    main()
+
+
+#  uv run -m tests.check_response_cache
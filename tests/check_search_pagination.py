@@ -0,0 +1,74 @@
+import asyncio
+import json
+from datetime import date, timedelta
+
+import flights_mcp_service
+from tests.check_traveller_overlays import StubContext
+
+
+class ProgressContext(StubContext):
+    def __init__(self, passport_id: str):
+        super().__init__(passport_id)
+        self.progress: list[dict] = []
+
+    async def report_progress(self, progress, total=None, message=None):
+        self.progress.append(json.loads(message))
+
+
+def search_page(ctx: StubContext, **arguments):
+    return asyncio.run(flights_mcp_service.flight_search_page(ctx=ctx, **arguments))
+
+
+def main():
+    today = date.today()
+    route = {"search_date": today.strftime("%Y-%m-%d"), "end_date": (today + timedelta(days=7)).strftime("%Y-%m-%d"),
+             "source_airport": "LAX", "destination_airport": "YUL"}
+    dao = flights_mcp_service.flights_database.get()
+    expected = [flight for departure_date in dao.get_available_dates()
+                for flight in dao.search_flights(departure_date, "LAX", "YUL")]
+
+    # Following the cursors visits every flight once, in order
+    ctx = ProgressContext("77889")
+    pages, cursor = [], None
+    while True:
+        page = search_page(ctx, limit=15, cursor=cursor, fields=["id", "departureDate", "travellerId"], **route)
+        pages.append(page)
+        cursor = page.nextCursor
+        if cursor is None:
+            break
+    flights = [flight for page in pages for flight in page.flights]
+    assert [len(page.flights) for page in pages] == [15, 15, 10]
+    assert all(page.totalCount == len(expected) == 40 for page in pages)
+    assert [(flight["id"], flight["departureDate"]) for flight in flights] == \
+           [(flight.id, flight.departureDate) for flight in expected]
+    assert all(set(flight) == {"id", "departureDate", "travellerId"} for flight in flights)
+    assert {flight["travellerId"] for flight in flights} == {"77889"}
+
+    # Sorting applies before paging
+    first = search_page(ctx, sort_by="airline", descending=True, limit=5, **route)
+    assert [flight["airline"] for flight in first.flights] == ["United Airlines"] * 5
+    second = search_page(ctx, sort_by="airline", descending=True, limit=5, cursor=first.nextCursor, **route)
+    assert [flight["airline"] for flight in second.flights] == ["United Airlines"] * 3 + ["Delta Airlines"] * 2
+
+    # Cursors are tied to the search and the data they were issued for
+    for arguments in ({**route, "sort_by": "id"}, {**route, "destination_airport": "MCO"}):
+        try:
+            search_page(ctx, cursor=first.nextCursor, **arguments)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"A cursor was accepted for {arguments}")
+
+    # Streaming sends every chunk of the page before the result
+    ctx = ProgressContext("12345")
+    page = search_page(ctx, limit=60, stream=True, **route)
+    assert [chunk["offset"] for chunk in ctx.progress] == [0, 25]
+    assert [flight for chunk in ctx.progress for flight in chunk["flights"]] == page.flights
+    print(f"{len(pages)} pages of {pages[0].totalCount} flights")
+
+
+if __name__ == "__main__":
+    main()
+
+
+#  uv run -m tests.check_search_pagination
@@ -0,0 +1,53 @@
+import asyncio
+from datetime import date
+
+import httpx
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+
+from benchmarks.service_load import start_server, stub_elicitation_callback
+
+HOST, PORT = "127.0.0.1", 8891
+URL = f"http://{HOST}:{PORT}/mcp"
+
+
+async def international_search(search_date: str) -> str:
+    async with streamablehttp_client(URL) as (read_stream, write_stream, get_session_id):
+        async with ClientSession(read_stream, write_stream, elicitation_callback=stub_elicitation_callback) as session:
+            await session.initialize()
+            # The elicitation round trip only completes if it reaches the worker that is waiting for it
+            result = await session.call_tool("flight_search", {"search_date": search_date, "source_airport": "LAX",
+                                                               "destination_airport": "YUL"})
+            assert not result.isError, result
+            assert {flight["travellerId"] for flight in result.structuredContent["result"]} == {"77889"}
+            return get_session_id()
+
+
+async def check_router():
+    search_date = date.today().strftime("%Y-%m-%d")
+    session_ids = await asyncio.gather(*(international_search(search_date) for _ in range(4)))
+    assert sorted(session_id.split("-")[0] for session_id in session_ids) == ["0", "0", "1", "1"], session_ids
+
+    async with httpx.AsyncClient() as client:
+        for session_id in ("7-abc", "not-a-session", "0-abc"):
+            response = await client.post(URL, json={"jsonrpc": "2.0", "id": 1, "method": "ping"},
+                                         headers={"mcp-session-id": session_id,
+                                                  "accept": "application/json, text/event-stream"})
+            assert response.status_code in (400, 404), (session_id, response.status_code)
+
+
+def main():
+    server = start_server(HOST, PORT, {"FLIGHTS_WORKERS": "2"})
+    try:
+        asyncio.run(check_router())
+    finally:
+        server.terminate()
+        server.wait()
+    print("Sessions were spread over both workers and kept their affinity")
+
+
+if __name__ == "__main__":
+    main()
+
+
+#  uv run -m tests.check_session_router
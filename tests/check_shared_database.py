@@ -0,0 +1,98 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from izzy_mcp_tutorials import FlightsDataAccessObject, SharedFlightsDatabase
+
+
+class CountingFactory:
+    """Builds empty data access objects slowly, counting the builds"""
+    def __init__(self):
+        self.builds = 0
+        self._lock = threading.Lock()
+
+    def __call__(self) -> FlightsDataAccessObject:
+        time.sleep(0.05)
+        with self._lock:
+            self.builds += 1
+        return FlightsDataAccessObject(populate=False)
+
+
+def check_first_get():
+    factory = CountingFactory()
+    shared_database = SharedFlightsDatabase(factory=factory)
+    status = shared_database.status()
+    assert (status.generation, status.builtAt, status.updatedAt, status.isStale) == (0, "", "", True)
+
+    # Concurrent first calls wait for a single build
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        daos = list(executor.map(lambda _: shared_database.get(), range(8)))
+    assert factory.builds == 1 and all(dao is daos[0] for dao in daos)
+    assert shared_database.start() is daos[0] and shared_database.get_with_generation() == (daos[0], 1)
+
+    status = shared_database.status()
+    assert status.generation == 1 and not status.isStale
+    assert status.builtAt == status.updatedAt == shared_database.built_at.isoformat()
+
+
+def check_refresh_and_shutdown():
+    factory = CountingFactory()
+    shared_database = SharedFlightsDatabase(factory=factory)
+    first = shared_database.get()
+
+    # A refresh swaps in a new instance under a new generation
+    second = shared_database.refresh()
+    assert second is not first and shared_database.get() is second
+    assert shared_database.get_with_generation() == (second, 2) and factory.builds == 2
+
+    # After a shutdown the next get builds again, the generation keeps counting
+    shared_database.shutdown()
+    assert shared_database.status().builtAt == "" and shared_database.is_stale()
+    third = shared_database.get()
+    assert third is not second and shared_database.generation == 3 and factory.builds == 3
+
+
+def check_refresh_if_stale():
+    factory = CountingFactory()
+    shared_database = SharedFlightsDatabase(factory=factory, max_age=timedelta(seconds=0.2))
+    first = shared_database.refresh_if_stale()
+    assert factory.builds == 1
+
+    # Fresh data is kept
+    assert shared_database.refresh_if_stale() is first and factory.builds == 1
+
+    # Rebuilt once older than max_age
+    time.sleep(0.25)
+    assert shared_database.is_stale() and shared_database.status().isStale
+    second = shared_database.refresh_if_stale()
+    assert second is not first and factory.builds == 2 and not shared_database.is_stale()
+
+    # Rebuilt once the day changed, even without a max_age
+    shared_database.max_age = None
+    assert shared_database.refresh_if_stale() is second
+    shared_database._updated_at = datetime.now() - timedelta(days=1)
+    assert shared_database.is_stale()
+    third = shared_database.refresh_if_stale()
+    assert third is not second and factory.builds == 3 and shared_database.generation == 3
+
+    # An update in place counts as fresh data
+    shared_database._updated_at = datetime.now() - timedelta(days=1)
+    assert shared_database.update(lambda dao: "changed") == "changed"
+    assert not shared_database.is_stale() and shared_database.generation == 4 and factory.builds == 3
+    status = shared_database.status()
+    assert status.updatedAt > status.builtAt
+
+
+def main():
+    check_first_get()
+    check_refresh_and_shutdown()
+    check_refresh_if_stale()
+    print("Shared database built once, refreshed, shut down and rebuilt when stale")
+
+
+if __name__ == "__main__":
+    main()
+
+
+#  uv run -m tests.check_shared_database
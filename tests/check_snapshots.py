@@ -0,0 +1,100 @@
+import csv
+import json
+import tempfile
+from itertools import product
+from pathlib import Path
+
+from izzy_mcp_tutorials import ColumnarFlightDatabase, FlightsDataAccessObject, load_snapshot, write_snapshot
+from izzy_mcp_tutorials.models import FlightAvailability
+from izzy_mcp_tutorials.snapshots import SNAPSHOT_MAGIC, _HEADER_LENGTH, read_csv_schedule
+
+CSV_ROWS = [
+    {"id": "1001", "sourceAirport": "YUL", "destinationAirport": "CUN", "departureDate": "2026-03-02",
+     "sourceAirportCountry": "CA", "destinationAirportCountry": "MX", "airline": "Air Canadá", "visaRequired": "true"},
+    {"id": "1002", "sourceAirport": "LAX", "destinationAirport": "MCO", "departureDate": "2026-03-01",
+     "sourceAirportCountry": "US", "destinationAirportCountry": "US", "airline": "Delta Airlines"},
+    {"id": "1003", "sourceAirport": "LAX", "destinationAirport": "MCO", "departureDate": "2026-03-01",
+     "sourceAirportCountry": "US", "destinationAirportCountry": "US", "airline": "Alaska Air", "travellerId": "54321"},
+    {"id": "1004", "sourceAirport": "LAX", "destinationAirport": "YUL", "departureDate": "2026-03-02",
+     "sourceAirportCountry": "US", "destinationAirportCountry": "CA", "airline": "Delta Airlines"},
+]
+
+
+def sort_key(availability: FlightAvailability):
+    return (availability.departureDate, availability.sourceAirport, availability.destinationAirport,
+            availability.airline, availability.id)
+
+
+def same(snapshot: list[FlightAvailability], source: list[FlightAvailability]) -> bool:
+    return sorted(snapshot, key=sort_key) == sorted(source, key=sort_key)
+
+
+def check_round_trip(name: str, source, path: Path) -> ColumnarFlightDatabase:
+    """Write the source to a snapshot and check the loaded snapshot answers every query the same way."""
+    records = [record for departure_date in source.get_available_dates()
+               for record in source.get_availability(departure_date)]
+    assert write_snapshot(source, path) == len(records), name
+    snapshot = load_snapshot(path)
+    assert snapshot.read_only and len(snapshot) == len(records), name
+
+    dates = source.get_available_dates()
+    assert snapshot.get_available_dates() == sorted(dates), name
+    airports = sorted({airport for record in records for airport in (record.sourceAirport, record.destinationAirport)})
+    for departure_date in dates + ["1999-01-01"]:
+        assert same(snapshot.get_availability(departure_date), source.get_availability(departure_date)), name
+        for source_airport in airports + ["XXX"]:
+            assert same(snapshot.get_source_availability(source_airport, departure_date),
+                        source.get_source_availability(source_airport, departure_date)), name
+        for source_airport, destination_airport in product(airports, airports):
+            assert same(snapshot.get_route_availability(departure_date, source_airport, destination_airport),
+                        source.get_route_availability(departure_date, source_airport, destination_airport)), name
+    for airline in sorted({record.airline for record in records}) + ["No Such Airline"]:
+        assert same(snapshot.get_airline_availability(airline), source.get_airline_availability(airline)), name
+
+    # The header only describes the columns, the data is all in the mapped columns
+    with open(path, "rb") as snapshot_file:
+        prefix = snapshot_file.read(len(SNAPSHOT_MAGIC) + _HEADER_LENGTH.size)
+        (header_length,) = _HEADER_LENGTH.unpack(prefix[len(SNAPSHOT_MAGIC):])
+        header = json.loads(snapshot_file.read(header_length))
+    assert header_length < 4096 and set(header) == {"version", "byteorder", "rows", "columns"}, name
+
+    try:
+        snapshot.add_flight_availability(departure_date=dates[0], availability=records[0])
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError(f"{name}: snapshot accepted a write")
+    print(f"{name}: {len(records)} records round tripped, {header_length} byte header")
+    return snapshot
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+
+        generated = FlightsDataAccessObject(number_of_days_from_today=3).database
+        snapshot = check_round_trip("generated", generated, directory / "generated.snapshot")
+
+        csv_path = directory / "schedule.csv"
+        with open(csv_path, "w", newline="", encoding="utf-8") as feed:
+            writer = csv.DictWriter(feed, fieldnames=list(FlightAvailability.model_fields))
+            writer.writeheader()
+            writer.writerows(CSV_ROWS)
+        schedule = read_csv_schedule(csv_path)
+        assert [record.id for record in schedule.get_route_availability("2026-03-01", "LAX", "MCO")] == ["1002", "1003"]
+        assert schedule.get_route_availability("2026-03-02", "YUL", "CUN")[0].visaRequired is True
+        check_round_trip("csv", schedule, directory / "schedule.snapshot")
+
+        # Rewriting a snapshot that is mapped replaces the file, the mapped one keeps its data
+        expected = generated.get_availability(generated.get_available_dates()[0])
+        write_snapshot(schedule, directory / "generated.snapshot")
+        assert same(snapshot.get_availability(generated.get_available_dates()[0]), expected)
+        assert load_snapshot(directory / "generated.snapshot").get_available_dates() == ["2026-03-01", "2026-03-02"]
+        print("rewrite: mapped snapshot unaffected")
+
+
+if __name__ == "__main__":
+    main()
+
+
+#  uv run -m tests.check_snapshots
@@ -0,0 +1,61 @@
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+from izzy_mcp_tutorials import FlightsDataAccessObject, create_flight_store, write_snapshot
+from izzy_mcp_tutorials.models import FlightSearchQuery
+
+
+def sort_key(availability):
+    return availability.departureDate, availability.sourceAirport, availability.destinationAirport, availability.airline
+
+
+def check_backend(name: str, dao: FlightsDataAccessObject, reference: FlightsDataAccessObject):
+    today = date.today()
+    search_date = today.strftime("%Y-%m-%d")
+    end_date = (today + timedelta(days=2)).strftime("%Y-%m-%d")
+
+    assert dao.get_available_dates() == reference.get_available_dates(), name
+    for available_date in reference.get_available_dates():
+        assert sorted(dao.get_availability(available_date), key=sort_key) == \
+               sorted(reference.get_availability(available_date), key=sort_key), name
+
+    assert dao.search_flights(search_date, "LAX", "YUL") == reference.search_flights(search_date, "LAX", "YUL"), name
+    assert len(dao.search_flights(search_date, "LAX", "YUL")) == 5, name
+    assert dao.search_flights("1999-01-01", "LAX", "YUL") == [], name
+    assert sorted(dao.get_departures("LAX", search_date), key=sort_key) == \
+           sorted(reference.get_departures("LAX", search_date), key=sort_key), name
+    assert sorted(dao.get_airline_flights("Air Mexico"), key=sort_key) == \
+           sorted(reference.get_airline_flights("Air Mexico"), key=sort_key), name
+
+    queries = [FlightSearchQuery(searchDate=search_date, endDate=end_date, sourceAirport="LAX", destinationAirport="MCO")]
+    assert dao.search_flights_batch(queries) == reference.search_flights_batch(queries), name
+    assert dao.search_connections(search_date, end_date, "LAX", "YUL", max_legs=2, max_results=12) == \
+           reference.search_connections(search_date, end_date, "LAX", "YUL", max_legs=2, max_results=12), name
+    print(f"{name}: ok")
+
+
+def main():
+    reference = FlightsDataAccessObject()
+
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_path = Path(directory) / "flights.snapshot"
+        write_snapshot(reference.database, snapshot_path)
+
+        backends = {
+            "memory": lambda: FlightsDataAccessObject(database=create_flight_store("memory")),
+            "columnar": lambda: FlightsDataAccessObject(database=create_flight_store("columnar")),
+            "sqlite (in memory)": lambda: FlightsDataAccessObject(database=create_flight_store("sqlite")),
+            "sqlite (file)": lambda: FlightsDataAccessObject(
+                database=create_flight_store("sqlite", sqlite_path=Path(directory) / "flights.sqlite3")),
+            "snapshot": lambda: FlightsDataAccessObject.from_snapshot(snapshot_path),
+        }
+        for name, factory in backends.items():
+            check_backend(name, factory(), reference)
+
+
+if __name__ == "__main__":
+    main()
+
+
+#  uv run -m tests.check_storage_backends
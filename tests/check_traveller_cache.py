@@ -0,0 +1,92 @@
+import asyncio
+from datetime import date
+
+import flights_mcp_service
+from izzy_mcp_tutorials import TravellerInformationCache
+from tests.check_traveller_overlays import StubContext
+
+
+class CountingContext(StubContext):
+    def __init__(self, passport_id: str):
+        super().__init__(passport_id)
+        self.elicitations = 0
+
+    async def elicit(self, message, schema):
+        self.elicitations += 1
+        return await super().elicit(message, schema)
+
+
+class SequenceContext(CountingContext):
+    """Answers each elicitation with the next passport id"""
+    def __init__(self, *passport_ids: str):
+        super().__init__(passport_ids[0])
+        self.passport_ids = list(passport_ids)
+
+    async def elicit(self, message, schema):
+        self.passport_id = self.passport_ids[min(self.elicitations, len(self.passport_ids) - 1)]
+        return await super().elicit(message, schema)
+
+
+async def search(ctx: CountingContext, search_date: str):
+    return await flights_mcp_service.flight_search(search_date=search_date, source_airport="LAX",
+                                                   destination_airport="YUL", ctx=ctx)
+
+
+def main():
+    search_date = date.today().strftime("%Y-%m-%d")
+    now = [0.0]
+    flights_mcp_service.traveller_cache = TravellerInformationCache(ttl=60, clock=lambda: now[0])
+    cache = flights_mcp_service.traveller_cache
+
+    first_session = CountingContext("77889")
+    second_session = CountingContext("12345")
+
+    # Repeated searches in a session elicit once
+    for _ in range(3):
+        results = asyncio.run(search(first_session, search_date))
+        assert all(result.travellerId == "77889" for result in results)
+    assert first_session.elicitations == 1
+
+    # Another session has its own entry
+    results = asyncio.run(search(second_session, search_date))
+    assert all(result.travellerId == "12345" for result in results)
+    assert second_session.elicitations == 1
+
+    # Entries expire after the time to live
+    now[0] = 61.0
+    asyncio.run(search(first_session, search_date))
+    assert first_session.elicitations == 2
+
+    # And can be invalidated explicitly
+    assert asyncio.run(flights_mcp_service.forget_traveller_information(ctx=first_session)) is True
+    asyncio.run(search(first_session, search_date))
+    assert first_session.elicitations == 3
+
+    metrics = cache.metrics()
+    assert (metrics.hits, metrics.elicitations, metrics.expirations, metrics.invalidations) == (2, 4, 1, 1)
+
+    # Unknown passport ids are asked for again and never cached
+    retrying_session = SequenceContext("00000", "77889")
+    results = asyncio.run(search(retrying_session, search_date))
+    assert all(result.travellerId == "77889" for result in results)
+    asyncio.run(search(retrying_session, search_date))
+    assert retrying_session.elicitations == 2
+
+    unknown_session = SequenceContext("00000")
+    for expected_elicitations in (3, 6):
+        try:
+            asyncio.run(search(unknown_session, search_date))
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("An unknown passport id was accepted")
+        assert unknown_session.elicitations == expected_elicitations
+    assert flights_mcp_service.flights_database.get().is_destination_citizen("00000", "YUL") is False
+    print(metrics)
+
+
+if __name__ == "__main__":
+    main()
+
+
+#  uv run -m tests.check_traveller_cache
@@ -0,0 +1,83 @@
+import asyncio
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+
+# Every search below is issued at once, so let them all queue for the DAO executor
+os.environ.setdefault("FLIGHTS_EXECUTOR_QUEUE_DEPTH", "1024")
+
+import flights_mcp_service
+from izzy_mcp_tutorials.models import TravellerInformation
+
+
+@dataclass
+class StubElicitationResult:
+    action: str
+    data: TravellerInformation | None
+
+
+class StubSession:
+    pass
+
+
+class StubContext:
+    """Answers every elicitation with a fixed passport id after a random delay"""
+    def __init__(self, passport_id: str):
+        self.passport_id = passport_id
+        self.session = StubSession()
+
+    async def elicit(self, message, schema):
+        await asyncio.sleep(random.random() / 100)
+        data = TravellerInformation(traveller_has_passport=True, passport_id=self.passport_id,
+                                    number_of_passengers=1, total_weight_of_luggage=20.0)
+        return StubElicitationResult(action="accept", data=data)
+
+
+async def search_as(passport_id: str, search_date: str):
+    results = await flights_mcp_service.flight_search(search_date=search_date, source_airport="LAX",
+                                                      destination_airport="YUL", ctx=StubContext(passport_id))
+    return passport_id, results
+
+
+async def run_parallel_searches(search_date: str, rounds: int):
+    passport_ids = flights_mcp_service.flights_database.get().get_passport_ids()
+    calls = [search_as(passport_id, search_date) for _ in range(rounds) for passport_id in passport_ids]
+    return await asyncio.gather(*calls)
+
+
+def check_results(responses):
+    for passport_id, results in responses:
+        assert len(results) > 0
+        for result in results:
+            assert result.travellerId == passport_id, (result.travellerId, passport_id)
+            # Only the Canadian traveller can enter Canada without a visa
+            assert result.visaRequired is (passport_id != "77889")
+
+
+def main():
+    search_date = date.today().strftime("%Y-%m-%d")
+
+    # Interleaved requests on one event loop
+    check_results(asyncio.run(run_parallel_searches(search_date, rounds=20)))
+
+    # Requests on several event loops in parallel threads
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(asyncio.run, run_parallel_searches(search_date, rounds=5)) for _ in range(8)]
+        for future in futures:
+            check_results(future.result())
+
+    # The shared records never carry traveller specific values
+    dao = flights_mcp_service.flights_database.get()
+    for shared_record in dao.search_flights(search_date, "LAX", "YUL"):
+        assert shared_record.travellerId == ""
+
+    print("No traveller data leaked between parallel flight searches")
+
+
+if __name__ == "__main__":
+    main()
+
+
+#  uv run -m tests.check_traveller_overlays
@@ -0,0 +1,68 @@
+import asyncio
+import time
+from itertools import product
+
+import flights_mcp_service
+from izzy_mcp_tutorials import get_airport_registry
+from izzy_mcp_tutorials.models import VisaCheckRoute
+
+
+def main():
+    dao = flights_mcp_service.flights_database.get()
+    airports = list(get_airport_registry())
+    routes = [VisaCheckRoute(sourceAirport=source, destinationAirport=destination)
+              for source, destination in product(airports, airports) if source != destination]
+    passport_ids = dao.get_passport_ids() + ["00000"]
+
+    # The bulk check agrees with the per traveller rule of flight_search
+    requirements = dao.check_visa_requirements(passport_ids, routes)
+    assert [requirement.passportId for requirement in requirements] == passport_ids
+    for requirement in requirements[:-1]:
+        expected = [dao.is_international_flight(route.sourceAirport, route.destinationAirport)
+                    and not dao.is_destination_citizen(requirement.passportId, route.destinationAirport)
+                    for route in routes]
+        assert requirement.visaRequired == expected, requirement.passportId
+        assert requirement.routesRequiringVisa == sum(expected)
+        assert requirement.countryCitizenship == dao.get_passport_owner(requirement.passportId).countryCitizenship
+    assert requirements[-1].visaRequired is None and requirements[-1].countryCitizenship is None
+
+    # A large manifest is a single pass over the precomputed codes
+    manifest = passport_ids * 2000
+    pairs = [(route.sourceAirport, route.destinationAirport) for route in routes]
+    started = time.perf_counter()
+    rows = dao.visa_index.check(manifest, pairs)
+    index_seconds = time.perf_counter() - started
+    assert len(rows) == len(manifest) and all(row is None or len(row) == len(pairs) for row in rows)
+    assert index_seconds < 0.5, index_seconds
+
+    # Building the per passenger results, in the DAO and through the MCP tool, stays well under a second or two
+    started = time.perf_counter()
+    dao_requirements = dao.check_visa_requirements(manifest, routes)
+    dao_seconds = time.perf_counter() - started
+    assert dao_requirements == requirements * 2000
+    assert dao_seconds < 1.5, dao_seconds
+
+    started = time.perf_counter()
+    tool_requirements = asyncio.run(flights_mcp_service.check_visa_requirements(manifest, routes))
+    tool_seconds = time.perf_counter() - started
+    assert tool_requirements == dao_requirements
+    assert tool_seconds < 2.0, tool_seconds
+
+    started = time.perf_counter()
+    result = asyncio.run(flights_mcp_service.mcp.call_tool(
+        "check_visa_requirements", {"passport_ids": manifest, "routes": [route.model_dump() for route in routes]}))
+    mcp_seconds = time.perf_counter() - started
+    _, structured = result
+    assert [requirement["passportId"] for requirement in structured["result"]] == manifest
+    assert structured["result"][0]["visaRequired"] == requirements[0].visaRequired
+    assert mcp_seconds < 4.0, mcp_seconds
+
+    print(f"{len(manifest)} passengers on {len(pairs)} routes: index {index_seconds * 1000:.1f} ms, "
+          f"DAO {dao_seconds * 1000:.1f} ms, tool {tool_seconds * 1000:.1f} ms, MCP call {mcp_seconds * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
+
+
+#  uv run -m tests.check_visa_requirements